@@ -0,0 +1,84 @@
+"""Benchmark the storage size and cost of ProsemirrorBinaryField against JSON.
+
+Run from the repository root:
+
+    PYTHONPATH=.:benchmarks python benchmarks/bench_binary_field.py [--documents 200]
+"""
+
+import argparse
+import json
+import random
+import string
+import timeit
+
+from bench_json_codec import CORPORA, make_corpus
+
+from django_prosemirror.codec import get_codec, pack_json, unpack_json
+
+
+def vary_text(node: dict, rng: random.Random, vocabulary: list[str]) -> None:
+    """Replace the text of a generated document with words from a larger vocabulary.
+
+    The few words of the generated text compress far better than real text.
+    """
+    if node["type"] == "text":
+        words = len(node["text"].split())
+        node["text"] = " ".join(rng.choices(vocabulary, k=words)) + " "
+    for child in node.get("content", []):
+        vary_text(child, rng, vocabulary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    codec = get_codec()
+    rng = random.Random(42)
+    vocabulary = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        for _ in range(5000)
+    ]
+    for corpus_name, blocks in CORPORA:
+        documents = max(5, args.documents * CORPORA[0][1] // blocks)
+        corpus = make_corpus(rng, documents, blocks)
+        for doc in corpus:
+            vary_text(doc, rng, vocabulary)
+        encoded = [codec.dumps(doc) for doc in corpus]
+        packed = [pack_json(value) for value in encoded]
+
+        # What JSONField stores by default, and what the codec stores
+        default_size = sum(len(json.dumps(doc).encode()) for doc in corpus)
+        json_size = sum(len(value.encode()) for value in encoded)
+        packed_size = sum(len(value) for value in packed)
+        print(f"{corpus_name}: {documents} documents")
+        print(
+            f"   size: JSONField {default_size / documents / 1024:.1f}KiB, "
+            f"compact {json_size / documents / 1024:.1f}KiB, "
+            f"packed {packed_size / documents / 1024:.1f}KiB "
+            f"({1 - packed_size / default_size:.0%} smaller)"
+        )
+
+        def timing(function, values):
+            return min(
+                timeit.repeat(
+                    lambda: [function(value) for value in values],
+                    number=1,
+                    repeat=args.repeat,
+                )
+            ) / len(values)
+
+        encode = timing(codec.dumps, corpus)
+        decode = timing(codec.loads, encoded)
+        pack = timing(lambda doc: pack_json(codec.dumps(doc)), corpus)
+        unpack = timing(lambda value: codec.loads(unpack_json(value)), packed)
+        print(
+            f"   save: JSON {encode * 1e6:.0f}us, packed {pack * 1e6:.0f}us; "
+            f"load: JSON {decode * 1e6:.0f}us, packed {unpack * 1e6:.0f}us "
+            f"({codec.name})"
+        )
+
+
+if __name__ == "__main__":
+    main()
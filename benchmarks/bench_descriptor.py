@@ -0,0 +1,89 @@
+"""Benchmark accessing the documents of model instances loaded from the database.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_descriptor.py [--rows 10000]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+import django
+from django.conf import settings
+
+settings.configure(INSTALLED_APPS=["django_prosemirror"])
+django.setup()
+
+from django.db import models  # noqa: E402
+
+from django_prosemirror.fields import ProsemirrorModelField  # noqa: E402
+
+DOC = {
+    "type": "doc",
+    "content": [{"type": "paragraph", "content": [{"type": "text", "text": "a"}]}],
+}
+
+
+class Post(models.Model):  # noqa: DJ008
+    title = ProsemirrorModelField()
+    summary = ProsemirrorModelField()
+    body = ProsemirrorModelField()
+
+    class Meta:
+        app_label = "django_prosemirror"
+
+
+FIELD_NAMES = ["id", "title", "summary", "body"]
+
+
+def load_rows(rows: int) -> list[Post]:
+    """Instantiate rows the way a queryset does."""
+    return [Post.from_db("default", FIELD_NAMES, (pk, DOC, DOC, DOC)) for pk in rows]
+
+
+def access(posts: list[Post]) -> None:
+    for post in posts:
+        post.title  # noqa: B018
+        post.summary  # noqa: B018
+        post.body  # noqa: B018
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    def first_access():
+        posts = load_rows(range(1, args.rows + 1))
+        start = timeit.default_timer()
+        access(posts)
+        return timeit.default_timer() - start
+
+    first = min(first_access() for _ in range(args.repeat))
+
+    posts = load_rows(range(1, args.rows + 1))
+    access(posts)
+    repeated = min(timeit.repeat(lambda: access(posts), number=1, repeat=args.repeat))
+    del posts
+    gc.collect()
+
+    posts = load_rows(range(1, args.rows + 1))
+    tracemalloc.start()
+    access(posts)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    fields = args.rows * 3
+    print(f"{args.rows} rows, {fields} fields")
+    print(f"first access: {first * 1000:.1f}ms ({first / fields * 1e6:.2f}us/field)")
+    print(
+        f"   repeated: {repeated * 1000:.1f}ms ({repeated / fields * 1e6:.2f}us/field)"
+    )
+    print(f"  allocated: {allocated / 1024:.0f}KiB ({allocated / fields:.0f}B/field)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark doc_to_text against rendering HTML and stripping the tags.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_doc_to_text.py [--documents 200] [--blocks 200]
+"""
+
+import argparse
+import random
+import timeit
+
+import django
+from django.conf import settings
+
+settings.configure()
+django.setup()
+
+from django.utils.html import strip_tags  # noqa: E402
+
+from django_prosemirror.config import ProsemirrorConfig  # noqa: E402
+from django_prosemirror.serde import doc_to_html, doc_to_text  # noqa: E402
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing"]
+
+
+def make_text(rng: random.Random, marks: bool = True) -> list[dict]:
+    nodes = []
+    for _ in range(rng.randint(3, 8)):
+        node = {"type": "text", "text": " ".join(rng.choices(WORDS, k=6)) + " "}
+        if marks and rng.random() < 0.3:
+            node["marks"] = [{"type": rng.choice(["strong", "em", "code"])}]
+        nodes.append(node)
+    return nodes
+
+
+def make_block(rng: random.Random) -> dict:
+    kind = rng.random()
+    if kind < 0.6:
+        return {"type": "paragraph", "content": make_text(rng)}
+    if kind < 0.7:
+        return {
+            "type": "heading",
+            "attrs": {"level": rng.randint(1, 3)},
+            "content": make_text(rng),
+        }
+    if kind < 0.8:
+        return {
+            "type": "code_block",
+            "content": [{"type": "text", "text": "x = 1\nprint(x)"}],
+        }
+    if kind < 0.9:
+        return {
+            "type": "bullet_list",
+            "content": [
+                {
+                    "type": "list_item",
+                    "content": [{"type": "paragraph", "content": make_text(rng)}],
+                }
+                for _ in range(3)
+            ],
+        }
+    return {
+        "type": "table",
+        "content": [
+            {
+                "type": "table_row",
+                "content": [
+                    {
+                        "type": "table_cell",
+                        "content": [
+                            {"type": "paragraph", "content": make_text(rng, False)}
+                        ],
+                    }
+                    for _ in range(3)
+                ],
+            }
+            for _ in range(3)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    schema = ProsemirrorConfig().schema
+    corpus = [
+        {"type": "doc", "content": [make_block(rng) for _ in range(args.blocks)]}
+        for _ in range(args.documents)
+    ]
+
+    approaches = {
+        "strip_tags(doc_to_html)": lambda: [
+            strip_tags(doc_to_html(doc, schema=schema)) for doc in corpus
+        ],
+        "doc_to_text": lambda: [doc_to_text(doc, schema=schema) for doc in corpus],
+    }
+
+    print(f"{args.documents} documents x {args.blocks} blocks")
+    timings = {}
+    for name, func in approaches.items():
+        timings[name] = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"{name:>25}: {timings[name]:.3f}s")
+
+    baseline, new = timings.values()
+    print(f"{'speedup':>25}: {baseline / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measure the memory used by the documents of loaded model instances.
+
+Run from the repository root:
+
+    PYTHONPATH=.:benchmarks python benchmarks/bench_document_memory.py [--rows N]
+"""
+
+import argparse
+import sys
+import tracemalloc
+
+from bench_descriptor import DOC, FIELD_NAMES, Post
+
+from django_prosemirror.fields import ProsemirrorFieldDocument
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    posts = [
+        Post.from_db("default", FIELD_NAMES, (pk, DOC, DOC, DOC))
+        for pk in range(1, args.rows + 1)
+    ]
+
+    tracemalloc.start()
+    documents = [post.body for post in posts]
+    truthy = sum(1 for post in posts if post.body)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    document = documents[0]
+    size = sys.getsizeof(document)
+    if hasattr(document, "__dict__"):
+        size += sys.getsizeof(document.__dict__)
+    print(f"{args.rows} rows, {truthy} with content")
+    per_row = allocated / args.rows
+    slots = hasattr(ProsemirrorFieldDocument, "__slots__")
+    print(f"  allocated: {allocated / 1024 / 1024:.1f}MiB ({per_row:.0f}B/row)")
+    print(f"   document: {size}B (slots: {slots})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark the "stream" html_to_doc engine against the "dom" engine.
+
+Run from the repository root:
+
+    PYTHONPATH=.:benchmarks python benchmarks/bench_html_to_doc.py [--blocks 3000]
+"""
+
+import argparse
+import random
+import timeit
+import tracemalloc
+
+from bench_doc_to_text import make_block
+
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.serde import doc_to_html, html_to_doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    schema = ProsemirrorConfig().schema
+    document = {"type": "doc", "content": [make_block(rng) for _ in range(args.blocks)]}
+    html = doc_to_html(document, schema=schema)
+
+    print(f"{args.blocks} blocks, {len(html) / 1024 / 1024:.1f} MiB of HTML")
+    timings = {}
+    for engine in ("dom", "stream"):
+        timings[engine] = min(
+            timeit.repeat(
+                lambda engine=engine: html_to_doc(html, schema=schema, engine=engine),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        tracemalloc.start()
+        html_to_doc(html, schema=schema, engine=engine)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"{engine:>8}: {timings[engine]:.3f}s, "
+            f"peak {peak / 1024 / 1024:.1f} MiB (Python allocations)"
+        )
+
+    print(f"{'speedup':>8}: {timings['dom'] / timings['stream']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
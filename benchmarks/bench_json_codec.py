@@ -0,0 +1,78 @@
+"""Benchmark the JSON codecs for stored documents.
+
+Run from the repository root:
+
+    PYTHONPATH=.:benchmarks python benchmarks/bench_json_codec.py [--documents 200]
+"""
+
+import argparse
+import random
+import timeit
+
+from bench_doc_to_text import make_block
+
+from django_prosemirror.codec import JSONCodec, OrjsonCodec
+
+# (name, blocks per document): a comment, an article and a long report
+CORPORA = [("comment", 3), ("article", 40), ("report", 400)]
+
+
+def make_corpus(rng: random.Random, documents: int, blocks: int) -> list[dict]:
+    corpus = []
+    for _ in range(documents):
+        content = [make_block(rng) for _ in range(blocks)]
+        # Some non-ASCII text, which the codecs store unescaped
+        content.append(
+            {"type": "paragraph", "content": [{"type": "text", "text": "Één ✓ 😀"}]}
+        )
+        corpus.append({"type": "doc", "content": content})
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    codecs = [JSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson is not installed, only the json module is benchmarked")
+
+    rng = random.Random(42)
+    for corpus_name, blocks in CORPORA:
+        # Fewer of the larger documents, so every corpus takes a similar time
+        documents = max(5, args.documents * CORPORA[0][1] // blocks)
+        corpus = make_corpus(rng, documents, blocks)
+        encoded = [codecs[0].dumps(doc) for doc in corpus]
+        size = sum(len(value.encode()) for value in encoded) / len(encoded)
+        print(f"{corpus_name}: {documents} documents, {size / 1024:.1f}KiB each")
+
+        for codec in codecs:
+            assert [codec.dumps(doc) for doc in corpus] == encoded
+            dumps, loads = (
+                min(
+                    timeit.repeat(
+                        lambda function=function, values=values: [
+                            function(value) for value in values
+                        ],
+                        number=1,
+                        repeat=args.repeat,
+                    )
+                )
+                / documents
+                for function, values in (
+                    (codec.dumps, corpus),
+                    (codec.loads, encoded),
+                )
+            )
+            print(
+                f"{codec.name:>9}: dumps {dumps * 1e6:.1f}us, "
+                f"loads {loads * 1e6:.1f}us per document"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark the compiled validator against validating with Node.from_json.
+
+Run from the repository root:
+
+    PYTHONPATH=.:benchmarks python benchmarks/bench_validate_doc.py [--blocks 3000]
+"""
+
+import argparse
+import random
+import timeit
+
+from bench_doc_to_text import make_block
+from prosemirror.model import Node
+
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.schema import validate_doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    schema = ProsemirrorConfig().schema
+    document = {"type": "doc", "content": [make_block(rng) for _ in range(args.blocks)]}
+
+    timings = {
+        "from_json": min(
+            timeit.repeat(
+                lambda: Node.from_json(schema, document).check(),
+                number=1,
+                repeat=args.repeat,
+            )
+        ),
+        "compiled": min(
+            timeit.repeat(
+                lambda: validate_doc(document, schema=schema),
+                number=1,
+                repeat=args.repeat,
+            )
+        ),
+    }
+
+    print(f"{args.blocks} blocks")
+    for name, timing in timings.items():
+        print(f"{name:>9}: {timing * 1000:.1f}ms")
+    print(f"{'speedup':>9}: {timings['from_json'] / timings['compiled']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Caching utilities for Prosemirror documents."""
+
+import hashlib
+import json
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache import BaseCache, caches
+
+from prosemirror import Schema
+
+from django_prosemirror.config import get_schema_fingerprint, get_setting
+from django_prosemirror.schema import ProsemirrorDocumentDict
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one of the caches in this package."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset(self) -> None:
+        """Reset the counters to zero."""
+        self.hits = 0
+        self.misses = 0
+
+
+# Bump whenever a change to the rendering code alters the HTML produced for a
+# document, so that HTML rendered by an older version is no longer served.
+RENDERER_VERSION = 1
+
+# Counters for the shared rendered-HTML cache (see ``get_html_cache``)
+shared_html_cache_stats = CacheStats()
+
+
+def get_html_cache() -> BaseCache | None:
+    """Return the Django cache configured to store rendered HTML, if any."""
+    alias = get_setting("html_cache")
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def get_html_cache_timeout() -> int | None:
+    """Return the timeout in seconds for rendered HTML in the shared cache."""
+    return get_setting("html_cache_timeout")
+
+
+def html_cache_key(doc: ProsemirrorDocumentDict, schema: Schema) -> str | None:
+    """Return the shared cache key for the HTML of a document.
+
+    The key is derived from the content of the document (see :func:`doc_hash`) and
+    the fingerprint of the schema, so equivalent documents rendered with identical
+    configurations share an entry, while any change to either produces a new key.
+
+    Returns:
+        str | None: The cache key, or None if the schema was not built from a
+            ProsemirrorConfig and so has no stable fingerprint.
+    """
+    fingerprint = get_schema_fingerprint(schema)
+    if fingerprint is None:
+        return None
+
+    version = f"{RENDERER_VERSION}.{get_setting('html_cache_version')}"
+    schema_hash = _digest(repr(fingerprint))
+    digest = doc_hash(doc, schema)
+    return f"django_prosemirror:html:{version}:{schema_hash}:{digest}"
+
+
+def json_digest(doc: ProsemirrorDocumentDict | str) -> str:
+    """Return a hash of the JSON of a document, independent of its key order.
+
+    This is the key of the validation cache. Unlike :func:`doc_hash`, it doesn't
+    leave out attributes set to their default, so JSON can be hashed as is.
+
+    Args:
+        doc: The document, or its JSON. JSON is hashed as is, which is much cheaper
+            than serializing the dict but only matches the hash of the dict if the
+            JSON has sorted keys, no whitespace and unescaped non-ASCII characters.
+
+    Raises:
+        TypeError: If the document contains values that are not JSON serializable
+    """
+    if isinstance(doc, str):
+        return _digest(doc)
+    return _digest(
+        json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    )
+
+
+def doc_hash(doc: ProsemirrorDocumentDict, schema: Schema | None = None) -> str:
+    """Return a stable hash of the content of a document.
+
+    The hash is computed over :func:`canonical_json`, so it does not depend on the
+    order of keys, on attributes that are set to their default, or on the process
+    or Python version it is computed in.
+
+    Args:
+        doc: The document
+        schema: Schema that the attribute defaults are taken from. Without it, only
+            empty ``attrs`` are left out.
+
+    Raises:
+        TypeError: If the document contains values that are not JSON serializable
+    """
+    return _digest(canonical_json(doc, schema))
+
+
+def canonical_json(doc: ProsemirrorDocumentDict, schema: Schema | None = None) -> str:
+    """Serialize a document to JSON that is identical for equivalent documents.
+
+    Keys are sorted, there is no whitespace and non-ASCII characters are escaped,
+    which is both faster and copes with lone surrogates. Empty ``attrs``,
+    ``content`` and ``marks`` and attributes that are set to their default in the
+    schema are left out, as prosemirror treats them the same as missing ones.
+
+    Args:
+        doc: The document
+        schema: Schema that the attribute defaults are taken from
+
+    Raises:
+        TypeError: If the document contains values that are not JSON serializable
+    """
+    node_defaults, mark_defaults = _get_attr_defaults(schema)
+    # Only the nodes and marks that need to change are copied
+    return json.dumps(
+        _canonical_node(doc, node_defaults, mark_defaults),
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+# Default values of the attributes of each node and mark type
+_AttrDefaults = dict[str, dict[str, Any]]
+
+_attr_defaults_cache: weakref.WeakKeyDictionary[
+    Schema, tuple[_AttrDefaults, _AttrDefaults]
+] = weakref.WeakKeyDictionary()
+
+
+def _get_attr_defaults(schema: Schema | None) -> tuple[_AttrDefaults, _AttrDefaults]:
+    if schema is None:
+        return {}, {}
+    try:
+        return _attr_defaults_cache[schema]
+    except KeyError:
+        defaults = tuple(
+            {
+                name: {
+                    attr_name: attr.default
+                    for attr_name, attr in spec_type.attrs.items()
+                    if attr.has_default
+                }
+                for name, spec_type in types.items()
+            }
+            for types in (schema.nodes, schema.marks)
+        )
+        return _attr_defaults_cache.setdefault(schema, defaults)  # type: ignore[arg-type]
+
+
+def _canonical_node(
+    node: Any, node_defaults: _AttrDefaults, mark_defaults: _AttrDefaults
+) -> Any:
+    if type(node) is not dict:
+        return node
+    content = node.get("content")
+    marks = node.get("marks")
+    attrs = node.get("attrs")
+    # Most nodes are text nodes without marks, which are used as is
+    if content is None and marks is None and attrs is None:
+        return node
+
+    result = dict(node)
+    if isinstance(content, list):
+        if content:
+            result["content"] = [
+                _canonical_node(child, node_defaults, mark_defaults)
+                for child in content
+            ]
+        else:
+            del result["content"]
+    if isinstance(marks, list):
+        if marks:
+            result["marks"] = [_canonical_mark(mark, mark_defaults) for mark in marks]
+        else:
+            del result["marks"]
+    if isinstance(attrs, dict):
+        attrs = _strip_defaults(attrs, node_defaults.get(node.get("type")))
+        if attrs:
+            result["attrs"] = attrs
+        else:
+            del result["attrs"]
+    return result
+
+
+def _canonical_mark(mark: Any, mark_defaults: _AttrDefaults) -> Any:
+    if type(mark) is not dict:
+        return mark
+    attrs = mark.get("attrs")
+    if not isinstance(attrs, dict):
+        return mark
+    result = dict(mark)
+    attrs = _strip_defaults(attrs, mark_defaults.get(mark.get("type")))
+    if attrs:
+        result["attrs"] = attrs
+    else:
+        del result["attrs"]
+    return result
+
+
+def _strip_defaults(
+    attrs: dict[str, Any], defaults: dict[str, Any] | None
+) -> dict[str, Any]:
+    if not defaults:
+        return attrs
+    # Compare types as well, as e.g. True == 1
+    return {
+        name: value
+        for name, value in attrs.items()
+        if name not in defaults
+        or type(value) is not type(defaults[name])
+        or value != defaults[name]
+    }
+
+
+def _digest(value: str) -> str:
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+class ValidationCache:
+    """LRU of documents that passed validation, see :func:`~.schema.validate_doc`.
+
+    Entries are keyed by the schema fingerprint, the limits the document was
+    validated with and the hash of its JSON (see :func:`json_digest`), so a
+    document is only validated again once it changes. The number of entries is set
+    by the ``validation_cache_size`` setting, 0 disables the cache.
+
+    NOTE: You should not instantiate this class directly, use ``validation_cache``.
+    """
+
+    def __init__(self):
+        self._entries: OrderedDict[Hashable, None] = OrderedDict()
+        self.stats = CacheStats()
+
+    def key(
+        self, digest: str, schema: Schema, limits: Hashable = None
+    ) -> Hashable | None:
+        """Return the cache key of a document.
+
+        Args:
+            digest: Hash of the document, see :func:`json_digest`
+            schema: Schema the document is validated against
+            limits: Limits the document is validated with
+
+        Returns:
+            Hashable | None: The key, or None if the cache is disabled or the schema
+                has no fingerprint
+        """
+        if not get_setting("validation_cache_size"):
+            return None
+        fingerprint = get_schema_fingerprint(schema)
+        if fingerprint is None:
+            return None
+        return fingerprint, limits, digest
+
+    def contains(self, key: Hashable) -> bool:
+        """Return whether a key is in the cache, marking it as recently used."""
+        # No lock is needed: each OrderedDict operation is atomic, and an entry
+        # evicted by another thread in between only costs a revalidation.
+        if key not in self._entries:
+            self.stats.misses += 1
+            return False
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            pass
+        self.stats.hits += 1
+        return True
+
+    def add(self, key: Hashable) -> None:
+        """Add a key, evicting the least recently used entries beyond the size."""
+        self._entries[key] = None
+        size = get_setting("validation_cache_size")
+        while len(self._entries) > size:
+            try:
+                self._entries.popitem(last=False)
+            except KeyError:
+                break
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache of validated documents
+validation_cache = ValidationCache()
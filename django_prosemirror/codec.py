@@ -0,0 +1,174 @@
+"""JSON encoding and decoding of stored Prosemirror documents.
+
+Documents are encoded and decoded for every row that is saved or loaded, so the
+codec is pluggable through the ``json_codec`` setting. All codecs produce the same
+compact JSON (no whitespace, non-ASCII characters as is) for the values that occur
+in documents, so switching codecs doesn't change what is stored.
+
+:func:`pack_json` and :func:`unpack_json` implement the binary format of
+``ProsemirrorBinaryField``: the JSON of the document, compressed with zlib unless
+that doesn't make it smaller, behind a header with the format version and the
+compression method.
+"""
+
+import json
+import zlib
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from django_prosemirror.config import get_setting
+from django_prosemirror.constants import SETTINGS_KEY
+
+
+class JSONCodec:
+    """Encode and decode documents with the json module of the standard library."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> str:
+        """Encode a value as compact JSON.
+
+        Raises:
+            TypeError: If the value contains values that are not JSON serializable
+        """
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def loads(self, value: str | bytes) -> Any:
+        """Decode JSON.
+
+        Raises:
+            json.JSONDecodeError: If the value is not valid JSON
+        """
+        return json.loads(value)
+
+
+class OrjsonCodec(JSONCodec):
+    """Encode and decode documents with orjson, which is several times faster.
+
+    Values that orjson rejects, such as integers beyond 64 bits, lone surrogates or
+    ``NaN``, are handled by the json module instead, so the output is the same as
+    that of :class:`JSONCodec`. Note that orjson encodes ``NaN`` as ``null`` and,
+    before orjson 3.9, decodes integers beyond 64 bits as floats.
+
+    Raises:
+        ImportError: If orjson is not installed
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, value: Any) -> str:
+        try:
+            return self._orjson.dumps(value).decode()
+        except TypeError:
+            return super().dumps(value)
+
+    def loads(self, value: str | bytes) -> Any:
+        try:
+            return self._orjson.loads(value)
+        except self._orjson.JSONDecodeError:
+            return super().loads(value)
+
+
+_codec: JSONCodec | None = None
+
+
+def get_codec() -> JSONCodec:
+    """Return the codec configured by the ``json_codec`` setting.
+
+    The setting is ``"auto"`` (orjson if it is installed, the json module
+    otherwise), ``"json"``, ``"orjson"`` or the dotted path of a class with the same
+    ``dumps()`` and ``loads()`` methods as :class:`JSONCodec`.
+
+    Raises:
+        ImproperlyConfigured: If orjson is configured but not installed, or the
+            dotted path can't be imported
+    """
+    global _codec
+    if _codec is None:
+        _codec = _load_codec(get_setting("json_codec"))
+    return _codec
+
+
+def _load_codec(name: str) -> JSONCodec:
+    if name == "json":
+        return JSONCodec()
+    if name == "auto":
+        try:
+            return OrjsonCodec()
+        except ImportError:
+            return JSONCodec()
+    if name == "orjson":
+        try:
+            return OrjsonCodec()
+        except ImportError as exc:
+            raise ImproperlyConfigured(
+                "The 'orjson' JSON codec requires orjson to be installed"
+            ) from exc
+    try:
+        return import_string(name)()
+    except ImportError as exc:
+        raise ImproperlyConfigured(f"Unable to import JSON codec '{name}'") from exc
+
+
+@receiver(setting_changed)
+def _clear_codec_on_setting_changed(*, setting: str, **kwargs) -> None:
+    global _codec
+    if setting == SETTINGS_KEY:
+        _codec = None
+
+
+# Header of packed documents: magic bytes, format version, compression method
+_MAGIC = b"PM"
+FORMAT_VERSION = 1
+_UNCOMPRESSED = 0
+_ZLIB = 1
+_HEADER_SIZE = len(_MAGIC) + 2
+
+
+def pack_json(value: str, level: int = 6) -> bytes:
+    """Pack the JSON of a document into the binary format.
+
+    Args:
+        value: JSON of the document
+        level: zlib compression level, from 1 (fastest) to 9 (smallest)
+    """
+    data = value.encode()
+    compressed = zlib.compress(data, level)
+    # Tiny documents don't compress
+    if len(compressed) < len(data):
+        return _MAGIC + bytes((FORMAT_VERSION, _ZLIB)) + compressed
+    return _MAGIC + bytes((FORMAT_VERSION, _UNCOMPRESSED)) + data
+
+
+def unpack_json(value: bytes) -> str:
+    """Return the JSON of a document packed by :func:`pack_json`.
+
+    Raises:
+        ValueError: If the value is not a packed document, or is corrupt
+    """
+    if len(value) < _HEADER_SIZE or value[: len(_MAGIC)] != _MAGIC:
+        raise ValueError("Not a packed Prosemirror document")
+    version, method = value[len(_MAGIC)], value[len(_MAGIC) + 1]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version {version}")
+
+    payload = memoryview(value)[_HEADER_SIZE:]
+    if method == _ZLIB:
+        try:
+            data = zlib.decompress(payload)
+        except zlib.error as exc:
+            raise ValueError(f"Corrupt packed document: {exc}") from exc
+    elif method == _UNCOMPRESSED:
+        data = bytes(payload)
+    else:
+        raise ValueError(f"Unsupported compression method {method}")
+    return data.decode()
@@ -1,7 +1,11 @@
 """Configuration classes for ProseMirror components."""
 
+import weakref
 from collections.abc import Mapping
-from typing import cast
+from typing import TypeAlias, cast
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 from prosemirror import Schema
 
@@ -34,6 +38,19 @@ from django_prosemirror.schema.nodes import (
 )
 from django_prosemirror.schema.types import MarkType, NodeType
 
+# (allowed node types, allowed mark types, tag_to_classes) in canonical form
+SchemaFingerprint: TypeAlias = tuple[
+    tuple[str, ...], tuple[str, ...], tuple[tuple[str, str], ...]
+]
+
+# Process-wide registry of compiled schemas. Configurations that resolve to the
+# same fingerprint share a single Schema instance, so that fields, form fields and
+# widgets with identical settings don't each pay for building one.
+_schema_cache: dict[SchemaFingerprint, Schema] = {}
+_schema_fingerprints: weakref.WeakKeyDictionary[Schema, SchemaFingerprint] = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def get_setting(key: str):
     from django.conf import settings
@@ -43,6 +60,25 @@ def get_setting(key: str):
     return settings_with_fallbacks[key]
 
 
+def get_schema_fingerprint(schema: Schema) -> SchemaFingerprint | None:
+    """Return the fingerprint of a schema built by a ProsemirrorConfig.
+
+    Returns None for schemas that were constructed by other means.
+    """
+    return _schema_fingerprints.get(schema)
+
+
+def clear_schema_cache() -> None:
+    """Drop all compiled schemas from the process-wide schema registry."""
+    _schema_cache.clear()
+
+
+@receiver(setting_changed)
+def _clear_schema_cache_on_setting_changed(*, setting: str, **kwargs) -> None:
+    if setting == SETTINGS_KEY:
+        clear_schema_cache()
+
+
 class ProsemirrorConfig:
     """Configuration for ProseMirror fields and widgets."""
 
@@ -155,8 +191,35 @@ class ProsemirrorConfig:
             MarkType.STRIKETHROUGH: StrikethroughMark(class_mapping),
         }
 
+    @property
+    def schema_fingerprint(self) -> SchemaFingerprint:
+        """Return a hashable key identifying the schema built from this configuration.
+
+        The order of the node and mark types is preserved, as it determines the rank
+        of the types in the schema (and thereby e.g. the ordering of marks).
+        """
+        return (
+            tuple(node_type.value for node_type in self.allowed_node_types),
+            tuple(mark_type.value for mark_type in self.allowed_mark_types),
+            tuple(sorted(self.tag_to_classes.items())),
+        )
+
     @property
     def schema(self) -> Schema:
+        """Return the ProseMirror schema for this configuration.
+
+        Schemas are interned: every configuration with the same fingerprint returns
+        the same Schema instance.
+        """
+        fingerprint = self.schema_fingerprint
+        try:
+            return _schema_cache[fingerprint]
+        except KeyError:
+            schema = _schema_cache.setdefault(fingerprint, self._build_schema())
+            _schema_fingerprints[schema] = fingerprint
+            return schema
+
+    def _build_schema(self) -> Schema:
         """Generate a ProseMirror schema from this configuration."""
         # Resolve tag_to_classes with defaults
         class_mapping = ClassMapping(cast(dict, self.tag_to_classes))
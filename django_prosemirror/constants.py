@@ -10,6 +10,15 @@ class ProseMirrorConfig(TypedDict):
     allowed_node_types: list[str]
     allowed_mark_types: list[str]
     history: bool
+    html_cache: str | None
+    html_cache_timeout: int | None
+    html_cache_version: int
+    max_input_bytes: int | None
+    max_depth: int | None
+    max_nodes: int | None
+    max_table_cells: int | None
+    validation_cache_size: int
+    json_codec: str
 
 
 def get_empty_doc() -> dict:
@@ -55,4 +64,22 @@ DEFAULT_SETTINGS: ProseMirrorConfig = {
         "strikethrough",
     ],
     "history": True,
+    # Alias of a Django cache (from settings.CACHES) to store rendered HTML in
+    "html_cache": None,
+    # Timeout in seconds for rendered HTML, None caches forever
+    "html_cache_timeout": 60 * 60 * 24,
+    # Bump to invalidate all rendered HTML in the cache
+    "html_cache_version": 1,
+    # Limits on the size of documents parsed from HTML or submitted through forms,
+    # see DocumentLimits. None disables a limit.
+    "max_input_bytes": None,
+    "max_depth": None,
+    "max_nodes": None,
+    "max_table_cells": None,
+    # Number of validated documents to remember, so that unchanged documents are
+    # not validated again. 0 disables the cache.
+    "validation_cache_size": 1024,
+    # JSON codec for stored documents: "auto" (orjson if installed), "json",
+    # "orjson" or the dotted path of a codec class, see django_prosemirror.codec
+    "json_codec": "auto",
 }
@@ -2,18 +2,25 @@
 
 import json
 import weakref
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterator, Mapping
 from typing import Any, Self, cast
 
 from django import forms
-from django.core.exceptions import ValidationError
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db import models
+from django.db.models import Value, signals
+from django.db.models.fields.json import KeyTransform
+from django.forms.fields import InvalidJSONInput, JSONString
 from django.utils.safestring import SafeString, mark_safe
 
 from prosemirror import Schema
 
+from django_prosemirror.cache import CacheStats, doc_hash, json_digest
+from django_prosemirror.codec import get_codec, pack_json, unpack_json
 from django_prosemirror.config import ProsemirrorConfig
 from django_prosemirror.constants import get_empty_doc
+from django_prosemirror.limits import DocumentLimits
 from django_prosemirror.schema import (
     MarkType,
     NodeType,
@@ -21,7 +28,18 @@ from django_prosemirror.schema import (
     ProsemirrorDocumentDict,
     validate_doc,
 )
-from django_prosemirror.serde import doc_to_html, html_to_doc
+from django_prosemirror.serde import (
+    doc_blocks_to_html,
+    doc_to_html,
+    doc_to_text,
+    html_to_doc,
+    iter_doc_html,
+)
+from django_prosemirror.text import (
+    BlockIndexEntry,
+    get_text_extractor,
+    paginate_blocks,
+)
 from django_prosemirror.widgets import ProsemirrorWidget
 
 
@@ -32,12 +50,39 @@ class ProsemirrorFieldDocument:
     for conversion between document JSON and HTML representations, while maintaining
     synchronization with the underlying model field.
 
+    The rendered HTML is cached until the document is changed through this wrapper
+    or the field. Mutating the document dict in place bypasses the wrapper, so the
+    cached HTML is not invalidated in that case.
+
     NOTE: You should not instantiate this class directly. It will be handled for you
     by the DjangoProsemirrorField.
     """
 
+    # One document is created per field of every model instance that is accessed,
+    # so avoid the per-instance __dict__
+    __slots__ = (
+        "__weakref__",
+        "_block_index",
+        "_content_hash",
+        "_html",
+        "_instance_ref",
+        "_instance_sync",
+        "_raw_data",
+        "_sync_callback",
+        "schema",
+    )
+
+    # Process-wide hit/miss counters for the rendered HTML cache
+    html_cache_stats = CacheStats()
+
     schema: Schema
     _raw_data: ProsemirrorDocumentDict | None
+    _html: str | None
+    _block_index: list[BlockIndexEntry] | None
+    _content_hash: str | None
+    # Set for the documents of model instances, see ProsemirrorFieldDescriptor
+    _instance_ref: "weakref.ref[models.Model] | None"
+    _instance_sync: Callable[[models.Model, ProsemirrorDocumentDict | None], None]
 
     def __init__(
         self,
@@ -68,11 +113,19 @@ class ProsemirrorFieldDocument:
             )
 
         self._raw_data = raw_data
+        self._html = None
+        self._block_index = None
+        self._content_hash = None
         self._sync_callback = sync_to_field_callback
+        self._instance_ref = None
         self.schema = schema
 
     def __bool__(self):
-        """Return True if the document has content, False if None or empty."""
+        """Return True if the document has content, False if None or empty.
+
+        Only the raw data is looked at, so e.g. ``{% if post.body %}`` doesn't
+        render or validate anything.
+        """
         if self._raw_data is None:
             return False
 
@@ -106,7 +159,7 @@ class ProsemirrorFieldDocument:
                 f"got {type(value).__name__}"
             )
 
-        self._raw_data = value
+        self._set_raw_data(value)
         self._sync_to_model()
         return self._raw_data
 
@@ -116,13 +169,86 @@ class ProsemirrorFieldDocument:
     @property
     def html(self) -> str:
         """Get the HTML representation of the document."""
-        return doc_to_html(self._raw_data, schema=self.schema)
+        if self._html is not None:
+            self.html_cache_stats.hits += 1
+            return self._html
+
+        self.html_cache_stats.misses += 1
+        self._html = doc_to_html(self._raw_data, schema=self.schema)
+        return self._html
 
     @property
     def safe_html(self) -> SafeString:
         """Get the HTML representation marked safe for Django templates."""
         return mark_safe(self.html)
 
+    def html_excerpt(self, max_chars: int) -> str:
+        """Render the start of the document, up to ``max_chars`` characters of text.
+
+        Only the part of the document that is rendered is visited, which makes this
+        cheap for previews of long documents.
+        """
+        return doc_to_html(self._raw_data, schema=self.schema, max_chars=max_chars)
+
+    @property
+    def block_index(self) -> list[BlockIndexEntry]:
+        """Get the character and word offsets of each top level block.
+
+        The index is computed once and kept until the document changes.
+        """
+        if self._block_index is None:
+            if self._raw_data:
+                extractor = get_text_extractor(self.schema)
+                self._block_index = extractor.block_index(self._raw_data)
+            else:
+                self._block_index = []
+        return self._block_index
+
+    @property
+    def content_hash(self) -> str | None:
+        """Get a stable hash of the document, see :func:`~.cache.doc_hash`.
+
+        The hash is computed once and kept until the document changes. It is None
+        if the document is None.
+        """
+        if self._content_hash is None and self._raw_data is not None:
+            self._content_hash = doc_hash(self._raw_data, self.schema)
+        return self._content_hash
+
+    def render_blocks(self, start: int = 0, stop: int | None = None) -> str:
+        """Render only the top level blocks ``[start:stop]`` of the document."""
+        return doc_blocks_to_html(
+            self._raw_data, schema=self.schema, start=start, stop=stop
+        )
+
+    def pages(self, words_per_page: int) -> list[tuple[int, int]]:
+        """Split the document into pages of roughly ``words_per_page`` words.
+
+        Returns:
+            list[tuple[int, int]]: ``(start, stop)`` block range of each page, to be
+            rendered with :meth:`render_blocks`
+        """
+        return paginate_blocks(self.block_index, words_per_page)
+
+    @property
+    def text(self) -> str:
+        """Get the plain text of the document, see :func:`~.serde.doc_to_text`."""
+        return doc_to_text(self._raw_data, schema=self.schema)
+
+    def iter_html(self) -> Iterator[str]:
+        """Yield the HTML representation of the document block by block.
+
+        Use this for very large documents, e.g. as the content of a
+        ``StreamingHttpResponse``. Unless the HTML was already rendered through
+        :attr:`html`, it is streamed without being cached on the document.
+        """
+        if self._html is not None:
+            self.html_cache_stats.hits += 1
+            yield self._html
+            return
+
+        yield from iter_doc_html(self._raw_data, schema=self.schema)
+
     @html.setter
     def html(self, value: str) -> str:
         """Set the document content from HTML and sync to model.
@@ -130,7 +256,11 @@ class ProsemirrorFieldDocument:
         Args:
             value: HTML string to convert to document format
         """
-        self._raw_data = html_to_doc(value, schema=self.schema)
+        self._set_raw_data(
+            html_to_doc(
+                value, schema=self.schema, limits=DocumentLimits.from_settings()
+            )
+        )
         self._sync_to_model()
         return self.html
 
@@ -158,7 +288,7 @@ class ProsemirrorFieldDocument:
                 f"got {type(value).__name__}"
             )
 
-        self._raw_data = value
+        self._set_raw_data(value)
         self._sync_to_model()
         return self._raw_data
 
@@ -167,7 +297,7 @@ class ProsemirrorFieldDocument:
 
     def clear(self) -> None:
         """Clear all content, resetting to an empty ProseMirror document."""
-        self._raw_data = get_empty_doc()
+        self._set_raw_data(get_empty_doc())
         self._sync_to_model()
 
     clear.alters_data = True  # type: ignore[attr-defined]
@@ -178,14 +308,37 @@ class ProsemirrorFieldDocument:
         The underlying field must allow null values, otherwise saving the model
         instance will raise a database error.
         """
-        self._raw_data = None
+        self._set_raw_data(None)
         self._sync_to_model()
 
     nullify.alters_data = True  # type: ignore[attr-defined]
 
+    def _set_raw_data(self, value: ProsemirrorDocumentDict | None) -> None:
+        """Replace the document data and invalidate everything computed from it."""
+        self._raw_data = value
+        self._html = None
+        self._block_index = None
+        self._content_hash = None
+
+    def _attach(
+        self,
+        instance_ref: "weakref.ref[models.Model]",
+        sync: Callable[[models.Model, ProsemirrorDocumentDict | None], None],
+    ) -> None:
+        """Sync changes to a model instance by calling ``sync(instance, raw_data)``.
+
+        The instance is only referenced weakly, as it holds on to the document.
+        """
+        self._instance_ref = instance_ref
+        self._instance_sync = sync
+
     def _sync_to_model(self):
         """Sync changes back to the model instance"""
-        if self._sync_callback:
+        if self._instance_ref is not None:
+            instance = self._instance_ref()
+            if instance is not None:
+                self._instance_sync(instance, self._raw_data)
+        elif self._sync_callback:
             self._sync_callback(self._raw_data)
 
     def __reduce__(self):
@@ -198,19 +351,65 @@ class ProsemirrorFieldDocument:
         )
 
 
+class _InstanceDocuments(dict):
+    """The documents of the Prosemirror fields of one model instance, by attname.
+
+    Kept on the ``_state`` of the instance, like Django's caches of related objects.
+    Copies of the instance share the dict at first, so it records its owner, and
+    pickling the instance leaves an empty dict without owner behind.
+    """
+
+    __slots__ = ("owner",)
+
+    def __init__(self, owner: "weakref.ref[models.Model] | None" = None):
+        super().__init__()
+        self.owner = owner
+
+    def __reduce__(self):
+        return self.__class__, ()
+
+
+# Attribute of ModelState that holds the _InstanceDocuments of an instance
+_DOCUMENTS_ATTR = "prosemirror_documents"
+
+
+class _UndecodedJSON(str):
+    """JSON of a document loaded from the database by a field with ``lazy=True``.
+
+    A str subclass, so that the descriptor can tell it apart from assigned HTML.
+    Decoded by :meth:`ProsemirrorModelField.to_python` on first access.
+    """
+
+    __slots__ = ()
+
+
+class _UndecodedBinary(bytes):
+    """A packed document loaded by a ``ProsemirrorBinaryField`` with ``lazy=True``.
+
+    Decoded by :meth:`ProsemirrorBinaryField.to_python` on first access.
+    """
+
+    __slots__ = ()
+
+
+# Values that are decoded on first access, see ProsemirrorModelField.lazy
+_UNDECODED = (_UndecodedJSON, _UndecodedBinary)
+
+
 class ProsemirrorFieldDescriptor:
     """Descriptor for managing Prosemirror field access on model instances.
 
     This descriptor handles the conversion between raw field data and
     ProsemirrorFieldDocument instances, providing caching and synchronization.
+
+    Every instance gets one document per field, which is created on first access and
+    kept on the instance itself, so it is garbage collected along with it. The
+    document only holds a weak reference to the instance and syncs changes back
+    through :meth:`_sync`, which is shared by all documents of the field.
     """
 
     schema: Schema
     field: "ProsemirrorModelField"
-    _unsaved_instance_cache: dict[str, ProsemirrorFieldDocument]
-    _saved_instance_cache: weakref.WeakKeyDictionary[
-        models.Model, ProsemirrorFieldDocument
-    ]
 
     def __init__(self, field: "ProsemirrorModelField", schema: Schema):
         """Initialize the field descriptor.
@@ -221,43 +420,28 @@ class ProsemirrorFieldDescriptor:
         """
         self.schema = schema
         self.field = field
+        # Bind once, instead of once per document
+        self._sync_instance = self._sync
 
-        # To avoid memory leaks, we want to ensure our cached objects get removed
-        # when they are garbage collected. However, because unsaved model instances
-        # are not hashable, we have to track those separately and clean them up
-        # using an explicit weakref reference and callback.
-        #
-        # Note also that we use the caching less for performance and more to ensure
-        # a stable identity across multiple references to `field_name`.
-        self._unsaved_instance_cache = {}
-        self._saved_instance_cache = weakref.WeakKeyDictionary()
-
-    def _get_cache_key(self, instance) -> str:
-        """Generate a stable cache key for the instance.
+    def _sync(
+        self, instance: models.Model, raw_data: ProsemirrorDocumentDict | None
+    ) -> None:
+        """Store changes made through a document on its model instance."""
+        instance.__dict__[self.field.attname] = raw_data
 
-        Args:
-            instance: Django model instance
-
-        Returns:
-            str: Cache key for the instance
-        """
-        if instance.pk is not None:
-            # For saved instances, use PK-based key (stable across app restarts)
-            return f"pk_{instance.pk}_{instance._meta.label}"
-        else:
-            # For unsaved instances, use object id (only stable within process)
-            return f"id_{id(instance)}"
-
-    def _can_use_weak_cache(self, instance):
-        """Check if instance can be used as WeakKeyDictionary key.
-
-        Args:
-            instance: Django model instance
+        # Mark the field as changed for Django's change tracking
+        if hasattr(instance, "_state") and hasattr(instance._state, "fields_cache"):
+            instance._state.fields_cache.pop(self.field.attname, None)
 
-        Returns:
-            bool: True if instance can be weakly referenced
-        """
-        return instance.pk is not None
+    def _get_documents(self, instance: models.Model) -> _InstanceDocuments | None:
+        """Return the documents of an instance, or None if there are none yet."""
+        documents = instance._state.__dict__.get(_DOCUMENTS_ATTR)
+        if documents is None or documents.owner is None:
+            return None
+        # A copy of the instance must not reuse the documents of the original
+        if documents.owner() is not instance:
+            return None
+        return documents
 
     def __get__(
         self,
@@ -277,8 +461,9 @@ class ProsemirrorFieldDescriptor:
         if instance is None:
             return self
 
-        current_raw_value: ProsemirrorDocumentDict | None = instance.__dict__.get(
-            self.field.attname
+        attname = self.field.attname
+        current_raw_value: ProsemirrorDocumentDict | None = (
+            self.field.value_from_object(instance)
         )
 
         # Validate that the raw value is a dict or None
@@ -288,77 +473,25 @@ class ProsemirrorFieldDescriptor:
                 f"got {type(current_raw_value).__name__}"
             )
 
-        cached_doc: None | ProsemirrorFieldDocument = None
-        cache_key = self._get_cache_key(instance)
-
-        # Try WeakKeyDictionary first for saved instances to ensure the cache for a
-        # model instance is properly garbage collected...
-        if (
-            self._can_use_weak_cache(instance)
-            and instance in self._saved_instance_cache
-        ):
-            cached_doc = self._saved_instance_cache[instance]
-
-        # ... otherwise, check if the instance is in the unsaved instances cache
-        elif cache_key in self._unsaved_instance_cache:
-            cached_doc = self._unsaved_instance_cache[cache_key]
-
-        # For instances that were recently saved, also check the old unsaved cache key:
-        # this is to ensure that, if a document is initially assigned to an unsaved
-        # instance and the instance is saved, the document retains its identity.
-        elif self._can_use_weak_cache(instance):
-            old_unsaved_key = f"id_{id(instance)}"
-            if old_unsaved_key in self._unsaved_instance_cache:
-                cached_doc = self._unsaved_instance_cache[old_unsaved_key]
-                # Move cached document to saved cache and remove from unsaved cache
-                self._saved_instance_cache[instance] = cached_doc
-                self._unsaved_instance_cache.pop(old_unsaved_key, None)
-
-        # If we have a cache hit, sync raw data and return it
-        if cached_doc is not None:
-            if cached_doc._raw_data != current_raw_value:
-                cached_doc._raw_data = current_raw_value
-
-            return cached_doc
-
-        # No cached document -- create a new document with the appropriate callback to
-        # ensure mutations to the document are synced back to the model.
-        #
-        # We need to use a weakref here to ensure that sync_callback does not capture
-        # the instance in a closure, preventing garbage collection of the document.
-        instance_ref = weakref.ref(instance)
-        field_attname = self.field.attname
-
-        def sync_callback(new_raw_data):
-            instance_obj = instance_ref()
-            if instance_obj is not None:
-                instance_obj.__dict__[field_attname] = new_raw_data
-
-                # Mark the field as changed for Django's change tracking
-                if hasattr(instance_obj, "_state") and hasattr(
-                    instance_obj._state, "fields_cache"
-                ):
-                    instance_obj._state.fields_cache.pop(field_attname, None)
-
-        new_doc = ProsemirrorFieldDocument(
-            current_raw_value,
-            sync_to_field_callback=sync_callback,
-            schema=self.schema,
-        )
-
-        if self._can_use_weak_cache(instance):
-            self._saved_instance_cache[instance] = new_doc
+        documents = self._get_documents(instance)
+        if documents is None:
+            # The weak reference is shared by all fields, as weakref.ref() returns
+            # the existing reference to an object if there is one
+            documents = _InstanceDocuments(weakref.ref(instance))
+            setattr(instance._state, _DOCUMENTS_ATTR, documents)
         else:
-            self._unsaved_instance_cache[cache_key] = new_doc
-
-            # Unsaved instances should be removed from the cache as soon as they are
-            # garbage collected. Because unsaved instances are ephemeral, we don't have
-            # to expect a future call with that specific instance.
-            def cleanup_callback(_cache_key):
-                self._unsaved_instance_cache.pop(_cache_key, None)
-
-            weakref.finalize(instance, cleanup_callback, cache_key)
+            cached_doc = documents.get(attname)
+            if cached_doc is not None:
+                # Sync raw data that was changed on the instance directly
+                if cached_doc._raw_data is not current_raw_value and (
+                    cached_doc._raw_data != current_raw_value
+                ):
+                    cached_doc._set_raw_data(current_raw_value)
+                return cached_doc
 
+        new_doc = ProsemirrorFieldDocument(current_raw_value, schema=self.schema)
+        new_doc._attach(documents.owner, self._sync_instance)
+        documents[attname] = new_doc
         return new_doc
 
     def __set__(self, instance, value):
@@ -369,13 +502,19 @@ class ProsemirrorFieldDescriptor:
             value: New value (dict, str/HTML, None, or ProsemirrorFieldDocument)
 
         Raises:
-            ValidationError: If value is not a supported type
+            ValidationError: If value is not a supported type, or if HTML exceeds
+                the limits configured in the settings
         """
         match value:
             case ProsemirrorFieldDocument():
                 value = value.raw_data
+            case _UndecodedJSON() | _UndecodedBinary():
+                # Loaded from the database, decoded on first access
+                pass
             case str():
-                value = html_to_doc(value, schema=self.schema)
+                value = html_to_doc(
+                    value, schema=self.schema, limits=DocumentLimits.from_settings()
+                )
             case dict() | None:
                 pass
             case _:
@@ -386,16 +525,12 @@ class ProsemirrorFieldDescriptor:
 
         instance.__dict__[self.field.attname] = value
 
-        # Update cached document if it exists in either cache
-        if (
-            self._can_use_weak_cache(instance)
-            and instance in self._saved_instance_cache
-        ):
-            self._saved_instance_cache[instance]._raw_data = value
-        else:
-            cache_key = self._get_cache_key(instance)
-            if cache_key in self._unsaved_instance_cache:
-                self._unsaved_instance_cache[cache_key]._raw_data = value
+        # Update the cached document, if there is one
+        documents = self._get_documents(instance)
+        if documents is not None and self.field.attname in documents:
+            documents[self.field.attname]._set_raw_data(
+                self.field.value_from_object(instance)
+            )
 
         # Clear Django's field cache
         if hasattr(instance, "_state") and hasattr(instance._state, "fields_cache"):
@@ -407,12 +542,9 @@ class ProsemirrorFieldDescriptor:
         Args:
             instance: Django model instance
         """
-        # Clean up both caches when field is deleted
-        if self._can_use_weak_cache(instance):
-            self._saved_instance_cache.pop(instance, None)
-
-        cache_key = self._get_cache_key(instance)
-        self._unsaved_instance_cache.pop(cache_key, None)
+        documents = self._get_documents(instance)
+        if documents is not None:
+            documents.pop(self.field.attname, None)
 
         if self.field.attname in instance.__dict__:
             del instance.__dict__[self.field.attname]
@@ -431,6 +563,8 @@ class ProsemirrorModelField(models.JSONField):
 
     description = "Prosemirror content stored as JSON"
     config: ProsemirrorConfig
+    html_field: str | None
+    lazy: bool
 
     def __new__(cls, *args: Any, **kwargs: Any) -> "ProsemirrorModelField":
         """Create a new instance of ProsemirrorModelField."""
@@ -448,6 +582,8 @@ class ProsemirrorModelField(models.JSONField):
         allowed_mark_types: list[MarkType] | None = None,
         tag_to_classes: Mapping[str, str] | None = None,
         history: bool | None = None,
+        html_field: str | None = None,
+        lazy: bool = False,
         **kwargs: Any,
     ):
         """Initialize the Prosemirror model field.
@@ -462,6 +598,11 @@ class ProsemirrorModelField(models.JSONField):
             allowed_mark_types: List of MarkType enums to allow
             tag_to_classes: Mapping of tag names to CSS classes
             history: Whether to enable history support
+            html_field: Name of a text field on the same model that is kept up to
+                date with the rendered HTML of this field on every save
+            lazy: Keep the JSON loaded from the database undecoded until the
+                document is first accessed, so that rows which are loaded but
+                not rendered don't pay for decoding it
             **kwargs: Additional field options
 
         Raises:
@@ -485,6 +626,8 @@ class ProsemirrorModelField(models.JSONField):
             tag_to_classes=tag_to_classes,
             history=history,
         )
+        self.html_field = html_field
+        self.lazy = lazy
 
         # Validate default callable if provided
         if default:
@@ -529,12 +672,122 @@ class ProsemirrorModelField(models.JSONField):
             name,
             ProsemirrorFieldDescriptor(self, schema=self.config.schema),
         )
+        # Use a pre_save signal rather than pre_save() on the field, so that the
+        # HTML is rendered before any field values are collected for the query,
+        # regardless of where the companion field is declared on the model. The
+        # signal is sent with proxy and multi-table child classes as the sender, so
+        # it is connected for all senders and filtered in update_html_field().
+        if self.html_field and not cls._meta.abstract:
+            signals.pre_save.connect(self.update_html_field)
+
+    def update_html_field(self, instance: models.Model, **kwargs: Any) -> None:
+        """Render the document into the companion ``html_field`` of the instance.
+
+        Note that saving with ``update_fields`` only persists the rendered HTML if
+        the companion field is included in ``update_fields``.
+        """
+        if not self.html_field or not isinstance(instance, self.model):
+            return
+
+        setattr(instance, self.html_field, self.render_html(instance))
+
+    def render_html(self, instance: models.Model) -> str:
+        """Render the document stored on a model instance to HTML."""
+        return doc_to_html(self.value_from_object(instance), schema=self.config.schema)
+
+    def check(self, **kwargs):
+        return [*super().check(**kwargs), *self._check_html_field()]
+
+    def _check_html_field(self) -> list[checks.CheckMessage]:
+        if not self.html_field:
+            return []
+
+        try:
+            html_field = self.model._meta.get_field(self.html_field)
+        except FieldDoesNotExist:
+            return [
+                checks.Error(
+                    f"'html_field' refers to the nonexistent field "
+                    f"'{self.html_field}'.",
+                    obj=self,
+                    id="django_prosemirror.E001",
+                )
+            ]
+
+        if not isinstance(html_field, models.TextField):
+            return [
+                checks.Error(
+                    f"'html_field' refers to '{self.html_field}', which is not a "
+                    "TextField.",
+                    obj=self,
+                    id="django_prosemirror.E002",
+                )
+            ]
+        return []
+
+    def from_db_value(self, value, expression, connection):
+        """Decode the JSON loaded from the database, unless the field is lazy."""
+        if isinstance(value, bytes):
+            value = value.decode()
+        if not isinstance(value, str):
+            # None, or already decoded by the database driver
+            return value
+        if self.lazy and not isinstance(expression, KeyTransform):
+            return _UndecodedJSON(value)
+        return self._loads(value)
+
+    def to_python(self, value):
+        """Decode JSON that was loaded from the database by a lazy field.
+
+        With ``lazy=True``, ``QuerySet.values()`` and ``values_list()`` return the
+        JSON of the document as a string, which this decodes.
+        """
+        if not isinstance(value, _UndecodedJSON):
+            return value
+        return self._loads(value)
 
     def get_prep_value(self, value):
         """Prepare value for database storage."""
         if isinstance(value, ProsemirrorFieldDocument):
             value = value.raw_data
-        return super().get_prep_value(value)
+        return super().get_prep_value(self.to_python(value))
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        """Encode the value for the database with the configured JSON codec."""
+        if self.encoder is not None:
+            return super().get_db_prep_value(value, connection, prepared)
+        if not prepared:
+            value = self.get_prep_value(value)
+        # Like JSONField, unwrap JSON values and pass other expressions through
+        if isinstance(value, Value) and isinstance(
+            value.output_field, models.JSONField
+        ):
+            value = value.value
+        elif hasattr(value, "as_sql"):
+            return value
+        if connection.vendor == "postgresql":
+            from django.db.backends.postgresql.psycopg_any import Jsonb
+
+            return Jsonb(value, dumps=get_codec().dumps)
+        return get_codec().dumps(value)
+
+    def _loads(self, value: str) -> Any:
+        """Decode JSON with the decoder of the field or the configured codec.
+
+        Like JSONField, invalid JSON is returned as is.
+        """
+        try:
+            if self.decoder is not None:
+                return json.loads(value, cls=self.decoder)
+            return get_codec().loads(value)
+        except json.JSONDecodeError:
+            return str(value)
+
+    def _dumps(self, value: Any) -> str:
+        """Encode JSON with the encoder of the field or the configured codec."""
+        if self.encoder is not None:
+            return json.dumps(value, cls=self.encoder)
+        return get_codec().dumps(value)
 
     def value_to_string(self, obj):
         """Convert field value to string for serialization."""
@@ -543,11 +796,13 @@ class ProsemirrorModelField(models.JSONField):
         if isinstance(value, ProsemirrorFieldDocument):
             value = value.raw_data
 
-        return json.dumps(value, cls=self.encoder) if value is not None else ""
+        return self._dumps(value) if value is not None else ""
 
     def value_from_object(self, obj):
         """Get the raw field value from model instance."""
         raw_value = obj.__dict__.get(self.attname)
+        if isinstance(raw_value, _UNDECODED):
+            raw_value = obj.__dict__[self.attname] = self.to_python(raw_value)
         return raw_value
 
     def validate(self, value, model_instance):
@@ -567,9 +822,87 @@ class ProsemirrorModelField(models.JSONField):
         kwargs["allowed_node_types"] = self.config.allowed_node_types
         kwargs["allowed_mark_types"] = self.config.allowed_mark_types
         kwargs["history"] = self.config.history
+        if self.html_field:
+            kwargs["html_field"] = self.html_field
+        if self.lazy:
+            kwargs["lazy"] = True
         return name, path, args, kwargs
 
 
+class ProsemirrorBinaryField(ProsemirrorModelField):
+    """Prosemirror field that stores documents compressed in a binary column.
+
+    Has the same options and document API as ProsemirrorModelField, but documents
+    are stored as zlib-compressed JSON (see :func:`~.codec.pack_json`), which takes
+    a fraction of the space, e.g. for archive tables. The column can't be queried
+    on the content of the documents, only for NULL.
+    """
+
+    description = "Prosemirror content stored as compressed binary"
+
+    def get_internal_type(self):
+        return "BinaryField"
+
+    def get_placeholder(self, value, compiler, connection):
+        return connection.ops.binary_placeholder_sql(value)
+
+    def _check_supported(self, databases):
+        # Unlike JSONField, this doesn't need JSON support from the database
+        return []
+
+    def get_transform(self, name):
+        # No key transforms, which would query the packed bytes as JSON
+        return super(models.JSONField, self).get_transform(name)
+
+    def get_lookup(self, lookup_name):
+        # Only NULL checks are meaningful on packed documents
+        if lookup_name != "isnull":
+            return None
+        return super().get_lookup(lookup_name)
+
+    def from_db_value(self, value, expression, connection):
+        """Unpack the document loaded from the database, unless the field is lazy."""
+        if value is None:
+            return value
+        # memoryview on PostgreSQL
+        value = bytes(value)
+        if self.lazy:
+            return _UndecodedBinary(value)
+        return self._unpack(value)
+
+    def to_python(self, value):
+        """Unpack a document that was loaded from the database by a lazy field.
+
+        With ``lazy=True``, ``QuerySet.values()`` and ``values_list()`` return the
+        packed document as bytes, which this unpacks.
+        """
+        if not isinstance(value, _UndecodedBinary):
+            return value
+        return self._unpack(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        """Pack the value for the database."""
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None or hasattr(value, "as_sql"):
+            return value
+        return connection.Database.Binary(pack_json(self._dumps(value)))
+
+    def _unpack(self, value: bytes) -> Any:
+        """Decode a packed document, returning corrupt values as is."""
+        try:
+            return self._loads(unpack_json(value))
+        except ValueError:
+            return bytes(value)
+
+
+def _unwrap(value: Any) -> Any:
+    """Return the document dict of a ProsemirrorFieldDocument, other values as is."""
+    if isinstance(value, ProsemirrorFieldDocument):
+        return value.doc
+    return value
+
+
 class ProsemirrorFormField(forms.JSONField):  # type: ignore[misc]
     """Django form field for Prosemirror rich text content.
 
@@ -624,12 +957,103 @@ class ProsemirrorFormField(forms.JSONField):  # type: ignore[misc]
             history=self.config.history,
         )
         super().__init__(encoder, decoder, **kwargs)  # type: ignore[misc]
+        # Hash of the submitted JSON and the initial document while the field is
+        # being cleaned
+        self._submitted_hash: str | None = None
+        self._initial_doc: ProsemirrorDocumentDict | None = None
+        # The last submitted JSON and its decoded value, as both cleaning and
+        # has_changed() decode the submitted value
+        self._decoded: tuple[str, Any] | None = None
+        # The bound field of the form the field belongs to, for its initial value
+        self._bound_field: weakref.ref[forms.BoundField] | None = None
+
+    def get_bound_field(self, form, field_name):
+        # clean() is only passed the submitted value, so the initial document is
+        # looked up through the bound field
+        bound_field = super().get_bound_field(form, field_name)
+        self._bound_field = weakref.ref(bound_field)
+        return bound_field
+
+    def _get_initial_doc(self) -> Any:
+        """Return the initial document of the form the field is bound to, if any."""
+        bound_field = self._bound_field() if self._bound_field is not None else None
+        if bound_field is None or bound_field.field is not self:
+            return None
+        return _unwrap(bound_field.initial)
+
+    def has_changed(self, initial, data) -> bool:
+        """Return whether the submitted document differs from the initial one.
+
+        Documents are compared as decoded JSON, so the order of keys doesn't matter.
+        """
+        if self.disabled:
+            return False
+        try:
+            doc = self.to_python(data).doc
+        except ValidationError:
+            return True
+        return _unwrap(initial) != doc
+
+    def clean(self, value):
+        """Validate the submitted value and return it as a document."""
+        # The initial document is what is stored already, so if it is submitted
+        # unchanged it is returned without validating it again, even if it would
+        # not pass validation now (e.g. after the allowed node types changed).
+        initial = self._get_initial_doc()
+        if initial is not None and isinstance(value, str) and not self.disabled:
+            document = self.to_python(value)
+            if document.doc == initial:
+                return document
+        # For the same reason, only the blocks that changed are validated
+        self._initial_doc = initial if isinstance(initial, dict) else None
+        # Hashing the submitted JSON is much cheaper than validating the document,
+        # so resubmitting the same document skips validation (see validate_doc).
+        # A custom decoder may not map equal JSON to equal documents.
+        self._submitted_hash = (
+            json_digest(value)
+            if isinstance(value, str) and self.decoder is None and not self.disabled
+            else None
+        )
+        try:
+            return super().clean(value)
+        finally:
+            self._submitted_hash = None
+            self._initial_doc = None
 
     def to_python(self, value) -> ProsemirrorFieldDocument:
         """Convert form input to Python representation."""
-        python_value = super().to_python(value)
+        if not isinstance(value, str) or self.disabled:
+            python_value = super().to_python(value)
+        elif self._decoded is not None and self._decoded[0] is value:
+            python_value = self._decoded[1]
+        else:
+            # Reject oversized input before decoding it
+            DocumentLimits.from_settings().check_input(value)
+            python_value = self._loads(value)
+            self._decoded = (value, python_value)
         return ProsemirrorFieldDocument(python_value, schema=self.config.schema)
 
+    def _loads(self, value: str) -> Any:
+        """Decode submitted JSON like JSONField, with the configured JSON codec."""
+        if self.decoder is not None or value in self.empty_values:
+            return super().to_python(value)
+        try:
+            python_value = get_codec().loads(value)
+        except json.JSONDecodeError:
+            raise ValidationError(
+                self.error_messages["invalid"], code="invalid", params={"value": value}
+            ) from None
+        if isinstance(python_value, str):
+            return JSONString(python_value)
+        return python_value
+
+    def prepare_value(self, value):
+        """Serialize the value for the widget with the configured JSON codec."""
+        value = _unwrap(value)
+        if isinstance(value, InvalidJSONInput) or self.encoder is not None:
+            return super().prepare_value(value)
+        return get_codec().dumps(value)
+
     def validate(self, value):
         """Validate the form field value."""
         if not isinstance(value, ProsemirrorFieldDocument):
@@ -639,4 +1063,10 @@ class ProsemirrorFormField(forms.JSONField):  # type: ignore[misc]
 
         super().validate(value.doc)
         if value.doc is not None:
-            validate_doc(value.doc, schema=self.config.schema)
+            validate_doc(
+                value.doc,
+                schema=self.config.schema,
+                limits=DocumentLimits.from_settings(),
+                json_digest=self._submitted_hash,
+                initial=self._initial_doc,
+            )
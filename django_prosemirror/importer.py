@@ -0,0 +1,901 @@
+"""Streaming import of HTML into Prosemirror document dicts.
+
+The DOMParser-based path (``html_to_doc(..., engine="dom")``) first builds an lxml
+tree of the whole input, walks it into a tree of Prosemirror ``Node`` objects and
+finally converts that to a dict. The importer in this module instead consumes the
+events of an incremental tokenizer (:class:`html.parser.HTMLParser`) and builds the
+document dict directly, applying the parse rules of the schema (the
+``dom_matcher()`` methods of the node and mark definitions) as it goes.
+
+Node placement (wrapping, marks, whitespace handling) mirrors prosemirror's
+``ParseContext``, and implied end tags follow libxml2's HTML parser, which the
+DOMParser-based path uses, so that both engines produce the same documents.
+"""
+
+import re
+import weakref
+from collections.abc import Iterable
+from html.parser import HTMLParser
+from typing import Any
+
+import lxml.html
+from lxml.cssselect import CSSSelector
+from prosemirror import Schema
+from prosemirror.model import DOMParser, Fragment, Mark
+from prosemirror.model.content import ContentMatch
+from prosemirror.model.from_dom import (
+    BLOCK_TAGS,
+    IGNORE_TAGS,
+    LIST_TAGS,
+    OPT_PRESERVE_WS,
+    OPT_PRESERVE_WS_FULL,
+    StyleParseRule,
+    TagParseRule,
+    WSType,
+    parse_styles,
+    ws_options_for,
+)
+from prosemirror.model.schema import NodeType
+
+from django_prosemirror.limits import DocumentLimits, LimitCounter
+from django_prosemirror.schema import ProsemirrorDocumentDict
+
+# Elements that never have content or an end tag
+_VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+# Document level wrappers, which lxml drops when parsing a fragment
+_DOCUMENT_TAGS = frozenset({"html", "body"})
+
+_HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+_FONT_STYLES = ("b", "i", "u", "s", "strike", "tt", "big", "small")
+
+# Open elements that are implicitly closed by a start tag, as done by libxml2
+_START_CLOSE: dict[str, frozenset[str]] = {
+    tag: frozenset(closes)
+    for tag, closes in {
+        "p": ("p", *_HEADINGS, *_FONT_STYLES),
+        "div": ("p",),
+        **dict.fromkeys(_HEADINGS, ("p",)),
+        "ul": ("p", "pre", "address"),
+        "ol": ("p",),
+        "li": ("p", *_HEADINGS, "li", "pre", "dl", "address"),
+        "table": ("p", *_HEADINGS, "pre", "a"),
+        "tr": ("p", "tr", "td", "th", "caption"),
+        "td": ("p", "td", "th", "a", "b", "i", "u", "span", "font"),
+        "th": ("p", "td", "th", "a", "b", "i", "u", "span", "font"),
+        "tbody": ("p", "tr", "td", "th", "tbody", "thead", "tfoot", "caption"),
+        "thead": ("caption",),
+        "tfoot": ("p", "tr", "td", "th", "tbody", "thead", "caption"),
+        "caption": ("p",),
+        "blockquote": ("p",),
+        "pre": ("p", "ul"),
+        "hr": ("p",),
+        "a": ("a",),
+        "dl": ("p", "pre", "dt", "address"),
+        "dt": ("p", "pre", "dd", "address"),
+        "dd": ("p", "pre", "dt", "address"),
+        "address": ("p", "ul"),
+        "form": ("p", *_HEADINGS, "ul", "ol", "pre", "dl", "address", "form"),
+        "center": ("p", "b", "i", "font"),
+    }.items()
+}
+
+# An end tag doesn't close open elements with a higher priority, as in libxml2
+_END_PRIORITY = {
+    "div": 150,
+    "td": 160,
+    "th": 160,
+    "tr": 170,
+    "thead": 180,
+    "tbody": 180,
+    "tfoot": 180,
+    "table": 190,
+}
+_DEFAULT_END_PRIORITY = 100
+
+_WHITESPACE = re.compile(r"[ \t\r\n\u000c]+")
+_LEADING_WHITESPACE = re.compile(r"^[ \t\r\n\u000c]")
+_TRAILING_WHITESPACE = re.compile(r"[ \t\r\n\u000c]+$")
+_NON_WHITESPACE = re.compile(r"[^ \t\r\n\u000c]")
+_PRE_STYLE = re.compile(r"white-space\s*:\s*pre")
+_SIMPLE_TAG = re.compile(r"^[a-z][a-z0-9-]*$", re.IGNORECASE)
+
+
+class StreamingHTMLImporter:
+    """Convert HTML to Prosemirror document dicts without building a DOM tree.
+
+    The importer compiles the same parse rules as the DOMParser of the schema.
+    Rules are matched against each element on its own, so selectors that depend on
+    the position of an element in the document are not supported, and neither are
+    rules using ``contentElement``, ``getContent``, ``skip`` or ``consuming``.
+
+    NOTE: You should not instantiate this class directly, use :func:`get_importer`.
+    """
+
+    schema: Schema
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        parser = DOMParser(schema, DOMParser.schema_rules(schema))
+        self.style_rules: list[StyleParseRule] = parser._styles
+        # Prosemirror 0.6+ matches the styles in the order of the rules, older
+        # versions in the order they appear in the style attribute
+        self.matched_styles: list[str] | None = getattr(parser, "matched_styles", None)
+        self.normalize_lists: bool = parser.normalize_lists
+        # linebreakReplacement was added in prosemirror 0.6
+        self.linebreak_replacement: NodeType | None = getattr(
+            schema, "linebreak_replacement", None
+        )
+
+        # Tag rules in priority order, with a selector for the ones that match on
+        # more than the tag name
+        self._tag_rules: list[tuple[TagParseRule, str | None, CSSSelector | None]]
+        self._tag_rules = []
+        for rule in parser._tags:
+            if (
+                rule.content_element is not None
+                or rule.get_content is not None
+                or rule.skip
+                or rule.consuming is False
+            ):
+                raise ValueError(
+                    f"Parse rule for '{rule.tag}' is not supported by the "
+                    "streaming importer"
+                )
+            if _SIMPLE_TAG.match(rule.tag):
+                self._tag_rules.append((rule, rule.tag.lower(), None))
+            else:
+                self._tag_rules.append((rule, None, CSSSelector(rule.tag)))
+        self._rules_by_tag: dict[str, list[tuple[TagParseRule, CSSSelector | None]]]
+        self._rules_by_tag = {}
+
+    def parse(
+        self, value: str | Iterable[str], limits: DocumentLimits | None = None
+    ) -> ProsemirrorDocumentDict:
+        """Convert HTML, given as a string or as an iterable of chunks, to a document.
+
+        Args:
+            value: HTML to convert
+            limits: Limits to enforce while parsing, parsing stops as soon as the
+                input or the document built so far exceeds one of them
+
+        Returns:
+            ProsemirrorDocumentDict: Document as dict structure
+
+        Raises:
+            ValidationError: If the input or the document exceeds a limit
+        """
+        counter = limits.counter(self.schema) if limits is not None else None
+        tokenizer = _Tokenizer(_ParseState(self, counter))
+        if isinstance(value, str):
+            if limits is not None:
+                limits.check_input(value)
+            tokenizer.feed(value)
+        else:
+            received = 0
+            for chunk in value:
+                if limits is not None and limits.max_input_bytes is not None:
+                    received += len(chunk.encode("utf-8", "surrogatepass"))
+                    limits.check_input_size(received)
+                tokenizer.feed(chunk)
+        tokenizer.close()
+        return tokenizer.state.finish()
+
+    def rules_for(self, tag: str) -> list[tuple[TagParseRule, CSSSelector | None]]:
+        """Return the rules that may match an element, with their selector if any."""
+        try:
+            return self._rules_by_tag[tag]
+        except KeyError:
+            rules = [
+                (rule, selector)
+                for rule, name, selector in self._tag_rules
+                if name is None or name == tag
+            ]
+            return self._rules_by_tag.setdefault(tag, rules)
+
+
+class _NodeContext:
+    """A node under construction, see ``NodeContext`` in prosemirror."""
+
+    __slots__ = ("attrs", "content", "marks", "match", "options", "solid", "type")
+
+    def __init__(
+        self,
+        node_type: NodeType,
+        attrs: dict[str, Any] | None,
+        marks: list[Mark],
+        solid: bool,
+        options: int,
+    ):
+        self.type = node_type
+        self.attrs = attrs
+        self.marks = marks
+        self.solid = solid
+        self.match: ContentMatch | None = node_type.content_match
+        self.options = options
+        self.content: list[dict[str, Any]] = []
+
+    def find_wrapping(
+        self, node_type: NodeType, attrs: dict[str, Any] | None
+    ) -> list[NodeType] | None:
+        if self.match is None:
+            start = self.type.content_match
+            node = (
+                node_type.schema.text(" ")
+                if node_type.is_text
+                else node_type.create(attrs)
+            )
+            fill = start.fill_before(Fragment.from_(node))
+            if fill is None:
+                wrap = start.find_wrapping(node_type)
+                if wrap is not None:
+                    self.match = start
+                return wrap
+            self.match = start.match_fragment(fill)
+            if self.match is None:
+                return None
+        return self.match.find_wrapping(node_type)
+
+    def finish(self) -> dict[str, Any]:
+        content = self.content
+        if not self.options & OPT_PRESERVE_WS and content:
+            last = content[-1]
+            if last["type"] == "text":
+                trailing = _TRAILING_WHITESPACE.search(last["text"])
+                if trailing and trailing.start() == 0:
+                    content.pop()
+                elif trailing:
+                    content[-1] = {**last, "text": last["text"][: trailing.start()]}
+
+        content = _join_text(content)
+        if self.match is not None:
+            fill = self.match.fill_before(Fragment.empty, True)
+            if fill is not None:
+                content.extend(node.to_json() for node in fill.content)
+
+        node: dict[str, Any] = {"type": self.type.name}
+        attrs = self.type.compute_attrs(self.attrs)
+        if attrs:
+            node["attrs"] = attrs
+        if content:
+            node["content"] = content
+        if self.marks:
+            node["marks"] = [mark.to_json() for mark in self.marks]
+        return node
+
+
+def _join_text(content: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge adjacent text nodes with the same marks, like ``Fragment.from_array``."""
+    joined: list[dict[str, Any]] = []
+    for node in content:
+        if (
+            joined
+            and node["type"] == "text"
+            and joined[-1]["type"] == "text"
+            and joined[-1].get("marks") == node.get("marks")
+        ):
+            joined[-1] = {**joined[-1], "text": joined[-1]["text"] + node["text"]}
+        else:
+            joined.append(node)
+    return joined
+
+
+def _dom_element(tag: str, attrs: dict[str, str]) -> lxml.html.HtmlElement:
+    """Create a detached element for parse rules that inspect the DOM."""
+    element = lxml.html.Element(tag)
+    for name, value in attrs.items():
+        try:
+            element.set(name, value)
+        except ValueError:
+            # lxml's parser drops attributes with invalid names as well
+            pass
+    return element
+
+
+class _Element:
+    """An open HTML element, and what to do when it is closed."""
+
+    __slots__ = (
+        "close_node",
+        "deferred_text",
+        "has_children",
+        "ignore",
+        "last_item",
+        "marks",
+        "outer_preserve_ws",
+        "resumed_item",
+        "sync_to",
+        "tag",
+    )
+
+    def __init__(self, tag: str, marks: list[Mark], outer_preserve_ws: bool):
+        self.tag = tag
+        # Marks applied to the content of the element
+        self.marks = marks
+        self.ignore = False
+        self.outer_preserve_ws = outer_preserve_ws
+        # Node context to return to when the element is closed, and whether the
+        # node that was entered for the element is closed along with it
+        self.sync_to: _NodeContext | None = None
+        self.close_node = False
+        # For lists: the preceding list item the list was moved into
+        self.resumed_item: _NodeContext | None = None
+        # For lists: the node context of the last list item, as long as no other
+        # element followed it
+        self.last_item: _NodeContext | None = None
+        # For lists: text that followed the last list item. The DOMParser moves
+        # the lists that follow an item into it, ahead of that text.
+        self.deferred_text = ""
+        # Whether the element has child nodes, after lxml dropped whitespace text
+        self.has_children = False
+
+
+class _ParseState:
+    """The state of a single import, see ``ParseContext`` in prosemirror."""
+
+    def __init__(self, importer: StreamingHTMLImporter, counter: LimitCounter | None):
+        self.importer = importer
+        self.schema = importer.schema
+        self.counter = counter
+        self.nodes = [_NodeContext(self.schema.top_node_type, None, Mark.none, True, 0)]
+        self.open = 0
+        self.local_preserve_ws = False
+        self.elements: list[_Element] = []
+        self.ignored = 0
+        self.text_chunks: list[str] = []
+        # Tag of the element right before the next text, "" for other content
+        self.previous_tag = ""
+
+    @property
+    def top(self) -> _NodeContext:
+        return self.nodes[self.open]
+
+    @property
+    def marks(self) -> list[Mark]:
+        return self.elements[-1].marks if self.elements else Mark.none
+
+    # Tokenizer events
+
+    def start_tag(self, tag: str, attrs: dict[str, str]) -> None:
+        self.flush_text()
+        if tag in _DOCUMENT_TAGS:
+            return
+
+        closes = _START_CLOSE.get(tag)
+        while closes and self.elements and self.elements[-1].tag in closes:
+            self.close_element()
+
+        if self.elements and tag not in LIST_TAGS:
+            self.flush_deferred_text()
+        if self.elements:
+            self.elements[-1].has_children = True
+        element = _Element(tag, self.marks, self.local_preserve_ws)
+        if self.ignored:
+            self.ignore_content(element)
+        else:
+            self.open_element(element, attrs)
+        self.elements.append(element)
+        self.previous_tag = ""
+
+        if tag in _VOID_TAGS:
+            self.close_element()
+
+    def end_tag(self, tag: str) -> None:
+        if tag in _VOID_TAGS or tag in _DOCUMENT_TAGS:
+            return
+
+        for index in range(len(self.elements) - 1, -1, -1):
+            if self.elements[index].tag == tag:
+                break
+        else:
+            return
+
+        priority = _END_PRIORITY.get(tag, _DEFAULT_END_PRIORITY)
+        if any(
+            _END_PRIORITY.get(element.tag, _DEFAULT_END_PRIORITY) > priority
+            for element in self.elements[index + 1 :]
+        ):
+            return
+
+        self.flush_text()
+        while len(self.elements) > index:
+            self.close_element()
+
+    def text(self, value: str) -> None:
+        if not self.ignored:
+            self.text_chunks.append(value)
+
+    def comment(self) -> None:
+        self.flush_text()
+        self.previous_tag = ""
+        if self.elements:
+            self.elements[-1].has_children = True
+
+    def finish(self) -> ProsemirrorDocumentDict:
+        self.flush_text()
+        while self.elements:
+            self.close_element()
+        self.open = 0
+        self.close_extra()
+        return self.nodes[0].finish()
+
+    # Elements
+
+    def open_element(self, element: _Element, attrs: dict[str, str]) -> None:
+        tag = element.tag
+        marks = element.marks
+        style = attrs.get("style", "")
+        top = self.top
+
+        if tag == "pre" or _PRE_STYLE.search(style):
+            self.local_preserve_ws = True
+
+        if tag in LIST_TAGS and self.importer.normalize_lists:
+            self.resume_list_item(element)
+
+        rule, rule_attrs = self.match_tag(tag, attrs)
+
+        if (rule is not None and rule.ignore) or tag in IGNORE_TAGS:
+            if tag == "br" and not self.top.type.inline_content:
+                self.find_place(self.schema.nodes["text"], None, marks, True)
+            self.ignore_content(element)
+        elif rule is None or rule.close_parent:
+            if rule is not None:
+                self.open = max(0, self.open - 1)
+
+            if tag in BLOCK_TAGS:
+                if top.content and self.is_inline(top.content[0]) and self.open:
+                    self.open -= 1
+                    top = self.top
+                element.sync_to = top
+            elif tag in _VOID_TAGS:
+                self.leaf_fallback(tag, marks)
+                return
+
+            inner_marks = self.read_styles(style, marks)
+            if inner_marks is None:
+                self.ignore_content(element)
+            else:
+                element.marks = inner_marks
+        else:
+            inner_marks = self.read_styles(style, marks)
+            if inner_marks is None:
+                self.ignore_content(element)
+            else:
+                self.open_by_rule(element, rule, rule_attrs, inner_marks)
+
+    def open_by_rule(
+        self,
+        element: _Element,
+        rule: TagParseRule,
+        attrs: dict[str, Any] | None,
+        marks: list[Mark],
+    ) -> None:
+        if rule.node is not None:
+            node_type = self.schema.nodes[rule.node]
+            if node_type.is_leaf:
+                if not self.insert_leaf(node_type, attrs, marks, element.tag == "br"):
+                    self.leaf_fallback(element.tag, marks)
+                self.ignore_content(element)
+                return
+
+            inner_marks = self.enter(node_type, attrs, marks, rule.preserve_whitespace)
+            if inner_marks is not None:
+                marks = inner_marks
+                element.sync_to = self.top
+                element.close_node = True
+        elif rule.mark is not None:
+            marks = [*marks, self.schema.marks[rule.mark].create(attrs)]
+
+        element.marks = marks
+
+    def close_element(self) -> None:
+        self.flush_text()
+        self.flush_deferred_text()
+        element = self.elements.pop()
+        if element.ignore:
+            self.ignored -= 1
+        synced = element.sync_to is not None and self.sync(element.sync_to)
+        if synced and element.close_node:
+            self.open -= 1
+        # The list may have been placed outside the item, which is then closed
+        if element.resumed_item is not None and self.sync(element.resumed_item):
+            self.open -= 1
+        self.local_preserve_ws = element.outer_preserve_ws
+        self.previous_tag = element.tag
+
+        if self.elements and not self.ignored:
+            parent = self.elements[-1]
+            if element.tag == "li":
+                # Like the DOMParser, which tests the truth value of the lxml
+                # element, list items without children are not continued
+                has_node = element.close_node and element.has_children
+                parent.last_item = element.sync_to if has_node else None
+            elif element.tag not in LIST_TAGS:
+                parent.last_item = None
+
+    def ignore_content(self, element: _Element) -> None:
+        element.ignore = True
+        self.ignored += 1
+
+    def resume_list_item(self, element: _Element) -> None:
+        """Reopen the preceding list item for a list that is not inside one.
+
+        The DOMParser moves a list that directly follows a list item into that list
+        item. The node of the list item is still there, as nothing was added after
+        it, so it can be reopened.
+        """
+        if not self.elements or self.elements[-1].tag not in LIST_TAGS:
+            return
+        item = self.elements[-1].last_item
+        if self.open + 1 < len(self.nodes) and self.nodes[self.open + 1] is item:
+            self.open += 1
+            element.resumed_item = item
+
+    def match_tag(
+        self, tag: str, attrs: dict[str, str]
+    ) -> tuple[TagParseRule | None, dict[str, Any] | None]:
+        dom = None
+        for rule, selector in self.importer.rules_for(tag):
+            if selector is not None:
+                dom = dom if dom is not None else _dom_element(tag, attrs)
+                if dom not in selector(dom):
+                    continue
+            if rule.context and not self.matches_context(rule.context):
+                continue
+            if rule.get_attrs is None:
+                return rule, rule.attrs
+            dom = dom if dom is not None else _dom_element(tag, attrs)
+            result = rule.get_attrs(dom)
+            if result is not False:
+                return rule, result
+        return None, None
+
+    def read_styles(self, style: str, marks: list[Mark]) -> list[Mark] | None:
+        if not style:
+            return marks
+
+        styles = parse_styles(style)
+        if self.importer.matched_styles is None:
+            pairs = zip(styles[::2], styles[1::2], strict=True)
+        else:
+            style_dict = dict(zip(styles[::2], styles[1::2], strict=True))
+            pairs = (
+                (name, style_dict.get(name)) for name in self.importer.matched_styles
+            )
+        for name, value in pairs:
+            if not value:
+                continue
+            rule, attrs = self.match_style(name, value)
+            if rule is None:
+                continue
+            if rule.ignore:
+                return None
+            if rule.clear_mark is not None:
+                marks = [mark for mark in marks if not rule.clear_mark(mark)]
+            else:
+                marks = [*marks, self.schema.marks[rule.mark].create(attrs)]
+        return marks
+
+    def match_style(
+        self, prop: str, value: str
+    ) -> tuple[StyleParseRule | None, dict[str, Any] | None]:
+        for rule in self.importer.style_rules:
+            style = rule.style
+            if (
+                style is None
+                or not style.startswith(prop)
+                or (rule.context and not self.matches_context(rule.context))
+                or (
+                    len(style) > len(prop)
+                    and (style[len(prop)] != "=" or style[len(prop) + 1 :] != value)
+                )
+            ):
+                continue
+            if rule.get_attrs is None:
+                return rule, rule.attrs
+            result = rule.get_attrs(value)
+            if result is not False:
+                return rule, result
+        return None, None
+
+    def matches_context(self, context: str) -> bool:
+        if "|" in context:
+            return any(
+                self.matches_context(part) for part in re.split(r"\s*\|\s*", context)
+            )
+
+        parts = context.split("/")
+
+        def match(start: int, depth: int) -> bool:
+            for i in range(start, -1, -1):
+                part = parts[i]
+                if part == "":
+                    if i == len(parts) - 1 or i == 0:
+                        continue
+                    return any(match(i - 1, d) for d in range(depth, -1, -1))
+                if depth < 0:
+                    return False
+                node_type = self.nodes[depth].type
+                if node_type.name != part and not node_type.is_in_group(part):
+                    return False
+                depth -= 1
+            return True
+
+        return match(len(parts) - 1, self.open)
+
+    # Text
+
+    def flush_text(self) -> None:
+        if not self.text_chunks:
+            return
+        value = "".join(self.text_chunks)
+        self.text_chunks.clear()
+        # lxml drops text that is only whitespace before the DOMParser sees it
+        if not value.strip():
+            return
+        parent = self.elements[-1] if self.elements else None
+        if (
+            parent is not None
+            and parent.last_item is not None
+            and parent.tag in LIST_TAGS
+            and self.importer.normalize_lists
+        ):
+            # Text doesn't stop the DOMParser from moving lists into the last item
+            parent.deferred_text += value
+            return
+        self.add_text(value, self.marks)
+        self.previous_tag = ""
+        if parent is not None:
+            parent.last_item = None
+            parent.has_children = True
+
+    def flush_deferred_text(self) -> None:
+        element = self.elements[-1] if self.elements else None
+        if element is not None and element.deferred_text:
+            value, element.deferred_text = element.deferred_text, ""
+            self.add_text(value, element.marks)
+            self.previous_tag = ""
+
+    def add_text(self, value: str, marks: list[Mark]) -> None:
+        top = self.top
+        preserve_ws: WSType = (
+            "full"
+            if top.options & OPT_PRESERVE_WS_FULL
+            else (self.local_preserve_ws or bool(top.options & OPT_PRESERVE_WS))
+        )
+        if not (
+            preserve_ws == "full"
+            or top.type.inline_content
+            or _NON_WHITESPACE.search(value)
+        ):
+            return
+
+        if not preserve_ws:
+            value = _WHITESPACE.sub(" ", value)
+            if _LEADING_WHITESPACE.match(value) and self.open == len(self.nodes) - 1:
+                node_before = top.content[-1] if top.content else None
+                if (
+                    node_before is None
+                    or self.previous_tag == "br"
+                    or (
+                        node_before["type"] == "text"
+                        and _TRAILING_WHITESPACE.search(node_before["text"])
+                    )
+                ):
+                    value = value[1:]
+        elif preserve_ws == "full":
+            value = re.sub(r"\r\n?", "\n", value)
+        elif (
+            self.importer.linebreak_replacement
+            and re.search(r"[\r\n]", value)
+            and top.find_wrapping(self.importer.linebreak_replacement, None) is not None
+        ):
+            for i, line in enumerate(re.split(r"\r?\n|\r", value)):
+                if i:
+                    self.insert_leaf(
+                        self.importer.linebreak_replacement, None, marks, True
+                    )
+                if line:
+                    self.insert_text(line, marks)
+            return
+        else:
+            value = re.sub(r"\r?\n|\r", " ", value)
+
+        if value:
+            self.insert_text(value, marks)
+
+    def leaf_fallback(self, tag: str, marks: list[Mark]) -> None:
+        if tag == "br" and self.top.type.inline_content:
+            self.previous_tag = ""
+            self.add_text("\n", marks)
+
+    # Node placement
+
+    def insert_text(self, value: str, marks: list[Mark]) -> None:
+        text_type = self.schema.nodes["text"]
+        cautious = not re.search(r"\S", value)
+        inner_marks = self.find_place(text_type, None, marks, cautious)
+        if inner_marks is None:
+            return
+
+        if self.counter is not None:
+            self.counter.add("text", self.open + 1)
+        top = self.top
+        node: dict[str, Any] = {"type": "text"}
+        node_marks = self.advance(top, text_type, inner_marks)
+        if node_marks:
+            node["marks"] = [mark.to_json() for mark in node_marks]
+        node["text"] = value
+        top.content.append(node)
+
+    def insert_leaf(
+        self,
+        node_type: NodeType,
+        attrs: dict[str, Any] | None,
+        marks: list[Mark],
+        cautious: bool,
+    ) -> bool:
+        inner_marks = self.find_place(node_type, attrs, marks, cautious)
+        if inner_marks is None:
+            return False
+
+        if self.counter is not None:
+            self.counter.add(node_type.name, self.open + 1)
+        top = self.top
+        node_marks = self.advance(top, node_type, inner_marks)
+        top.content.append(node_type.create(attrs, None, node_marks).to_json())
+        return True
+
+    def advance(
+        self, top: _NodeContext, node_type: NodeType, marks: list[Mark]
+    ) -> list[Mark]:
+        """Prepare ``top`` for a node of the given type, returning the node's marks."""
+        self.close_extra()
+        if top.match is not None:
+            top.match = top.match.match_type(node_type)
+        node_marks: list[Mark] = Mark.none
+        for mark in marks:
+            if top.type.allows_mark_type(mark.type):
+                node_marks = mark.add_to_set(node_marks)
+        return node_marks
+
+    def find_place(
+        self,
+        node_type: NodeType,
+        attrs: dict[str, Any] | None,
+        marks: list[Mark],
+        cautious: bool = False,
+    ) -> list[Mark] | None:
+        route: list[NodeType] | None = None
+        sync: _NodeContext | None = None
+        penalty = 0
+        for depth in range(self.open, -1, -1):
+            cx = self.nodes[depth]
+            found = cx.find_wrapping(node_type, attrs)
+            if found is not None and (
+                route is None or len(route) > len(found) + penalty
+            ):
+                route = found
+                sync = cx
+                if not found:
+                    break
+            if cx.solid:
+                if cautious:
+                    break
+                penalty += 2
+
+        if route is None:
+            return None
+        if sync is not None:
+            self.sync(sync)
+        for wrapper in route:
+            marks = self.enter_inner(wrapper, None, marks)
+        return marks
+
+    def enter(
+        self,
+        node_type: NodeType,
+        attrs: dict[str, Any] | None,
+        marks: list[Mark],
+        preserve_ws: WSType = None,
+    ) -> list[Mark] | None:
+        if self.find_place(node_type, attrs, marks) is None:
+            return None
+        return self.enter_inner(node_type, attrs, marks, True, preserve_ws)
+
+    def enter_inner(
+        self,
+        node_type: NodeType,
+        attrs: dict[str, Any] | None,
+        marks: list[Mark],
+        solid: bool = False,
+        preserve_ws: WSType = None,
+    ) -> list[Mark]:
+        self.close_extra()
+        if self.counter is not None:
+            self.counter.add(node_type.name, self.open + 1)
+        top = self.top
+        top.match = top.match.match_type(node_type) if top.match else None
+        options = ws_options_for(node_type, preserve_ws, top.options)
+
+        apply_marks: list[Mark] = Mark.none
+        remaining_marks = []
+        for mark in marks:
+            if top.type.allows_mark_type(mark.type):
+                apply_marks = mark.add_to_set(apply_marks)
+            else:
+                remaining_marks.append(mark)
+
+        self.nodes.append(_NodeContext(node_type, attrs, apply_marks, solid, options))
+        self.open += 1
+        return remaining_marks
+
+    def close_extra(self) -> None:
+        for i in range(len(self.nodes) - 1, self.open, -1):
+            self.nodes[i - 1].content.append(self.nodes[i].finish())
+        del self.nodes[self.open + 1 :]
+
+    def sync(self, to: _NodeContext) -> bool:
+        for i in range(self.open, -1, -1):
+            if self.nodes[i] is to:
+                self.open = i
+                return True
+            if self.local_preserve_ws:
+                self.nodes[i].options |= OPT_PRESERVE_WS
+        return False
+
+    def is_inline(self, node: dict[str, Any]) -> bool:
+        return self.schema.nodes[node["type"]].is_inline
+
+
+class _Tokenizer(HTMLParser):
+    def __init__(self, state: _ParseState):
+        super().__init__(convert_charrefs=True)
+        self.state = state
+
+    def handle_starttag(self, tag, attrs):
+        # Like lxml, keep the first of duplicate attributes
+        attributes: dict[str, str] = {}
+        for name, value in attrs:
+            attributes.setdefault(name, value or "")
+        self.state.start_tag(tag, attributes)
+
+    def handle_endtag(self, tag):
+        self.state.end_tag(tag)
+
+    def handle_data(self, data):
+        self.state.text(data)
+
+    def handle_comment(self, data):
+        self.state.comment()
+
+
+_importer_cache: weakref.WeakKeyDictionary[Schema, StreamingHTMLImporter] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_importer(schema: Schema) -> StreamingHTMLImporter:
+    """Return the StreamingHTMLImporter for a schema, creating it on first use."""
+    try:
+        return _importer_cache[schema]
+    except KeyError:
+        return _importer_cache.setdefault(schema, StreamingHTMLImporter(schema))
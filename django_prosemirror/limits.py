@@ -0,0 +1,156 @@
+"""Resource limits for parsing and validating Prosemirror documents.
+
+The limits are enforced while the input is being processed, so that oversized input
+(e.g. a huge paste) is rejected as soon as a limit is exceeded instead of after the
+whole document was parsed or validated.
+"""
+
+from typing import Any, NamedTuple
+
+from django.core.exceptions import ValidationError
+
+from prosemirror import Schema
+
+# Values of the "tableRole" spec of node types that count as table cells
+_TABLE_CELL_ROLES = frozenset({"cell", "header_cell"})
+
+
+class DocumentLimits(NamedTuple):
+    """Upper bounds on the size of a document, None disables a limit.
+
+    Attributes:
+        max_input_bytes: Size of the HTML or JSON input, in bytes when UTF-8 encoded
+        max_depth: Nesting depth of nodes, with top level blocks at depth 1
+        max_nodes: Number of nodes, including text nodes
+        max_table_cells: Number of table cells and header cells in the document
+    """
+
+    max_input_bytes: int | None = None
+    max_depth: int | None = None
+    max_nodes: int | None = None
+    max_table_cells: int | None = None
+
+    @classmethod
+    def from_settings(cls) -> "DocumentLimits":
+        """Return the limits configured in the ``DJANGO_PROSEMIRROR`` setting."""
+        # Imported here, as the config module depends on the schema package
+        from django_prosemirror.config import get_setting
+
+        return cls(*(get_setting(name) for name in cls._fields))
+
+    def check_input(self, value: str | bytes) -> None:
+        """Check the size of raw HTML or JSON input.
+
+        Raises:
+            ValidationError: If the input exceeds ``max_input_bytes``
+        """
+        limit = self.max_input_bytes
+        if limit is None:
+            return
+
+        # A character takes up to four bytes, only encode when that matters
+        size = len(value)
+        if isinstance(value, str) and limit < size * 4 and size <= limit:
+            size = len(value.encode("utf-8", "surrogatepass"))
+        self.check_input_size(size)
+
+    def check_input_size(self, size: int) -> None:
+        """Check the size in bytes of raw input, e.g. of the chunks received so far.
+
+        Raises:
+            ValidationError: If the size exceeds ``max_input_bytes``
+        """
+        if self.max_input_bytes is not None and size > self.max_input_bytes:
+            raise ValidationError(
+                "Document exceeds the maximum input size of "
+                f"{self.max_input_bytes} bytes"
+            )
+
+    def counter(self, schema: Schema) -> "LimitCounter | None":
+        """Return a counter for the nodes of one document.
+
+        Returns:
+            LimitCounter | None: The counter, or None if no limit applies to nodes
+        """
+        if (
+            self.max_depth is None
+            and self.max_nodes is None
+            and self.max_table_cells is None
+        ):
+            return None
+        return LimitCounter(self, schema)
+
+    def check_doc(self, doc: dict[str, Any], schema: Schema) -> None:
+        """Check the nodes of a document dict.
+
+        The document is walked iteratively and the walk stops at the first node that
+        exceeds a limit. Malformed content is skipped, it's up to validation to
+        report it.
+
+        Raises:
+            ValidationError: If the document exceeds a limit
+        """
+        counter = self.counter(schema)
+        if counter is None:
+            return
+
+        stack: list[tuple[Any, int]] = [(doc, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            if depth:
+                node_type = node.get("type")
+                counter.add(node_type if isinstance(node_type, str) else None, depth)
+            content = node.get("content")
+            if isinstance(content, list):
+                stack.extend((child, depth + 1) for child in reversed(content))
+
+
+class LimitCounter:
+    """Count the nodes of a document as it is built or walked.
+
+    NOTE: You should not instantiate this class directly, use
+    :meth:`DocumentLimits.counter`.
+    """
+
+    __slots__ = ("cell_types", "limits", "nodes", "table_cells")
+
+    def __init__(self, limits: DocumentLimits, schema: Schema):
+        self.limits = limits
+        self.cell_types = frozenset(
+            name
+            for name, node_type in schema.nodes.items()
+            if node_type.spec.get("tableRole") in _TABLE_CELL_ROLES
+        )
+        self.nodes = 0
+        self.table_cells = 0
+
+    def add(self, node_type: str | None, depth: int) -> None:
+        """Count a node of the given type name at the given depth.
+
+        Raises:
+            ValidationError: If the node exceeds a limit
+        """
+        limits = self.limits
+        if limits.max_depth is not None and depth > limits.max_depth:
+            raise ValidationError(
+                f"Document exceeds the maximum nesting depth of {limits.max_depth}"
+            )
+
+        self.nodes += 1
+        if limits.max_nodes is not None and self.nodes > limits.max_nodes:
+            raise ValidationError(
+                f"Document exceeds the maximum of {limits.max_nodes} nodes"
+            )
+
+        if node_type in self.cell_types:
+            self.table_cells += 1
+            if (
+                limits.max_table_cells is not None
+                and self.table_cells > limits.max_table_cells
+            ):
+                raise ValidationError(
+                    "Document exceeds the maximum of "
+                    f"{limits.max_table_cells} table cells"
+                )
@@ -0,0 +1,110 @@
+"""Management command to fill companion HTML columns of ProseMirror fields."""
+
+import sys
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+
+from django_prosemirror.fields import ProsemirrorModelField
+from django_prosemirror.migration_utils import (
+    backfill_prosemirror_html,
+    iter_drifted_prosemirror_html_rows,
+)
+
+
+def get_html_fields(labels: list[str]) -> list[ProsemirrorModelField]:
+    """Resolve ``app_label.ModelName.field_name`` labels to fields with html_field.
+
+    Returns every ProsemirrorModelField with an ``html_field`` if no labels are given.
+    Proxy models and inherited fields are skipped, so each column is listed once.
+    """
+    if not labels:
+        return [
+            field
+            for model in apps.get_models()
+            if not model._meta.proxy
+            for field in model._meta.local_fields
+            if isinstance(field, ProsemirrorModelField) and field.html_field
+        ]
+
+    fields = []
+    for label in labels:
+        try:
+            app_label, model_name, field_name = label.split(".")
+            field = apps.get_model(app_label, model_name)._meta.get_field(field_name)
+        except (ValueError, LookupError, FieldDoesNotExist) as exc:
+            raise CommandError(f"Invalid field label '{label}': {exc}") from exc
+
+        if not isinstance(field, ProsemirrorModelField) or not field.html_field:
+            raise CommandError(
+                f"'{label}' is not a ProsemirrorModelField with an html_field."
+            )
+        fields.append(field)
+    return fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Render ProseMirror documents into the companion HTML columns configured "
+        "with html_field, for rows where the stored HTML is missing or out of date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "fields",
+            nargs="*",
+            metavar="app_label.ModelName.field_name",
+            help="Fields to backfill. Defaults to all fields with an html_field.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows read and updated per query (default: 500).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help=(
+                "Only report rows whose HTML is out of date, without updating them. "
+                "Exits with a non-zero status if there are any."
+            ),
+        )
+
+    def handle(self, *args, fields, batch_size, check, **options):
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        if check:
+            self.check_html_fields(get_html_fields(fields), batch_size)
+            return
+
+        for field in get_html_fields(fields):
+            updated = backfill_prosemirror_html(
+                field.model, field.name, batch_size=batch_size
+            )
+            self.stdout.write(
+                f"{field.model._meta.label}.{field.name}: "
+                f"{updated} row(s) updated in {field.html_field}"
+            )
+
+    def check_html_fields(
+        self, fields: list[ProsemirrorModelField], batch_size: int
+    ) -> None:
+        out_of_date = False
+        for field in fields:
+            drifted = sum(
+                1
+                for _ in iter_drifted_prosemirror_html_rows(
+                    field.model, field.name, chunk_size=batch_size
+                )
+            )
+            self.stdout.write(
+                f"{field.model._meta.label}.{field.name}: "
+                f"{drifted} row(s) out of date in {field.html_field}"
+            )
+            out_of_date = out_of_date or bool(drifted)
+
+        if out_of_date:
+            sys.exit(1)
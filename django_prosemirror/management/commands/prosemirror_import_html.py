@@ -0,0 +1,136 @@
+"""Management command to convert legacy HTML into ProseMirror fields."""
+
+import json
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+
+from django_prosemirror.fields import ProsemirrorModelField
+from django_prosemirror.migration_utils import (
+    import_prosemirror_html,
+    iter_html_column_rows,
+    iter_jsonl_html_rows,
+)
+
+# Number of failures listed in the command output, see --errors-file for all
+MAX_REPORTED_FAILURES = 10
+
+
+def get_prosemirror_field(label: str) -> ProsemirrorModelField:
+    """Resolve an ``app_label.ModelName.field_name`` label to its field."""
+    try:
+        app_label, model_name, field_name = label.split(".")
+        field = apps.get_model(app_label, model_name)._meta.get_field(field_name)
+    except (ValueError, LookupError, FieldDoesNotExist) as exc:
+        raise CommandError(f"Invalid field label '{label}': {exc}") from exc
+
+    if not isinstance(field, ProsemirrorModelField):
+        raise CommandError(f"'{label}' is not a ProsemirrorModelField.")
+    return field
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert HTML to ProseMirror documents and store them in a ProsemirrorModel"
+        "Field. The HTML is read from another column of the same model or from a "
+        'JSON Lines file with {"pk": ..., "html": ...} objects.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "field",
+            metavar="app_label.ModelName.field_name",
+            help="Field to store the converted documents in.",
+        )
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument(
+            "--from-column",
+            metavar="FIELD",
+            help="Field of the same model holding the HTML.",
+        )
+        source.add_argument(
+            "--jsonl",
+            metavar="PATH",
+            help='JSON Lines file with {"pk": ..., "html": ...} objects.',
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows converted per task and updated per query "
+            "(default: 500).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes (default: number of CPUs).",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=["dom", "stream"],
+            default="dom",
+            help="html_to_doc engine to convert with (default: dom).",
+        )
+        parser.add_argument(
+            "--errors-file",
+            metavar="PATH",
+            help="Write the rows that failed to convert to this JSON Lines file.",
+        )
+
+    def handle(
+        self,
+        *args,
+        field,
+        from_column,
+        jsonl,
+        batch_size,
+        workers,
+        engine,
+        errors_file,
+        **options,
+    ):
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        if workers is not None and workers < 1:
+            raise CommandError("--workers must be a positive integer.")
+
+        prosemirror_field = get_prosemirror_field(field)
+        model = prosemirror_field.model
+        if from_column:
+            try:
+                model._meta.get_field(from_column)
+            except FieldDoesNotExist as exc:
+                raise CommandError(str(exc)) from exc
+            rows = iter_html_column_rows(model, from_column, chunk_size=batch_size)
+        else:
+            rows = iter_jsonl_html_rows(jsonl)
+
+        try:
+            result = import_prosemirror_html(
+                model,
+                prosemirror_field.name,
+                rows,
+                batch_size=batch_size,
+                workers=workers,
+                engine=engine,
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            f"{field}: {result.imported} row(s) imported, {len(result.failures)} failed"
+        )
+        for failure in result.failures[:MAX_REPORTED_FAILURES]:
+            self.stderr.write(f"pk={failure.pk}: {failure.error}")
+        if len(result.failures) > MAX_REPORTED_FAILURES:
+            self.stderr.write(
+                f"... and {len(result.failures) - MAX_REPORTED_FAILURES} more"
+            )
+
+        if errors_file:
+            with open(errors_file, "w", encoding="utf-8") as file:
+                for failure in result.failures:
+                    row = {"pk": failure.pk, "error": failure.error}
+                    file.write(json.dumps(row, default=str) + "\n")
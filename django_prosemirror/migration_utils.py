@@ -1,7 +1,12 @@
 """Utilities for working with ProseMirror fields in data migrations."""
 
-from collections.abc import Iterator
-from dataclasses import dataclass
+import json
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
 from typing import Any
 
 from django.core.exceptions import ValidationError
@@ -9,9 +14,10 @@ from django.db import models
 
 from prosemirror import Schema
 
+from django_prosemirror.config import ProsemirrorConfig
 from django_prosemirror.constants import get_empty_doc
-from django_prosemirror.schema import ProsemirrorDocumentDict, validate_doc
-from django_prosemirror.serde import html_to_doc
+from django_prosemirror.schema import ProsemirrorDocumentDict, get_validator
+from django_prosemirror.serde import ParseEngine, doc_to_html, html_to_doc
 
 
 @dataclass
@@ -23,6 +29,29 @@ class RepairRecord:
     repaired: ProsemirrorDocumentDict | None
 
 
+@dataclass
+class HTMLImportFailure:
+    """A row that :func:`import_prosemirror_html` could not convert or store."""
+
+    pk: Any
+    error: str
+
+
+@dataclass
+class HTMLImportResult:
+    """Outcome of :func:`import_prosemirror_html`."""
+
+    imported: int = 0
+    failures: list[HTMLImportFailure] = field(default_factory=list)
+
+
+def _batched(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Split an iterable into lists of ``size`` items (itertools.batched, 3.12+)."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
 def iter_corrupt_prosemirror_rows(
     model: type[models.Model],
     field_name: str,
@@ -40,13 +69,14 @@ def iter_corrupt_prosemirror_rows(
     Yields:
         tuple: ``(pk, raw_value)`` for each corrupt row.
     """
+    field = model._meta.get_field(field_name)
     # .values() bypasses the descriptor, so corrupt rows don't raise on read
     for row in model.objects.values("pk", field_name):
-        match row[field_name]:
+        match value := field.to_python(row[field_name]):
             case {"type": "doc", "content": [*_]} | None:
                 pass
             case _:
-                yield row["pk"], row[field_name]
+                yield row["pk"], value
 
 
 def iter_schema_invalid_prosemirror_rows(
@@ -68,16 +98,16 @@ def iter_schema_invalid_prosemirror_rows(
     Yields:
         tuple: ``(pk, raw_value)`` for each schema-invalid row.
     """
+    field = model._meta.get_field(field_name)
     if schema is None:
-        schema = model._meta.get_field(field_name).config.schema
+        schema = field.config.schema
+    validator = get_validator(schema)
 
     # .values() bypasses the descriptor, so corrupt rows don't raise on read
     for row in model.objects.values("pk", field_name):
-        match row[field_name]:
+        match field.to_python(row[field_name]):
             case {"type": "doc", "content": [*_]} as value:
-                try:
-                    validate_doc(value, schema=schema)
-                except ValidationError:
+                if validator.first_error(value) is not None:
                     yield row["pk"], value
 
 
@@ -184,3 +214,334 @@ def clear_corrupt_prosemirror_rows(
     ]
 
     return records
+
+
+def iter_drifted_prosemirror_html_rows(
+    model: type[models.Model],
+    field_name: str,
+    *,
+    chunk_size: int = 500,
+) -> Iterator[tuple[Any, str]]:
+    """Yield (pk, html) for rows whose companion HTML column is out of date.
+
+    Only applies to fields configured with ``html_field``. Rows with a corrupt
+    document are skipped, see :func:`iter_corrupt_prosemirror_rows` for those.
+
+    Args:
+        model: Django model class (real or historical from ``apps.get_model()``).
+        field_name: Name of the ProsemirrorModelField to inspect.
+        chunk_size: Number of rows fetched from the database at a time.
+
+    Yields:
+        tuple: ``(pk, html)`` with the freshly rendered HTML for each drifted row.
+
+    Raises:
+        ValueError: If the field has no ``html_field``.
+    """
+    field = model._meta.get_field(field_name)
+    html_field = getattr(field, "html_field", None)
+    if not html_field:
+        raise ValueError(
+            f"Field '{field_name}' on {model.__name__} has no html_field configured."
+        )
+    schema = field.config.schema
+
+    # .values_list() bypasses the descriptor, so corrupt rows don't raise on read
+    rows = (
+        model.objects.order_by("pk")
+        .values_list("pk", field_name, html_field)
+        .iterator(chunk_size=chunk_size)
+    )
+    for pk, value, stored_html in rows:
+        try:
+            html = doc_to_html(field.to_python(value), schema=schema)
+        except (ValueError, KeyError):
+            continue
+        if (stored_html or "") != html:
+            yield pk, html
+
+
+def backfill_prosemirror_html(
+    model: type[models.Model],
+    field_name: str,
+    *,
+    batch_size: int = 500,
+) -> int:
+    """Bring the companion HTML column of a ProseMirror field up to date.
+
+    Rows are rendered and written back in batches of ``batch_size``. Rows whose
+    HTML is already current are not written.
+
+    Args:
+        model: Django model class (real or historical from ``apps.get_model()``).
+        field_name: Name of the ProsemirrorModelField with an ``html_field``.
+        batch_size: Number of rows read and updated per query.
+
+    Returns:
+        int: Number of rows updated.
+
+    Raises:
+        ValueError: If the field has no ``html_field``.
+    """
+    html_field = model._meta.get_field(field_name).html_field
+    drifted = iter_drifted_prosemirror_html_rows(
+        model, field_name, chunk_size=batch_size
+    )
+
+    updated = 0
+    for batch in _batched(drifted, batch_size):
+        # .bulk_update() bypasses the descriptor and the pre_save signal
+        objs = [model(pk=pk, **{html_field: html}) for pk, html in batch]
+        model.objects.bulk_update(objs, [html_field])
+        updated += len(objs)
+
+    return updated
+
+
+def copy_prosemirror_documents(
+    model: type[models.Model],
+    source_field: str,
+    target_field: str,
+    *,
+    batch_size: int = 500,
+) -> int:
+    """Copy the documents of one field of a model to another, in batches.
+
+    Converts an existing column to another storage, e.g. a ProsemirrorModelField
+    (or plain JSONField) to a ProsemirrorBinaryField added next to it::
+
+        def migrate(apps, schema_editor):
+            Post = apps.get_model("blog", "Post")
+            copy_prosemirror_documents(Post, "body", "body_binary")
+
+    Rows are read in order of primary key and written with ``bulk_update``, so
+    memory use is bounded by the batch size. Values are copied as they are, the
+    documents are not validated.
+
+    Args:
+        model: Django model class (real or historical from ``apps.get_model()``).
+        source_field: Name of the field to copy the documents from.
+        target_field: Name of the ProsemirrorModelField or ProsemirrorBinaryField
+            to copy the documents to.
+        batch_size: Number of rows read and updated per query.
+
+    Returns:
+        int: Number of rows copied.
+    """
+    source = model._meta.get_field(source_field)
+    rows = (
+        model.objects.order_by("pk")
+        .values_list("pk", source_field)
+        .iterator(chunk_size=batch_size)
+    )
+
+    copied = 0
+    for batch in _batched(rows, batch_size):
+        # .bulk_update() bypasses the pre_save signal
+        objs = [
+            model(pk=pk, **{target_field: source.to_python(value)})
+            for pk, value in batch
+        ]
+        model.objects.bulk_update(objs, [target_field])
+        copied += len(objs)
+
+    return copied
+
+
+def iter_html_column_rows(
+    source: type[models.Model] | models.QuerySet,
+    column: str,
+    *,
+    chunk_size: int = 500,
+) -> Iterator[tuple[Any, str]]:
+    """Yield (pk, html) from a column holding HTML, for :func:`import_prosemirror_html`.
+
+    Args:
+        source: Django model class or queryset to read the rows from.
+        column: Name of the field holding the HTML.
+        chunk_size: Number of rows fetched from the database at a time.
+
+    Yields:
+        tuple: ``(pk, html)`` for each row.
+    """
+    queryset = source.objects.order_by("pk") if isinstance(source, type) else source
+    yield from queryset.values_list("pk", column).iterator(chunk_size=chunk_size)
+
+
+def iter_jsonl_html_rows(path: str | os.PathLike) -> Iterator[tuple[Any, str]]:
+    """Yield (pk, html) from a JSON Lines file, for :func:`import_prosemirror_html`.
+
+    Every non-blank line must be an object with a ``pk`` and an ``html`` key, e.g.
+    ``{"pk": 1, "html": "<p>Hello</p>"}``.
+
+    Args:
+        path: Path of the JSON Lines file.
+
+    Yields:
+        tuple: ``(pk, html)`` for each line.
+
+    Raises:
+        ValueError: If a line is not an object with ``pk`` and ``html``.
+    """
+    with Path(path).open(encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                yield row["pk"], row["html"]
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(
+                    f"{path}, line {line_number}: expected an object with 'pk' and "
+                    f"'html' keys ({exc})"
+                ) from exc
+
+
+# (pk, document, rendered HTML if the field has an html_field)
+_ConvertedRow = tuple[Any, ProsemirrorDocumentDict, str | None]
+
+
+def _convert_html_rows(
+    rows: list[tuple[Any, str]],
+    schema: Schema,
+    engine: ParseEngine,
+    render_html: bool,
+) -> tuple[list[_ConvertedRow], list[HTMLImportFailure]]:
+    converted = []
+    failures = []
+    for pk, html in rows:
+        try:
+            doc = html_to_doc(html, schema=schema, engine=engine)
+            rendered = doc_to_html(doc, schema=schema) if render_html else None
+        except Exception as exc:  # noqa: BLE001
+            # Arbitrary stored HTML can make lxml, prosemirror or a getAttrs of the
+            # schema fail with about any exception type. Any failure is recorded for
+            # the row, without aborting the import.
+            failures.append(HTMLImportFailure(pk, f"{type(exc).__name__}: {exc}"))
+        else:
+            converted.append((pk, doc, rendered))
+    return converted, failures
+
+
+# Conversion settings of a worker process, see _init_import_worker
+_worker_options: tuple[Schema, ParseEngine, bool] | None = None
+
+
+def _init_import_worker(
+    config: ProsemirrorConfig, engine: ParseEngine, render_html: bool
+) -> None:
+    global _worker_options
+    # The schema can't be pickled, so each worker builds it once from the config
+    _worker_options = (config.schema, engine, render_html)
+
+
+def _convert_html_rows_in_worker(
+    rows: list[tuple[Any, str]],
+) -> tuple[list[_ConvertedRow], list[HTMLImportFailure]]:
+    assert _worker_options is not None
+    return _convert_html_rows(rows, *_worker_options)
+
+
+def import_prosemirror_html(
+    model: type[models.Model],
+    field_name: str,
+    rows: Iterable[tuple[Any, str]],
+    *,
+    batch_size: int = 500,
+    workers: int | None = None,
+    engine: ParseEngine = "dom",
+) -> HTMLImportResult:
+    """Convert (pk, html) rows to documents and store them in a ProseMirror field.
+
+    Rows are converted with :func:`~django_prosemirror.serde.html_to_doc` in batches
+    of ``batch_size``, spread over a pool of ``workers`` processes, and written back
+    with ``bulk_update()``. If the field has an ``html_field``, it is updated along
+    with it. Rows that fail to convert or have no row with their pk are collected
+    instead of aborting the import. Only a few batches per worker are in flight at a
+    time, so ``rows`` can be a lazy iterator over a large table or file, see
+    :func:`iter_html_column_rows` and :func:`iter_jsonl_html_rows`::
+
+        rows = iter_html_column_rows(Page, "legacy_body")
+        result = import_prosemirror_html(Page, "body", rows, workers=8)
+        for failure in result.failures:
+            print(f"pk={failure.pk}: {failure.error}")
+
+    Args:
+        model: Django model class (real or historical from ``apps.get_model()``).
+        field_name: Name of the ProsemirrorModelField to fill.
+        rows: ``(pk, html)`` pairs to convert.
+        batch_size: Number of rows converted per task and updated per query.
+        workers: Number of worker processes, defaults to the number of CPUs. With
+            1, rows are converted in the current process.
+        engine: ``html_to_doc`` engine to convert with.
+
+    Returns:
+        HTMLImportResult: Number of rows imported and the rows that failed.
+
+    Raises:
+        ValueError: If batch_size or workers is not positive.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+
+    prosemirror_field = model._meta.get_field(field_name)
+    html_field = getattr(prosemirror_field, "html_field", None)
+    fields = [field_name, html_field] if html_field else [field_name]
+    result = HTMLImportResult()
+
+    def store(
+        converted: list[_ConvertedRow], failures: list[HTMLImportFailure]
+    ) -> None:
+        result.failures.extend(failures)
+        # .bulk_update() silently skips pks without a row, so they are looked up
+        pks = {}
+        for pk, _, _ in converted:
+            try:
+                pks[pk] = model._meta.pk.to_python(pk)
+            except ValidationError as exc:
+                result.failures.append(HTMLImportFailure(pk, f"Invalid pk: {exc}"))
+        existing = set(
+            model.objects.filter(pk__in=pks.values()).values_list("pk", flat=True)
+        )
+
+        # .bulk_update() bypasses the pre_save signal, so html_field is set here
+        objs = []
+        for pk, doc, html in converted:
+            if pk not in pks:
+                continue
+            if pks[pk] not in existing:
+                result.failures.append(HTMLImportFailure(pk, "No row with this pk"))
+                continue
+            obj = model(pk=pk, **{field_name: doc})
+            if html_field:
+                setattr(obj, html_field, html)
+            objs.append(obj)
+        if objs:
+            result.imported += model.objects.bulk_update(objs, fields)
+
+    batches = _batched(rows, batch_size)
+    options = (prosemirror_field.config, engine, bool(html_field))
+    if workers == 1:
+        schema = prosemirror_field.config.schema
+        for batch in batches:
+            store(*_convert_html_rows(batch, schema, engine, bool(html_field)))
+        return result
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_import_worker, initargs=options
+    ) as pool:
+        pending: set[Future] = set()
+        for batch in batches:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    store(*future.result())
+            pending.add(pool.submit(_convert_html_rows_in_worker, batch))
+        for future in pending:
+            store(*future.result())
+
+    return result
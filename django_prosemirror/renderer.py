@@ -0,0 +1,394 @@
+"""Direct rendering of Prosemirror document dicts to HTML.
+
+The renderer in this module walks the stored document dict and writes the HTML
+straight into a buffer. Unlike the DOMSerializer-based path, it doesn't build a
+Prosemirror ``Node`` tree or an intermediate DOM, while producing the exact same
+output.
+"""
+
+import html
+import weakref
+from collections.abc import Hashable, Iterator
+from typing import Any, NamedTuple
+
+from prosemirror import Schema
+from prosemirror.model import DOMSerializer, Fragment, Mark, Node
+from prosemirror.model.schema import MarkType, NodeType
+from prosemirror.model.to_dom import Element
+
+from django_prosemirror.schema import ProsemirrorDocumentDict
+from django_prosemirror.text import Budget
+
+# Upper bound on the number of attr-specific templates kept per renderer, so that
+# e.g. links with unique hrefs cannot grow the cache without limit
+_MAX_TEMPLATES = 1024
+
+
+class Template(NamedTuple):
+    """Precompiled HTML for a node or mark type with a given set of attrs."""
+
+    open: str
+    # None for specs without a content hole, in which case content is not rendered
+    close: str | None
+
+
+_ResolvedMark = tuple[MarkType, dict[str, Any]]
+
+# check_attrs() and the attrs argument of render_spec() were added in prosemirror
+# 0.6, before that neither Node.from_json() nor the DOMSerializer checked attrs
+_CHECK_ATTRS = hasattr(NodeType, "check_attrs")
+
+
+class HTMLRenderer:
+    """Render Prosemirror document dicts to HTML without building a Node tree.
+
+    Templates are derived from the ``toDOM`` functions in the schema, i.e. from the
+    ``to_dom`` methods of the ``NodeDefinition`` and ``MarkDefinition`` classes. The
+    template for a type that has no attributes is compiled once, templates for types
+    with attributes are compiled once per distinct set of attribute values.
+
+    NOTE: You should not instantiate this class directly, use :func:`get_renderer`.
+    """
+
+    schema: Schema
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self._templates: dict[Hashable, Template] = {}
+        self._text_type = schema.nodes["text"]
+        self._text_to_dom = self._text_type.spec.get("toDOM")
+
+    def render(self, value: ProsemirrorDocumentDict) -> str:
+        """Render the content of a document dict to an HTML string.
+
+        Raises:
+            ValueError, KeyError: If the document does not fit the schema
+        """
+        out: list[str] = []
+        self.render_node_content(value, out)
+        return "".join(out)
+
+    def render_node_content(self, value: dict[str, Any], out: list[str]) -> None:
+        """Render the children of a (top level) node into ``out``."""
+        self._check_node(value)
+        self.render_fragment(self._get_content(value), out)
+
+    def render_blocks(
+        self, value: ProsemirrorDocumentDict, start: int, stop: int | None
+    ) -> str:
+        """Render the top level blocks ``[start:stop]`` of a document dict.
+
+        Blocks outside the range are not visited.
+
+        Raises:
+            ValueError, KeyError: If the rendered blocks do not fit the schema
+        """
+        self._check_node(value)
+        out: list[str] = []
+        self.render_fragment(self._get_content(value)[start:stop], out)
+        return "".join(out)
+
+    def iter_render(self, value: ProsemirrorDocumentDict) -> Iterator[str]:
+        """Render the content of a document dict, one top level block at a time.
+
+        The document is validated while it is rendered, so invalid content raises
+        only once the iteration reaches it.
+
+        Raises:
+            ValueError, KeyError: If the document does not fit the schema
+        """
+        self._check_node(value)
+        active: list[tuple[_ResolvedMark, str]] = []
+        for child in self._get_content(value):
+            out: list[str] = []
+            self._render_child(child, active, out)
+            yield "".join(out)
+
+        if active:
+            yield "".join(close for _, close in reversed(active))
+
+    def render_fragment(self, content: list[Any], out: list[str]) -> None:
+        """Render a list of sibling nodes into ``out``."""
+        active: list[tuple[_ResolvedMark, str]] = []
+        for child in content:
+            self._render_child(child, active, out)
+
+        while active:
+            out.append(active.pop()[1])
+
+    def _render_child(
+        self,
+        child: Any,
+        active: list[tuple[_ResolvedMark, str]],
+        out: list[str],
+    ) -> None:
+        """Render a node of a fragment along with the marks it opens or closes."""
+        self._open_marks(child, active, out)
+        self.render_node(child, out)
+
+    def _open_marks(
+        self,
+        child: Any,
+        active: list[tuple[_ResolvedMark, str]],
+        out: list[str],
+    ) -> None:
+        """Close and open the marks around a node of a fragment.
+
+        Marks are opened and closed following the same rules as the DOMSerializer:
+        marks shared with the previous sibling (in ``active``) are kept open.
+        """
+        if not isinstance(child, dict) or not child:
+            raise ValueError("Invalid input for Node.from_json")
+
+        marks = self._resolve_marks(child)
+        keep = 0
+        while keep < len(active) and keep < len(marks):
+            mark_type, attrs = marks[keep]
+            active_type, active_attrs = active[keep][0]
+            if (
+                mark_type is not active_type
+                or attrs != active_attrs
+                or mark_type.spec.get("spanning") is False
+            ):
+                break
+            keep += 1
+        while len(active) > keep:
+            out.append(active.pop()[1])
+
+        if marks:
+            inline = (
+                child["type"] == "text"
+                or self.schema.node_type(str(child["type"])).is_inline
+            )
+            for mark in marks[keep:]:
+                template = self._mark_template(mark, inline)
+                out.append(template.open)
+                active.append((mark, template.close or ""))
+
+    def render_node(self, node: dict[str, Any], out: list[str]) -> None:
+        """Render a single node (without its marks) into ``out``."""
+        if node["type"] == "text":
+            text = str(node["text"])
+            if not text:
+                raise ValueError("Empty text nodes are not allowed")
+            if self._text_to_dom is None:
+                out.append(html.escape(text))
+            else:
+                text_node = self.schema.text(text)
+                out.append(self._compile(self._text_to_dom(text_node), {}).open)
+            return
+
+        node_type = self.schema.node_type(str(node["type"]))
+        attrs = self._resolve_attrs(node_type, node.get("attrs"))
+        content = self._get_content(node)
+        template = self._node_template(node_type, attrs)
+        out.append(template.open)
+        if template.close is not None:
+            if node_type.is_leaf:
+                raise ValueError("Content hole not allowed in a leaf node spec")
+            self.render_fragment(content, out)
+            out.append(template.close)
+
+    def render_excerpt(self, value: ProsemirrorDocumentDict, max_chars: int) -> str:
+        """Render the start of a document, up to ``max_chars`` characters of text.
+
+        Rendering stops once the budget is used up: all open nodes and marks are
+        closed and the rest of the document is not visited, so the cost depends on
+        the size of the excerpt rather than the size of the document.
+
+        Raises:
+            ValueError, KeyError: If the rendered part does not fit the schema
+        """
+        budget = Budget(max_chars)
+        self._check_node(value)
+        out: list[str] = []
+        self._render_excerpt_fragment(self._get_content(value), out, budget)
+        return "".join(out)
+
+    def _render_excerpt_fragment(
+        self, content: list[Any], out: list[str], budget: Budget
+    ) -> None:
+        active: list[tuple[_ResolvedMark, str]] = []
+        for child in content:
+            if budget.exhausted:
+                break
+            self._open_marks(child, active, out)
+            self._render_excerpt_node(child, out, budget)
+
+        while active:
+            out.append(active.pop()[1])
+
+    def _render_excerpt_node(
+        self, node: dict[str, Any], out: list[str], budget: Budget
+    ) -> None:
+        if node["type"] == "text":
+            text = str(node["text"])
+            if not text:
+                raise ValueError("Empty text nodes are not allowed")
+            text = budget.take(text)
+            if text:
+                self.render_node({**node, "text": text}, out)
+            return
+
+        node_type = self.schema.node_type(str(node["type"]))
+        attrs = self._resolve_attrs(node_type, node.get("attrs"))
+        content = self._get_content(node)
+        template = self._node_template(node_type, attrs)
+        out.append(template.open)
+        if template.close is not None:
+            if node_type.is_leaf:
+                raise ValueError("Content hole not allowed in a leaf node spec")
+            self._render_excerpt_fragment(content, out, budget)
+            out.append(template.close)
+
+    def _check_node(self, node: dict[str, Any]) -> None:
+        """Validate a node's type, attrs and marks without rendering it."""
+        if not isinstance(node, dict) or not node:
+            raise ValueError("Invalid input for Node.from_json")
+        self._resolve_marks(node)
+        if node["type"] != "text":
+            node_type = self.schema.node_type(str(node["type"]))
+            self._resolve_attrs(node_type, node.get("attrs"))
+
+    @staticmethod
+    def _get_content(node: dict[str, Any]) -> list[Any]:
+        content = node.get("content")
+        if not content:
+            return []
+        # The same error as Node.from_json(), so both engines fail alike
+        if not isinstance(content, list):
+            raise ValueError("Invalid input for Fragment.from_json")  # noqa: TRY004
+        return content
+
+    @staticmethod
+    def _resolve_attrs(node_type: NodeType, attrs: Any) -> dict[str, Any]:
+        computed = node_type.compute_attrs(attrs)
+        if _CHECK_ATTRS:
+            node_type.check_attrs(computed)
+        return computed
+
+    def _resolve_marks(self, node: dict[str, Any]) -> list[_ResolvedMark]:
+        """Return the marks of a node with computed attrs, ordered by rank."""
+        marks = node.get("marks")
+        if not marks:
+            return []
+        # The same error as Node.from_json(), so both engines fail alike
+        if not isinstance(marks, list):
+            raise ValueError("Invalid mark data for Node.fromJSON")  # noqa: TRY004
+
+        resolved = []
+        for mark in marks:
+            if not mark:
+                raise ValueError("Invalid input for Mark.fromJSON")
+            mark_type = self.schema.marks.get(mark["type"])
+            if not mark_type:
+                raise ValueError(f"There is no mark type {mark['type']} in this schema")
+            attrs = mark_type.create(mark.get("attrs")).attrs
+            if _CHECK_ATTRS:
+                mark_type.check_attrs(attrs)
+            if mark_type.spec.get("toDOM"):
+                resolved.append((mark_type, attrs))
+
+        if len(resolved) > 1:
+            resolved.sort(key=lambda item: item[0].rank)
+        return resolved
+
+    def _node_template(self, node_type: NodeType, attrs: dict[str, Any]) -> Template:
+        key = self._template_key(node_type.name, attrs)
+        template = self._templates.get(key) if key is not None else None
+        if template is None:
+            node = Node(node_type, attrs, Fragment.empty, Mark.none)
+            template = self._compile(node_type.spec["toDOM"](node), attrs)
+            self._store_template(key, template)
+        return template
+
+    def _mark_template(self, mark: _ResolvedMark, inline: bool) -> Template:
+        mark_type, attrs = mark
+        key = self._template_key((mark_type.name, inline), attrs)
+        template = self._templates.get(key) if key is not None else None
+        if template is None:
+            spec = mark_type.spec["toDOM"](Mark(mark_type, attrs), inline)
+            template = self._compile(spec, attrs, content_in_dom=True)
+            self._store_template(key, template)
+        return template
+
+    @staticmethod
+    def _template_key(name: Hashable, attrs: dict[str, Any]) -> Hashable | None:
+        if not attrs:
+            return name
+        # True, 1 and 1.0 are equal but render differently, so the types are part
+        # of the key
+        key = (name, tuple([(k, type(v), v) for k, v in attrs.items()]))
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable attr values (e.g. colwidth lists) are rendered uncached
+            return None
+        return key
+
+    def _store_template(self, key: Hashable | None, template: Template) -> None:
+        if key is not None and len(self._templates) < _MAX_TEMPLATES:
+            self._templates[key] = template
+
+    @staticmethod
+    def _compile(
+        spec: Any, attrs: dict[str, Any], *, content_in_dom: bool = False
+    ) -> Template:
+        """Split the rendered DOM spec into the HTML before and after its content.
+
+        Args:
+            spec: Output of a ``toDOM`` function
+            attrs: Attrs of the node or mark, used for the XSS check of render_spec
+            content_in_dom: Place content in the outer element if the spec has no
+                content hole (this is how marks are serialized)
+        """
+        if _CHECK_ATTRS:
+            dom, content_dom = DOMSerializer.render_spec(spec, None, attrs)
+        else:
+            dom, content_dom = DOMSerializer.render_spec(spec)
+        container = content_dom or (dom if content_in_dom else None)
+        if container is None or isinstance(dom, str):
+            return Template(str(dom), None)
+
+        split = _split_at_content(dom, container)
+        if split is None:
+            raise ValueError("The content hole is not part of the rendered DOM spec")
+        return Template(*split)
+
+
+def _split_at_content(element: Element, container: Element) -> tuple[str, str] | None:
+    """Return the HTML of an element before and after the content of a descendant.
+
+    Content is appended to the children of ``container``. The HTML is split
+    structurally rather than at a marker, which could also occur in attribute
+    values. Returns None if ``container`` is not ``element`` or one of its
+    descendants.
+    """
+    close = f"</{element.name}>"
+    open_tag = str(Element(element.name, element.attrs, []))[: -len(close)]
+    if element is container:
+        return open_tag + "".join(map(str, element.children)), close
+
+    for index, child in enumerate(element.children):
+        if not isinstance(child, Element):
+            continue
+        split = _split_at_content(child, container)
+        if split is not None:
+            return (
+                open_tag + "".join(map(str, element.children[:index])) + split[0],
+                split[1] + "".join(map(str, element.children[index + 1 :])) + close,
+            )
+    return None
+
+
+_renderer_cache: weakref.WeakKeyDictionary[Schema, HTMLRenderer] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_renderer(schema: Schema) -> HTMLRenderer:
+    """Return the HTMLRenderer for a schema, creating it on first use."""
+    try:
+        return _renderer_cache[schema]
+    except KeyError:
+        return _renderer_cache.setdefault(schema, HTMLRenderer(schema))
@@ -2,7 +2,9 @@
 
 from django.core.exceptions import ValidationError
 
-from prosemirror.model import Node, Schema
+from prosemirror.model import Schema
+
+from django_prosemirror.limits import DocumentLimits
 
 from .base import ClassMapping, MarkDefinition, NodeDefinition
 from .marks import (
@@ -30,18 +32,41 @@ from .nodes import (
     TableRowNode,
 )
 from .types import MarkType, NodeType, ProsemirrorDocument, ProsemirrorDocumentDict
+from .validator import DocumentValidator, ValidationFailure, get_validator
 
 
-def validate_doc(doc: ProsemirrorDocument, *, schema: Schema):
+def validate_doc(
+    doc: ProsemirrorDocument,
+    *,
+    schema: Schema,
+    limits: DocumentLimits | None = None,
+    json_digest: str | None = None,
+    initial: ProsemirrorDocument | None = None,
+):
     """Validate that a value is a valid Prosemirror document according to the schema.
 
     Args:
         doc: The document to validate (should be a dict)
         schema: The Prosemirror schema to validate against
+        limits: Limits on the nesting depth, node count and table cells, counted
+            while the document is validated
+        json_digest: Hash of the JSON of the document (see ``json_digest`` in
+            ``django_prosemirror.cache``). If given, documents that passed before
+            are not validated again.
+        initial: An earlier version of the document that is known to be valid,
+            e.g. the stored version of an edited document. Only the top level
+            blocks that changed since are validated, unless there are limits on
+            the node count, depth or table cells.
 
     Raises:
-        ValidationError: If the document is invalid
+        ValidationError: If the document is invalid or exceeds one of the limits.
+            For documents that don't match the schema, the ``path`` and ``reason``
+            params hold the JSON path of the first problem and its description.
     """
+    # Imported here, as the cache module depends on the config module, which
+    # depends on this package
+    from django_prosemirror.cache import validation_cache
+
     # Do some quick sanity checks
     if not isinstance(doc, dict):
         raise ValidationError("Prosemirror document must be a dict") from None
@@ -52,11 +77,29 @@ def validate_doc(doc: ProsemirrorDocument, *, schema: Schema):
     if "type" not in doc:
         raise ValidationError("Prosemirror document must have a 'type' field") from None
 
-    # Let prosemirror handle schema-specific validation
-    try:
-        Node.from_json(schema, doc)
-    except (ValueError, KeyError) as exc:
-        raise ValidationError(f"Invalid prosemirror document: {exc}") from exc
+    # Serializing a dict to hash it costs about as much as validating it, so the
+    # cache is only used by callers that can hash the document cheaply
+    key = (
+        validation_cache.key(json_digest, schema, limits)
+        if json_digest is not None
+        else None
+    )
+    if key is not None and validation_cache.contains(key):
+        return
+
+    counter = limits.counter(schema) if limits is not None else None
+    failure = get_validator(schema).first_error(doc, counter, initial=initial)
+    if failure is not None:
+        raise ValidationError(
+            "Invalid prosemirror document at %(path)s: %(reason)s",
+            code="invalid",
+            params={"path": failure.path, "reason": failure.message},
+        )
+
+    # Only cache documents that were validated completely, as the validity of the
+    # unchanged blocks of the initial document is not known to the cache
+    if key is not None and (initial is None or counter is not None):
+        validation_cache.add(key)
 
 
 # Export everything needed by the rest of the application
@@ -92,6 +135,9 @@ __all__ = [
     "LinkMark",
     "UnderlineMark",
     "StrikethroughMark",
-    # Functions
+    # Validation
+    "DocumentValidator",
+    "ValidationFailure",
+    "get_validator",
     "validate_doc",
 ]
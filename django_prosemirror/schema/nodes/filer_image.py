@@ -64,6 +64,8 @@ class FilerImageNode(NodeDefinition):
             },
             "group": "inline",
             "draggable": True,
+            # Attributes with their default value are left out of parsed documents
+            "stripDefaultAttrs": True,
             "parseDOM": self.dom_matcher(),
             "toDOM": self.to_dom,
         }
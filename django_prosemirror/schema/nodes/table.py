@@ -27,6 +27,7 @@ class TableNode(NodeDefinition):
             "content": "table_row+",
             "isolating": True,
             "group": "block",
+            "tableRole": "table",
             "parseDOM": self.dom_matcher(),
             "toDOM": self.to_dom,
         }
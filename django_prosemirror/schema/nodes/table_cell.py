@@ -94,6 +94,7 @@ class TableCellNode(NodeDefinition):
                 "colwidth": {"default": None},
             },
             "isolating": True,
+            "tableRole": "cell",
             "parseDOM": self.dom_matcher(),
             "toDOM": self.to_dom,
         }
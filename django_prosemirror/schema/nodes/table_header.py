@@ -94,6 +94,7 @@ class TableHeaderNode(NodeDefinition):
                 "colwidth": {"default": None},
             },
             "isolating": True,
+            "tableRole": "header_cell",
             "parseDOM": self.dom_matcher(),
             "toDOM": self.to_dom,
         }
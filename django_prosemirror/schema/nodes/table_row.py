@@ -25,6 +25,7 @@ class TableRowNode(NodeDefinition):
     def spec(self) -> NodeSpec:
         return {
             "content": "(table_cell | table_header)*",
+            "tableRole": "row",
             "parseDOM": self.dom_matcher(),
             "toDOM": self.to_dom,
         }
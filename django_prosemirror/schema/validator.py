@@ -0,0 +1,355 @@
+"""Validation of Prosemirror document dicts against a compiled schema.
+
+Validating with ``Node.from_json`` builds a complete tree of immutable ``Node``
+objects only to throw it away. The validator in this module compiles the schema into
+plain lookup tables once (a transition table for the content expression of each node
+type, the attributes and marks each type accepts) and checks the document dict
+directly, stopping at the first problem.
+"""
+
+import weakref
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from prosemirror import Schema
+from prosemirror.model import ContentMatch
+from prosemirror.model.schema import Attribute
+
+from django_prosemirror.limits import LimitCounter
+
+# (path of the parent node, index in its content), None for the top node
+_Path = tuple[Any, int] | None
+
+
+class ValidationFailure(NamedTuple):
+    """The first problem found in a document.
+
+    Attributes:
+        path: JSON path of the offending value, e.g. ``$.content[2].marks[0]``
+        message: Description of the problem
+    """
+
+    path: str
+    message: str
+
+
+class _AttrRules:
+    """The attributes of a node or mark type."""
+
+    __slots__ = ("required", "validators")
+
+    def __init__(self, attrs: dict[str, Attribute]):
+        self.required = tuple(
+            name for name, attr in attrs.items() if not attr.has_default
+        )
+        # Attribute.validate was added in prosemirror 0.6, before that attribute
+        # values were not validated
+        self.validators: tuple[tuple[str, Any, Callable[[Any], None]], ...] = tuple(
+            (name, attr.default, validate)
+            for name, attr in attrs.items()
+            if (validate := getattr(attr, "validate", None))
+        )
+
+    def check(self, attrs: Any, kind: str, type_name: str) -> tuple[str, str] | None:
+        """Check the attrs of a node or mark, returning (path suffix, message).
+
+        Like prosemirror, attributes that are not in the spec are ignored.
+        """
+        if attrs is None:
+            attrs = {}
+        elif not isinstance(attrs, dict):
+            return ".attrs", "Attributes must be an object"
+
+        for name in self.required:
+            if name not in attrs:
+                message = f"Missing required attribute '{name}' for {kind} type"
+                return ".attrs", f"{message} '{type_name}'"
+        for name, default, validate in self.validators:
+            try:
+                validate(attrs.get(name, default))
+            except (ValueError, TypeError) as exc:
+                return f".attrs.{name}", f"Invalid value for attribute '{name}': {exc}"
+        return None
+
+
+class _NodeRules:
+    """Everything needed to check a node of one type."""
+
+    __slots__ = ("allowed_marks", "attrs", "content", "is_text", "name", "valid_end")
+
+    def __init__(
+        self,
+        name: str,
+        attrs: _AttrRules,
+        content: list[dict[str, int]],
+        valid_end: list[bool],
+        allowed_marks: frozenset[str] | None,
+        is_text: bool,
+    ):
+        self.name = name
+        self.attrs = attrs
+        # Transition table of the content expression, starting at state 0
+        self.content = content
+        self.valid_end = valid_end
+        # None if every mark is allowed
+        self.allowed_marks = allowed_marks
+        self.is_text = is_text
+
+
+def _compile_content(match: ContentMatch) -> tuple[list[dict[str, int]], list[bool]]:
+    """Number the states of a content expression and build its transition table."""
+    states = {id(match): 0}
+    pending = [match]
+    transitions: list[dict[str, int]] = []
+    valid_end: list[bool] = []
+    while pending:
+        state = pending.pop(0)
+        table: dict[str, int] = {}
+        for edge in state.next:
+            if id(edge.next) not in states:
+                states[id(edge.next)] = len(states)
+                pending.append(edge.next)
+            table[edge.type.name] = states[id(edge.next)]
+        transitions.append(table)
+        valid_end.append(state.valid_end)
+    return transitions, valid_end
+
+
+class DocumentValidator:
+    """Check Prosemirror document dicts against a schema.
+
+    Checks the same as ``Node.from_json(schema, doc).check()``: known node and mark
+    types, attributes, text nodes, the content expression of every node and the
+    marks allowed in it. Additionally, the top node must be of the top node type of
+    the schema, but it may be empty (as in an empty editor).
+
+    NOTE: You should not instantiate this class directly, use :func:`get_validator`.
+    """
+
+    schema: Schema
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.top_node = schema.top_node_type.name
+
+        compiled: dict[int, tuple[list[dict[str, int]], list[bool]]] = {}
+        self.nodes: dict[str, _NodeRules] = {}
+        for name, node_type in schema.nodes.items():
+            # Node types with the same content expression share their ContentMatch
+            match = node_type.content_match
+            if id(match) not in compiled:
+                compiled[id(match)] = _compile_content(match)
+            content, valid_end = compiled[id(match)]
+            mark_set = node_type.mark_set
+            self.nodes[name] = _NodeRules(
+                name,
+                _AttrRules(node_type.attrs),
+                content,
+                valid_end,
+                None if mark_set is None else frozenset(m.name for m in mark_set),
+                node_type.is_text,
+            )
+
+        self.marks = {
+            name: _AttrRules(mark_type.attrs)
+            for name, mark_type in schema.marks.items()
+        }
+        self.excluded = {
+            name: frozenset(excluded.name for excluded in mark_type.excluded)
+            for name, mark_type in schema.marks.items()
+        }
+
+    def first_error(
+        self, doc: Any, counter: LimitCounter | None = None, *, initial: Any = None
+    ) -> ValidationFailure | None:
+        """Return the first problem in a document, or None if it is valid.
+
+        Nodes are checked in document order, a node before its content.
+
+        Args:
+            doc: Document dict to check
+            counter: Counts the nodes against the configured limits
+            initial: A valid earlier version of the document. Top level blocks that
+                are unchanged since (the blocks before the first and after the last
+                change) are not checked again, only whether they are allowed in the
+                top node. Ignored with a counter, which must see every node.
+
+        Raises:
+            ValidationError: If the document exceeds a limit of the counter
+        """
+        stack: list[tuple[Any, _Path, int, _NodeRules | None]] = [(doc, None, 0, None)]
+        while stack:
+            node, path, depth, parent = stack.pop()
+            error = self._check_node(node, parent)
+            if isinstance(error, tuple):
+                return ValidationFailure(_format_path(path, error[0]), error[1])
+
+            rules = error
+            if counter is not None and depth:
+                counter.add(rules.name, depth)
+
+            content = node.get("content") if not rules.is_text else None
+            if not content:
+                if depth == 0 or rules.valid_end[0]:
+                    continue
+                return ValidationFailure(
+                    _format_path(path, ".content"),
+                    f"Content of '{rules.name}' is incomplete",
+                )
+            if not isinstance(content, list):
+                return ValidationFailure(
+                    _format_path(path, ".content"), "Content must be a list"
+                )
+
+            state = 0
+            transitions = rules.content
+            for index, child in enumerate(content):
+                child_type = child.get("type") if isinstance(child, dict) else None
+                next_state = (
+                    transitions[state].get(child_type)
+                    if isinstance(child_type, str)
+                    else None
+                )
+                if next_state is None:
+                    # Report malformed or unknown children as such
+                    child_error = self._check_node(child, rules)
+                    if isinstance(child_error, tuple):
+                        return ValidationFailure(
+                            _format_path((path, index), child_error[0]),
+                            child_error[1],
+                        )
+                    return ValidationFailure(
+                        _format_path((path, index), ".type"),
+                        f"Node type '{child_type}' is not allowed here in "
+                        f"'{rules.name}'",
+                    )
+                state = next_state
+            if not rules.valid_end[state]:
+                return ValidationFailure(
+                    _format_path(path, ".content"),
+                    f"Content of '{rules.name}' is incomplete",
+                )
+
+            indexes = range(len(content))
+            if depth == 0 and counter is None and isinstance(initial, dict):
+                indexes = _changed_blocks(content, initial.get("content"))
+            stack.extend(
+                (content[index], (path, index), depth + 1, rules)
+                for index in reversed(indexes)
+            )
+        return None
+
+    def _check_node(
+        self, node: Any, parent: _NodeRules | None
+    ) -> _NodeRules | tuple[str, str]:
+        """Check a node without its content, returning its rules or an error.
+
+        Errors are returned as (path suffix, message).
+        """
+        if not isinstance(node, dict) or not node:
+            return "", "Node must be a non-empty object"
+
+        node_type = node.get("type")
+        if not isinstance(node_type, str):
+            return ".type", "Node type must be a string"
+        rules = self.nodes.get(node_type)
+        if rules is None:
+            return ".type", f"Unknown node type '{node_type}'"
+        if parent is None and node_type != self.top_node:
+            return ".type", f"Document must be a '{self.top_node}' node"
+
+        marks = node.get("marks")
+        if marks:
+            error = self._check_marks(marks, parent)
+            if error is not None:
+                return error
+
+        if rules.is_text:
+            text = node.get("text")
+            if not isinstance(text, str) or not text:
+                return ".text", "Text must be a non-empty string"
+            return rules
+
+        error = rules.attrs.check(node.get("attrs"), "node", node_type)
+        if error is not None:
+            return error
+        return rules
+
+    def _check_marks(
+        self, marks: Any, parent: _NodeRules | None
+    ) -> tuple[str, str] | None:
+        allowed_marks = parent.allowed_marks if parent is not None else None
+        if not isinstance(marks, list):
+            return ".marks", "Marks must be a list"
+
+        seen: list[tuple[str, Any]] = []
+        for index, mark in enumerate(marks):
+            suffix = f".marks[{index}]"
+            if not isinstance(mark, dict) or not mark:
+                return suffix, "Mark must be a non-empty object"
+            mark_type = mark.get("type")
+            if not isinstance(mark_type, str):
+                return f"{suffix}.type", "Mark type must be a string"
+            attr_rules = self.marks.get(mark_type)
+            if attr_rules is None:
+                return f"{suffix}.type", f"Unknown mark type '{mark_type}'"
+            error = attr_rules.check(mark.get("attrs"), "mark", mark_type)
+            if error is not None:
+                return suffix + error[0], error[1]
+            if allowed_marks is not None and mark_type not in allowed_marks:
+                parent_name = parent.name if parent is not None else ""
+                return (
+                    f"{suffix}.type",
+                    f"Mark '{mark_type}' is not allowed in '{parent_name}'",
+                )
+
+            attrs = mark.get("attrs") or {}
+            for other_type, other_attrs in seen:
+                if (
+                    other_type in self.excluded[mark_type]
+                    or mark_type in self.excluded[other_type]
+                    or (other_type == mark_type and other_attrs == attrs)
+                ):
+                    message = f"Mark '{mark_type}' can not be combined with"
+                    return f"{suffix}.type", f"{message} '{other_type}'"
+            seen.append((mark_type, attrs))
+        return None
+
+
+def _changed_blocks(content: list, initial_content: Any) -> range:
+    """Return the indexes of the blocks that differ from the initial content.
+
+    Blocks are compared from the start and from the end, so a single edit leaves
+    the blocks before and after it unchanged.
+    """
+    if not isinstance(initial_content, list):
+        return range(len(content))
+    length = min(len(content), len(initial_content))
+    start = 0
+    while start < length and content[start] == initial_content[start]:
+        start += 1
+    end = 0
+    while end < length - start and content[-1 - end] == initial_content[-1 - end]:
+        end += 1
+    return range(start, len(content) - end)
+
+
+def _format_path(path: _Path, suffix: str) -> str:
+    parts = []
+    while path is not None:
+        path, index = path
+        parts.append(f".content[{index}]")
+    return "$" + "".join(reversed(parts)) + suffix
+
+
+_validator_cache: weakref.WeakKeyDictionary[Schema, DocumentValidator] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_validator(schema: Schema) -> DocumentValidator:
+    """Return the DocumentValidator for a schema, compiling it on first use."""
+    try:
+        return _validator_cache[schema]
+    except KeyError:
+        return _validator_cache.setdefault(schema, DocumentValidator(schema))
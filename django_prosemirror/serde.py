@@ -1,122 +1,420 @@
 """Serialization and deserialization functions for Prosemirror documents."""
 
-from typing import cast
+import weakref
+from collections.abc import Iterable, Iterator
+from typing import Any, Literal, cast
 
+import lxml.html
 from prosemirror import Schema
-from prosemirror.model import DOMSerializer, Node
-from prosemirror.model.from_dom import from_html
+from prosemirror.model import DOMParser, DOMSerializer, Node
 
+from django_prosemirror.cache import (
+    get_html_cache,
+    get_html_cache_timeout,
+    html_cache_key,
+    shared_html_cache_stats,
+)
 from django_prosemirror.constants import get_empty_doc
+from django_prosemirror.importer import get_importer
+from django_prosemirror.limits import DocumentLimits
+from django_prosemirror.renderer import get_renderer
 from django_prosemirror.schema import ProsemirrorDocumentDict
+from django_prosemirror.text import TextOptions, get_text_extractor
 
+# "direct" renders the document dict straight to HTML, "dom" goes through the
+# prosemirror Node tree and DOMSerializer. Both produce identical output.
+RenderEngine = Literal["direct", "dom"]
 
-def _clean_empty_attrs(
-    doc: ProsemirrorDocumentDict, schema: Schema
-) -> ProsemirrorDocumentDict:
-    """Remove empty attrs from marks that don't have attributes defined in the schema.
+# "dom" parses HTML into an lxml tree which prosemirror's DOMParser turns into a
+# Node tree, "stream" builds the document dict straight from tokenizer events.
+# Both produce identical documents.
+ParseEngine = Literal["dom", "stream"]
 
-    The prosemirror library automatically adds empty attrs: {} to all marks during
-    HTML parsing, even when the mark specification doesn't define any attributes.
-    This function cleans those up to match the expected document structure.
 
-    Also removes marks from text nodes inside nodes that don't allow marks (like code_
-    block). Additionally, removes node attributes that match their default values.
+def get_serializer(schema: Schema) -> DOMSerializer:
+    """Return the DOMSerializer for a schema, compiling it on first use.
+
+    The serializer is cached on the schema, where prosemirror 0.6+ keeps it as well,
+    and compiled schemas are shared by equal field configurations (see
+    ``ProsemirrorConfig.schema``).
+
+    Args:
+        schema: Prosemirror schema to serialize documents for
+
+    Returns:
+        DOMSerializer: Serializer shared by every caller using the same schema
+    """
+    # Older prosemirror versions compile a new serializer on every from_schema()
+    serializer = schema.cached.get("domSerializer")
+    if not isinstance(serializer, DOMSerializer):
+        serializer = schema.cached["domSerializer"] = DOMSerializer.from_schema(schema)
+    return serializer
+
+
+def get_parser(schema: Schema) -> DOMParser:
+    """Return the DOMParser for a schema, compiling its parse rules on first use.
+
+    The parser is cached on the schema by prosemirror, see :func:`get_serializer`.
+
+    Args:
+        schema: Prosemirror schema to parse HTML for
+
+    Returns:
+        DOMParser: Parser shared by every caller using the same schema
+    """
+    return DOMParser.from_schema(schema)
+
+
+class _CleaningPlan:
+    """Schema lookups used by :func:`_clean_empty_attrs`, computed once per schema.
+
+    Attributes:
+        no_marks_parents: Node types whose text may not have marks
+        attrless_marks: Mark types without attributes
+        attr_defaults: Default attribute values of the node types that set
+            ``stripDefaultAttrs`` in their spec
     """
 
-    def clean_node(node: dict, parent_node_type=None) -> dict:
+    __slots__ = ("attr_defaults", "attrless_marks", "no_marks_parents")
+
+    def __init__(self, schema: Schema):
+        self.no_marks_parents = frozenset(
+            name
+            for name, node_type in schema.nodes.items()
+            if node_type.spec.get("marks") == ""
+        )
+        self.attrless_marks = frozenset(
+            name for name, mark_type in schema.marks.items() if not mark_type.attrs
+        )
+        self.attr_defaults = {
+            name: {
+                attr: attr_spec.get("default")
+                for attr, attr_spec in node_type.spec.get("attrs", {}).items()
+            }
+            for name, node_type in schema.nodes.items()
+            if node_type.spec.get("stripDefaultAttrs")
+        }
+
+    def clean(self, node: Any, allow_marks: bool, in_place: bool) -> dict:
+        """Clean a node, copying only the dicts that change unless ``in_place``."""
         if not isinstance(node, dict):
             raise ValueError(f"{node} is not a dict")
 
         node_type = node.get("type")
+        cleaned = node if in_place else None
 
-        # Check if current node type disallows marks
-        parent_disallows_marks = False
-        if parent_node_type:
-            parent_node_spec = schema.nodes.get(parent_node_type)
-            if parent_node_spec and parent_node_spec.spec.get("marks") == "":
-                parent_disallows_marks = True
-
-        # Clean up image node attributes that match default values
-        if node_type == "filer_image" and "attrs" in node:
-            node_spec = schema.nodes.get(node_type)
-            if node_spec and hasattr(node_spec, "spec") and "attrs" in node_spec.spec:
-                cleaned_attrs = {}
-                for attr_name, attr_value in node["attrs"].items():
-                    attr_spec = node_spec.spec["attrs"].get(attr_name, {})
-                    default_value = attr_spec.get("default")
-                    # Keep attribute only if it doesn't match the default value
-                    if attr_value != default_value:
-                        cleaned_attrs[attr_name] = attr_value
-
-                # Update node with cleaned attrs, or remove attrs entirely if empty
-                if cleaned_attrs:
-                    node = {**node, "attrs": cleaned_attrs}
-                else:
-                    node = {k: v for k, v in node.items() if k != "attrs"}
-
-        # Clean up marks in text nodes
-        if node_type == "text" and "marks" in node:
-            if parent_disallows_marks:
-                # Remove all marks if parent node doesn't allow marks
-                node = {k: v for k, v in node.items() if k != "marks"}
+        defaults = self.attr_defaults.get(node_type)
+        if defaults is not None and "attrs" in node:
+            attrs = {
+                name: value
+                for name, value in node["attrs"].items()
+                if value != defaults.get(name)
+            }
+            cleaned = cleaned if cleaned is not None else dict(node)
+            if attrs:
+                cleaned["attrs"] = attrs
             else:
-                # Clean empty attrs from marks
-                cleaned_marks = []
+                del cleaned["attrs"]
+
+        if node_type == "text" and "marks" in node:
+            if not allow_marks:
+                cleaned = cleaned if cleaned is not None else dict(node)
+                del cleaned["marks"]
+            elif in_place:
                 for mark in node["marks"]:
-                    if isinstance(mark, dict) and "type" in mark:
-                        mark_type = schema.marks.get(mark["type"])
-                        # If mark has empty attrs and the mark type doesn't define attrs
-                        # remove attrs
-                        if (
-                            mark_type
-                            and mark.get("attrs") == {}
-                            and (
-                                not hasattr(mark_type, "attrs")
-                                or (hasattr(mark_type, "attrs") and not mark_type.attrs)
-                            )
-                        ):
-                            cleaned_mark = {
-                                k: v for k, v in mark.items() if k != "attrs"
-                            }
-                            cleaned_marks.append(cleaned_mark)
-                        else:
-                            cleaned_marks.append(mark)
-                    else:
-                        cleaned_marks.append(mark)
-                node = {**node, "marks": cleaned_marks}
-
-        # Recursively clean content, passing current node type as parent
+                    if self._has_empty_attrs(mark):
+                        del mark["attrs"]
+            elif any(self._has_empty_attrs(mark) for mark in node["marks"]):
+                cleaned = cleaned if cleaned is not None else dict(node)
+                cleaned["marks"] = [
+                    {key: value for key, value in mark.items() if key != "attrs"}
+                    if self._has_empty_attrs(mark)
+                    else mark
+                    for mark in node["marks"]
+                ]
+
         if "content" in node:
-            node = {
-                **node,
-                "content": [clean_node(child, node_type) for child in node["content"]],
-            }
+            allow_child_marks = node_type not in self.no_marks_parents
+            if in_place:
+                for child in node["content"]:
+                    self.clean(child, allow_child_marks, True)
+            else:
+                content = []
+                changed = False
+                for child in node["content"]:
+                    cleaned_child = self.clean(child, allow_child_marks, False)
+                    changed = changed or cleaned_child is not child
+                    content.append(cleaned_child)
+                if changed:
+                    cleaned = cleaned if cleaned is not None else dict(node)
+                    cleaned["content"] = content
+
+        return cleaned if cleaned is not None else node
+
+    def _has_empty_attrs(self, mark: Any) -> bool:
+        return (
+            isinstance(mark, dict)
+            and mark.get("type") in self.attrless_marks
+            and mark.get("attrs") == {}
+        )
+
 
-        return node
+_cleaning_plan_cache: weakref.WeakKeyDictionary[Schema, _CleaningPlan] = (
+    weakref.WeakKeyDictionary()
+)
 
-    return clean_node(cast(dict, doc))
 
+def _clean_empty_attrs(
+    doc: ProsemirrorDocumentDict, schema: Schema, *, in_place: bool = False
+) -> ProsemirrorDocumentDict:
+    """Remove empty attrs from marks that don't have attributes defined in the schema.
+
+    The prosemirror library automatically adds empty attrs: {} to all marks during
+    HTML parsing, even when the mark specification doesn't define any attributes.
+    This function cleans those up to match the expected document structure.
 
-def doc_to_html(value: ProsemirrorDocumentDict | None, *, schema: Schema) -> str:
+    Also removes marks from text nodes inside nodes that don't allow marks (like code_
+    block). Additionally, removes node attributes that match their default values
+    for node types with ``stripDefaultAttrs`` in their spec (like filer_image).
+
+    By default the input is left untouched and only changed nodes are copied; with
+    ``in_place`` the input is cleaned in place, for freshly parsed documents.
+    """
+    try:
+        plan = _cleaning_plan_cache[schema]
+    except KeyError:
+        plan = _cleaning_plan_cache.setdefault(schema, _CleaningPlan(schema))
+    return cast(ProsemirrorDocumentDict, plan.clean(doc, True, in_place))
+
+
+def doc_to_html(
+    value: ProsemirrorDocumentDict | None,
+    *,
+    schema: Schema,
+    engine: RenderEngine = "direct",
+    max_chars: int | None = None,
+) -> str:
     """Convert a Prosemirror document to HTML.
 
+    If the ``html_cache`` setting names a Django cache, the rendered HTML is stored
+    in and served from that cache.
+
     Args:
         value: object containing the Prosemirror document (must be dict or None)
         schema: Prosemirror schema defining document structure
+        engine: "direct" (default) to render the dict without building a Node tree,
+            or "dom" to render through prosemirror's DOMSerializer
+        max_chars: Only render an excerpt with up to this many characters of text.
+            All open tags are closed and the rest of the document is not visited.
+            Excerpts bypass the shared HTML cache and require the "direct" engine.
 
     Returns:
         str: HTML representation of the document
 
     Raises:
-        ValueError: If value is not a dict or None
+        ValueError: If value is not a dict or None, or if max_chars is combined with
+            the "dom" engine
 
     Note:
         We require dict specifically (not Mapping) because all documents come from
         Django's JSONField which always produces dict objects.
     """
+    if max_chars is not None and engine != "direct":
+        raise ValueError("max_chars is only supported by the 'direct' engine")
+
+    if not _has_content(value):
+        return ""
+
+    if max_chars is not None:
+        return get_renderer(schema).render_excerpt(
+            cast(ProsemirrorDocumentDict, value), max_chars
+        )
+
+    cache = get_html_cache()
+    key = html_cache_key(value, schema) if cache is not None else None
+    if cache is None or key is None:
+        return _render_html(value, schema=schema, engine=engine)
+
+    html = cache.get(key)
+    if html is not None:
+        shared_html_cache_stats.hits += 1
+        return html
+
+    shared_html_cache_stats.misses += 1
+    html = _render_html(value, schema=schema, engine=engine)
+    cache.set(key, html, get_html_cache_timeout())
+    return html
+
+
+def docs_to_html(
+    values: Iterable[ProsemirrorDocumentDict | None],
+    *,
+    schema: Schema,
+    engine: RenderEngine = "direct",
+) -> list[str]:
+    """Convert several Prosemirror documents to HTML at once.
+
+    Behaves like calling :func:`doc_to_html` for every document, but looks up and
+    stores the HTML in the shared cache with a single ``get_many`` and ``set_many``.
+
+    Args:
+        values: Prosemirror documents (dicts or None) to convert
+        schema: Prosemirror schema defining document structure
+        engine: Rendering engine, see :func:`doc_to_html`
+
+    Returns:
+        list[str]: HTML representation of each document, in the same order
+    """
+    docs = list(values)
+    results = ["" for _ in docs]
+    keys: dict[int, str] = {}
+
+    cache = get_html_cache()
+    for index, doc in enumerate(docs):
+        if not _has_content(doc):
+            continue
+        key = html_cache_key(doc, schema) if cache is not None else None
+        if key is None:
+            results[index] = _render_html(doc, schema=schema, engine=engine)
+        else:
+            keys[index] = key
+
+    if not keys or cache is None:
+        return results
+
+    cached = cache.get_many(set(keys.values()))
+    rendered: dict[str, str] = {}
+    for index, key in keys.items():
+        if key in cached:
+            shared_html_cache_stats.hits += 1
+            results[index] = cached[key]
+        elif key in rendered:
+            results[index] = rendered[key]
+        else:
+            shared_html_cache_stats.misses += 1
+            doc = cast(ProsemirrorDocumentDict, docs[index])
+            results[index] = rendered[key] = _render_html(
+                doc, schema=schema, engine=engine
+            )
+
+    if rendered:
+        cache.set_many(rendered, get_html_cache_timeout())
+    return results
+
+
+def doc_blocks_to_html(
+    value: ProsemirrorDocumentDict | None,
+    *,
+    schema: Schema,
+    start: int = 0,
+    stop: int | None = None,
+) -> str:
+    """Convert a range of top level blocks of a Prosemirror document to HTML.
+
+    Only the blocks ``content[start:stop]`` are rendered, which makes it cheap to
+    show one page of a long document. The shared HTML cache is not used.
+
+    Args:
+        value: object containing the Prosemirror document (must be dict or None)
+        schema: Prosemirror schema defining document structure
+        start: Index of the first top level block, as in a slice
+        stop: Index after the last top level block, as in a slice
+
+    Returns:
+        str: HTML representation of the blocks
+
+    Raises:
+        ValueError: If value is not a dict or None
+    """
+    if not _has_content(value):
+        return ""
+
+    return get_renderer(schema).render_blocks(
+        cast(ProsemirrorDocumentDict, value), start, stop
+    )
+
+
+def iter_doc_html(
+    value: ProsemirrorDocumentDict | None, *, schema: Schema
+) -> Iterator[str]:
+    """Convert a Prosemirror document to HTML, yielding one top level block at a time.
+
+    Meant for very large documents, e.g. with ``StreamingHttpResponse``: the full
+    HTML string is never built, so memory use and time to the first chunk don't grow
+    with the size of the document. The chunks join up to the output of
+    :func:`doc_to_html`, but the shared HTML cache is not used.
+
+    Args:
+        value: object containing the Prosemirror document (must be dict or None)
+        schema: Prosemirror schema defining document structure
+
+    Yields:
+        str: HTML of each top level block
+
+    Raises:
+        ValueError: If value is not a dict or None, or if a block does not fit the
+            schema. As blocks are validated while rendering, this can happen after
+            earlier chunks were yielded.
+    """
+    if not _has_content(value):
+        return
+
+    yield from get_renderer(schema).iter_render(cast(ProsemirrorDocumentDict, value))
+
+
+def doc_to_text(
+    value: ProsemirrorDocumentDict | None,
+    *,
+    schema: Schema,
+    block_separator: str = "\n\n",
+    hard_break: str = "\n",
+    cell_separator: str = "\t",
+    row_separator: str = "\n",
+    skip_code_blocks: bool = False,
+    max_chars: int | None = None,
+) -> str:
+    """Extract the plain text of a Prosemirror document, e.g. for search indexing.
+
+    The document dict is walked directly, which is considerably faster than
+    rendering HTML and stripping the tags. Marks are ignored.
+
+    Args:
+        value: object containing the Prosemirror document (must be dict or None)
+        schema: Prosemirror schema defining document structure
+        block_separator: Inserted between paragraphs, headings, code blocks and tables
+        hard_break: Replacement for hard breaks
+        cell_separator: Inserted between the cells of a table row
+        row_separator: Inserted between the rows of a table
+        skip_code_blocks: Leave the content of code blocks out of the text
+        max_chars: Stop after this many characters of text (separators don't count),
+            without visiting the rest of the document
+
+    Returns:
+        str: Text content of the document
+
+    Raises:
+        ValueError: If value is not a dict or None, or contains unknown node types
+    """
+    if not _has_content(value):
+        return ""
+
+    options = TextOptions(
+        block_separator=block_separator,
+        hard_break=hard_break,
+        cell_separator=cell_separator,
+        row_separator=row_separator,
+        skip_code_blocks=skip_code_blocks,
+    )
+    return get_text_extractor(schema).extract(
+        cast(ProsemirrorDocumentDict, value), options, max_chars=max_chars
+    )
+
+
+def _has_content(value: ProsemirrorDocumentDict | None) -> bool:
+    """Return whether a document needs rendering (i.e. is not None or empty)."""
     # Handle None/empty values
     if value is None:
-        return ""
+        return False
 
     # Validate that value is a dict (required by Django field API constraints)
     if not isinstance(value, dict):
@@ -125,31 +423,62 @@ def doc_to_html(value: ProsemirrorDocumentDict | None, *, schema: Schema) -> str
         )
 
     # Empty dict should also return empty string
-    if not value:
-        return ""
+    return bool(value)
+
+
+def _render_html(
+    value: ProsemirrorDocumentDict, *, schema: Schema, engine: RenderEngine
+) -> str:
+    if engine == "direct":
+        return get_renderer(schema).render(value)
 
     content = Node.from_json(schema, value)
-    serializer = DOMSerializer.from_schema(schema)
-    return str(serializer.serialize_fragment(content))
+    return str(get_serializer(schema).serialize_fragment(content))
 
 
-def html_to_doc(value: str, *, schema: Schema) -> ProsemirrorDocumentDict:
+def html_to_doc(
+    value: str,
+    *,
+    schema: Schema,
+    engine: ParseEngine = "dom",
+    limits: DocumentLimits | None = None,
+) -> ProsemirrorDocumentDict:
     """Convert HTML to a Prosemirror document.
 
     Args:
         value: HTML string to convert
         schema: Prosemirror schema defining document structure
+        engine: "dom" (default) to parse through an lxml tree and prosemirror's
+            DOMParser, or "stream" to build the document while tokenizing, which
+            is faster and uses less memory for large inputs
+        limits: Limits on the size of the input and the resulting document. The
+            "stream" engine stops as soon as a limit is exceeded, the "dom" engine
+            checks the size of the input upfront and the document after parsing.
 
     Returns:
         ProsemirrorDocumentDict: Document as dict structure
+
+    Raises:
+        ValidationError: If the input or the document exceeds one of the limits
     """
+    if limits is not None:
+        limits.check_input(value)
+
     if not value.strip():
         # Return empty document for empty/whitespace-only strings
         return get_empty_doc()
 
-    doc = from_html(schema, value)
-    # from_html returns JSONDict (Mapping), but we know it's actually a dict
+    if engine == "stream":
+        doc = get_importer(schema).parse(value, limits)
+        return _clean_empty_attrs(doc, schema, in_place=True)
+
+    fragment = lxml.html.fragment_fromstring(value, create_parent="document-fragment")
+    doc = get_parser(schema).parse(fragment).to_json()
+    # to_json returns JSONDict (Mapping), but we know it's actually a dict
     # Validate and cast to ensure type safety
     if not isinstance(doc, dict):
-        raise ValueError(f"Expected from_html to return dict, got {type(doc).__name__}")
-    return _clean_empty_attrs(doc, schema)
+        raise ValueError(f"Expected to_json to return dict, got {type(doc).__name__}")
+    if limits is not None:
+        # prosemirror's DOMParser can't be interrupted, check the parsed document
+        limits.check_doc(doc, schema)
+    return _clean_empty_attrs(doc, schema, in_place=True)
@@ -1,9 +1,11 @@
-"""Django template tags for including Prosemirror assets."""
+"""Django template tags for including Prosemirror assets and rendering documents."""
 
 from django import template
 from django.templatetags.static import static
 from django.utils.safestring import SafeString, mark_safe
 
+from django_prosemirror.fields import ProsemirrorFieldDocument
+
 register = template.Library()
 
 
@@ -25,3 +27,30 @@ def include_django_prosemirror_js_defer() -> SafeString:
 def include_django_prosemirror_css() -> SafeString:
     css_url = static("css/django-prosemirror.css")
     return mark_safe(f'<link rel="stylesheet" href="{css_url}">')
+
+
+@register.simple_tag
+def prosemirror_html(document: ProsemirrorFieldDocument | None) -> SafeString:
+    """Render a document block by block, without caching the HTML on the document.
+
+    Django templates are rendered to a string, so this does not stream the response
+    by itself. It does keep large documents from holding on to their rendered HTML
+    for the lifetime of the model instance. For streaming, pass
+    ``document.iter_html()`` to a ``StreamingHttpResponse``.
+    """
+    if document is None:
+        return mark_safe("")
+    return mark_safe("".join(document.iter_html()))
+
+
+@register.filter
+def prosemirror_excerpt(
+    document: ProsemirrorFieldDocument | None, max_chars: int
+) -> SafeString:
+    """Render the first ``max_chars`` characters of text of a document as HTML.
+
+    Usage: ``{{ post.content|prosemirror_excerpt:300 }}``
+    """
+    if document is None:
+        return mark_safe("")
+    return mark_safe(document.html_excerpt(int(max_chars)))
@@ -0,0 +1,318 @@
+"""Plain text extraction from Prosemirror document dicts.
+
+The extractor walks the stored document dict directly, without building a
+Prosemirror ``Node`` tree or rendering HTML, which makes it suitable for feeding
+large amounts of content to e.g. a search index.
+"""
+
+import enum
+import sys
+import weakref
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+from prosemirror import Schema
+
+from django_prosemirror.schema import NodeType, ProsemirrorDocumentDict
+
+
+class _Role(enum.Enum):
+    """How a node type contributes to the extracted text."""
+
+    TEXT = enum.auto()
+    LINE_BREAK = enum.auto()
+    INLINE_LEAF = enum.auto()
+    TEXTBLOCK = enum.auto()
+    CODE_BLOCK = enum.auto()
+    TABLE = enum.auto()
+    TABLE_ROW = enum.auto()
+    CONTAINER = enum.auto()
+    BLOCK_LEAF = enum.auto()
+
+
+class TextOptions(NamedTuple):
+    """Options controlling how a document is flattened to text."""
+
+    block_separator: str = "\n\n"
+    hard_break: str = "\n"
+    cell_separator: str = "\t"
+    row_separator: str = "\n"
+    skip_code_blocks: bool = False
+
+
+class Budget:
+    """Number of text characters left to output when rendering an excerpt.
+
+    Only text content counts towards the budget, markup and separators do not.
+    """
+
+    __slots__ = ("remaining",)
+
+    def __init__(self, max_chars: int):
+        if max_chars < 0:
+            raise ValueError(f"max_chars must not be negative, got {max_chars}")
+        self.remaining = max_chars
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining <= 0
+
+    def take(self, text: str) -> str:
+        """Consume the budget for ``text``, returning the part that fits.
+
+        Text that doesn't fit is cut at the last word boundary, if there is one.
+        """
+        if len(text) <= self.remaining:
+            self.remaining -= len(text)
+            return text
+
+        cut = text[: self.remaining]
+        self.remaining = 0
+        if not text[len(cut)].isspace():
+            boundary = max(cut.rfind(" "), cut.rfind("\n"))
+            if boundary > 0:
+                cut = cut[:boundary]
+        return cut.rstrip()
+
+
+class BlockIndexEntry(NamedTuple):
+    """Text size and position of a top level block of a document.
+
+    Offsets count characters and words of text content only, i.e. without the
+    separators between blocks, matching the ``max_chars`` budget of excerpts.
+    """
+
+    char_offset: int
+    char_count: int
+    word_offset: int
+    word_count: int
+
+
+def paginate_blocks(
+    index: Sequence[BlockIndexEntry], words_per_page: int
+) -> list[tuple[int, int]]:
+    """Group consecutive top level blocks into pages of roughly equal length.
+
+    Blocks are added to a page until the next block would take it over
+    ``words_per_page`` words. Blocks are never split, so a single block longer than
+    ``words_per_page`` forms a page of its own.
+
+    Args:
+        index: Block index of the document, see :meth:`TextExtractor.block_index`
+        words_per_page: Target number of words per page
+
+    Returns:
+        list[tuple[int, int]]: ``(start, stop)`` block range of each page
+
+    Raises:
+        ValueError: If words_per_page is not positive
+    """
+    if words_per_page < 1:
+        raise ValueError(f"words_per_page must be positive, got {words_per_page}")
+
+    pages = []
+    start = 0
+    words = 0
+    for position, entry in enumerate(index):
+        if position > start and words + entry.word_count > words_per_page:
+            pages.append((start, position))
+            start = position
+            words = 0
+        words += entry.word_count
+    if start < len(index):
+        pages.append((start, len(index)))
+    return pages
+
+
+def _role(node_type: Any) -> _Role:
+    spec = node_type.spec
+    if node_type.is_text:
+        return _Role.TEXT
+    if node_type.is_inline:
+        # The hard_break node doesn't set linebreakReplacement, as that would
+        # change how newlines in white-space: pre-wrap HTML are imported
+        if node_type.is_leaf and (
+            node_type.name == NodeType.HARD_BREAK.value
+            or spec.get("linebreakReplacement")
+        ):
+            return _Role.LINE_BREAK
+        return _Role.INLINE_LEAF if node_type.is_leaf else _Role.CONTAINER
+    if node_type.is_textblock:
+        return _Role.CODE_BLOCK if spec.get("code") else _Role.TEXTBLOCK
+    if spec.get("tableRole") == "table":
+        return _Role.TABLE
+    if spec.get("tableRole") == "row":
+        return _Role.TABLE_ROW
+    return _Role.BLOCK_LEAF if node_type.is_leaf else _Role.CONTAINER
+
+
+class TextExtractor:
+    """Extract the plain text of Prosemirror document dicts.
+
+    Top level text is split in blocks: every textblock (paragraph, heading, code
+    block) and every table forms one block. Blocks are joined with the block
+    separator; list and blockquote wrappers add no text of their own. Within a
+    table, cells are joined with the cell separator and rows with the row separator.
+    The text of the blocks inside a single cell is joined with spaces.
+
+    The role of each node type is derived from its spec: ``code`` marks code
+    blocks, ``tableRole`` marks tables and rows, and ``linebreakReplacement``
+    marks hard breaks, as does the name of the ``hard_break`` node.
+
+    NOTE: You should not instantiate this class directly, use
+    :func:`get_text_extractor`.
+    """
+
+    schema: Schema
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self._roles = {
+            name: _role(node_type) for name, node_type in schema.nodes.items()
+        }
+
+    def extract(
+        self,
+        value: ProsemirrorDocumentDict,
+        options: TextOptions | None = None,
+        *,
+        max_chars: int | None = None,
+    ) -> str:
+        """Return the text of a document dict.
+
+        If ``max_chars`` is given, traversal stops as soon as that many characters
+        of text have been collected; the rest of the document is not visited.
+
+        Raises:
+            ValueError, KeyError: If the document contains malformed nodes or node
+                types that are not in the schema
+        """
+        options = options or TextOptions()
+        budget = Budget(max_chars) if max_chars is not None else None
+        blocks: list[str] = []
+        self._collect_blocks(self._get_content(value), blocks, options, budget)
+        return options.block_separator.join(blocks)
+
+    def block_index(self, value: ProsemirrorDocumentDict) -> list[BlockIndexEntry]:
+        """Return the text size and position of every top level block.
+
+        Raises:
+            ValueError, KeyError: If the document contains malformed nodes or node
+                types that are not in the schema
+        """
+        # Whitespace separators, so that words don't run together across blocks
+        options = TextOptions(hard_break=" ", cell_separator=" ", row_separator=" ")
+        index = []
+        char_offset = word_offset = 0
+        for node in self._get_content(value):
+            # An unlimited budget counts the characters the same way excerpts do
+            budget = Budget(sys.maxsize)
+            blocks: list[str] = []
+            self._collect_blocks([node], blocks, options, budget)
+            char_count = sys.maxsize - budget.remaining
+            word_count = sum(len(block.split()) for block in blocks)
+            index.append(
+                BlockIndexEntry(char_offset, char_count, word_offset, word_count)
+            )
+            char_offset += char_count
+            word_offset += word_count
+        return index
+
+    def _collect_blocks(
+        self,
+        content: list[Any],
+        blocks: list[str],
+        options: TextOptions,
+        budget: Budget | None,
+    ) -> None:
+        for node in content:
+            if budget is not None and budget.exhausted:
+                return
+            role = self._get_role(node)
+            if role is _Role.TEXTBLOCK or (
+                role is _Role.CODE_BLOCK and not options.skip_code_blocks
+            ):
+                text = self._inline_text(node, options, budget)
+            elif role is _Role.TABLE:
+                text = self._table_text(node, options, budget)
+            elif role is _Role.CONTAINER:
+                self._collect_blocks(self._get_content(node), blocks, options, budget)
+                continue
+            else:
+                continue
+
+            if text:
+                blocks.append(text)
+
+    def _inline_text(
+        self, node: dict[str, Any], options: TextOptions, budget: Budget | None
+    ) -> str:
+        parts = []
+        for child in self._get_content(node):
+            if budget is not None and budget.exhausted:
+                break
+            role = self._get_role(child)
+            if role is _Role.TEXT:
+                text = str(child["text"])
+                parts.append(budget.take(text) if budget is not None else text)
+            elif role is _Role.LINE_BREAK:
+                parts.append(options.hard_break)
+            elif role is _Role.CONTAINER:
+                parts.append(self._inline_text(child, options, budget))
+        return "".join(parts)
+
+    def _table_text(
+        self, node: dict[str, Any], options: TextOptions, budget: Budget | None
+    ) -> str:
+        rows = []
+        has_text = False
+        for row in self._get_content(node):
+            if budget is not None and budget.exhausted:
+                break
+            if self._get_role(row) is not _Role.TABLE_ROW:
+                continue
+            cells = []
+            for cell in self._get_content(row):
+                if budget is not None and budget.exhausted:
+                    break
+                self._get_role(cell)  # validates the cell
+                cell_blocks: list[str] = []
+                self._collect_blocks(
+                    self._get_content(cell), cell_blocks, options, budget
+                )
+                cells.append(" ".join(cell_blocks))
+                has_text = has_text or bool(cell_blocks)
+            rows.append(options.cell_separator.join(cells))
+        return options.row_separator.join(rows) if has_text else ""
+
+    def _get_role(self, node: Any) -> _Role:
+        if not isinstance(node, dict) or not node:
+            raise ValueError("Invalid input for Node.from_json")
+        node_type = node.get("type")
+        try:
+            return self._roles[node_type]
+        except (KeyError, TypeError):
+            raise ValueError(f"Unknown node type: {node_type}") from None
+
+    @staticmethod
+    def _get_content(node: dict[str, Any]) -> list[Any]:
+        content = node.get("content")
+        if not content:
+            return []
+        # The same error as Node.from_json() raises for invalid documents
+        if not isinstance(content, list):
+            raise ValueError("Invalid input for Fragment.from_json")  # noqa: TRY004
+        return content
+
+
+_extractor_cache: weakref.WeakKeyDictionary[Schema, TextExtractor] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_text_extractor(schema: Schema) -> TextExtractor:
+    """Return the TextExtractor for a schema, creating it on first use."""
+    try:
+        return _extractor_cache[schema]
+    except KeyError:
+        return _extractor_cache.setdefault(schema, TextExtractor(schema))
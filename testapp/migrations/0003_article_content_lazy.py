@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:30
+
+from django.db import migrations
+
+import django_prosemirror.fields
+import django_prosemirror.schema.types
+import testapp.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("testapp", "0002_article"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="article",
+            name="content",
+            field=django_prosemirror.fields.ProsemirrorModelField(
+                allowed_mark_types=[
+                    django_prosemirror.schema.types.MarkType["STRONG"],
+                    django_prosemirror.schema.types.MarkType["ITALIC"],
+                    django_prosemirror.schema.types.MarkType["LINK"],
+                    django_prosemirror.schema.types.MarkType["CODE"],
+                    django_prosemirror.schema.types.MarkType["UNDERLINE"],
+                    django_prosemirror.schema.types.MarkType["STRIKETHROUGH"],
+                ],
+                allowed_node_types=[
+                    django_prosemirror.schema.types.NodeType["PARAGRAPH"],
+                    django_prosemirror.schema.types.NodeType["BLOCKQUOTE"],
+                    django_prosemirror.schema.types.NodeType["HORIZONTAL_RULE"],
+                    django_prosemirror.schema.types.NodeType["HEADING"],
+                    django_prosemirror.schema.types.NodeType["HARD_BREAK"],
+                    django_prosemirror.schema.types.NodeType["CODE_BLOCK"],
+                    django_prosemirror.schema.types.NodeType["BULLET_LIST"],
+                    django_prosemirror.schema.types.NodeType["ORDERED_LIST"],
+                    django_prosemirror.schema.types.NodeType["LIST_ITEM"],
+                    django_prosemirror.schema.types.NodeType["TABLE"],
+                    django_prosemirror.schema.types.NodeType["TABLE_ROW"],
+                    django_prosemirror.schema.types.NodeType["TABLE_CELL"],
+                    django_prosemirror.schema.types.NodeType["TABLE_HEADER"],
+                    django_prosemirror.schema.types.NodeType["FILER_IMAGE"],
+                ],
+                default=testapp.models.get_empty_doc,
+                history=True,
+                html_field="content_html",
+                lazy=True,
+                tag_to_classes={},
+                verbose_name="Content",
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:37
+
+from django.db import migrations, models
+
+import django_prosemirror.fields
+import django_prosemirror.schema.types
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("testapp", "0003_article_content_lazy"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedArticle",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "content",
+                    django_prosemirror.fields.ProsemirrorBinaryField(
+                        allowed_mark_types=[
+                            django_prosemirror.schema.types.MarkType["STRONG"],
+                            django_prosemirror.schema.types.MarkType["ITALIC"],
+                            django_prosemirror.schema.types.MarkType["LINK"],
+                            django_prosemirror.schema.types.MarkType["CODE"],
+                            django_prosemirror.schema.types.MarkType["UNDERLINE"],
+                            django_prosemirror.schema.types.MarkType["STRIKETHROUGH"],
+                        ],
+                        allowed_node_types=[
+                            django_prosemirror.schema.types.NodeType["PARAGRAPH"],
+                            django_prosemirror.schema.types.NodeType["BLOCKQUOTE"],
+                            django_prosemirror.schema.types.NodeType["HORIZONTAL_RULE"],
+                            django_prosemirror.schema.types.NodeType["HEADING"],
+                            django_prosemirror.schema.types.NodeType["HARD_BREAK"],
+                            django_prosemirror.schema.types.NodeType["CODE_BLOCK"],
+                            django_prosemirror.schema.types.NodeType["BULLET_LIST"],
+                            django_prosemirror.schema.types.NodeType["ORDERED_LIST"],
+                            django_prosemirror.schema.types.NodeType["LIST_ITEM"],
+                            django_prosemirror.schema.types.NodeType["TABLE"],
+                            django_prosemirror.schema.types.NodeType["TABLE_ROW"],
+                            django_prosemirror.schema.types.NodeType["TABLE_CELL"],
+                            django_prosemirror.schema.types.NodeType["TABLE_HEADER"],
+                            django_prosemirror.schema.types.NodeType["FILER_IMAGE"],
+                        ],
+                        blank=True,
+                        default=None,
+                        history=True,
+                        null=True,
+                        tag_to_classes={},
+                        verbose_name="Content",
+                    ),
+                ),
+                (
+                    "legacy_content",
+                    django_prosemirror.fields.ProsemirrorModelField(
+                        allowed_mark_types=[
+                            django_prosemirror.schema.types.MarkType["STRONG"],
+                            django_prosemirror.schema.types.MarkType["ITALIC"],
+                            django_prosemirror.schema.types.MarkType["LINK"],
+                            django_prosemirror.schema.types.MarkType["CODE"],
+                            django_prosemirror.schema.types.MarkType["UNDERLINE"],
+                            django_prosemirror.schema.types.MarkType["STRIKETHROUGH"],
+                        ],
+                        allowed_node_types=[
+                            django_prosemirror.schema.types.NodeType["PARAGRAPH"],
+                            django_prosemirror.schema.types.NodeType["BLOCKQUOTE"],
+                            django_prosemirror.schema.types.NodeType["HORIZONTAL_RULE"],
+                            django_prosemirror.schema.types.NodeType["HEADING"],
+                            django_prosemirror.schema.types.NodeType["HARD_BREAK"],
+                            django_prosemirror.schema.types.NodeType["CODE_BLOCK"],
+                            django_prosemirror.schema.types.NodeType["BULLET_LIST"],
+                            django_prosemirror.schema.types.NodeType["ORDERED_LIST"],
+                            django_prosemirror.schema.types.NodeType["LIST_ITEM"],
+                            django_prosemirror.schema.types.NodeType["TABLE"],
+                            django_prosemirror.schema.types.NodeType["TABLE_ROW"],
+                            django_prosemirror.schema.types.NodeType["TABLE_CELL"],
+                            django_prosemirror.schema.types.NodeType["TABLE_HEADER"],
+                            django_prosemirror.schema.types.NodeType["FILER_IMAGE"],
+                        ],
+                        blank=True,
+                        default=None,
+                        history=True,
+                        null=True,
+                        tag_to_classes={},
+                        verbose_name="Legacy content",
+                    ),
+                ),
+            ],
+        ),
+    ]
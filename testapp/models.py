@@ -2,7 +2,7 @@
 
 from django.db import models
 
-from django_prosemirror.fields import ProsemirrorModelField
+from django_prosemirror.fields import ProsemirrorBinaryField, ProsemirrorModelField
 from django_prosemirror.schema import MarkType, NodeType
 
 
@@ -103,3 +103,24 @@ class TestModel(models.Model):  # noqa: DJ008
         verbose_name="Code Content (Nullable)",
         help_text="Technical content with inline and block code support",
     )
+
+
+class Article(models.Model):  # noqa: DJ008
+    """Test model with a denormalized HTML column for its ProseMirror content."""
+
+    content = ProsemirrorModelField(
+        html_field="content_html",
+        lazy=True,
+        verbose_name="Content",
+        default=get_empty_doc,
+    )
+    content_html = models.TextField(blank=True, default="", editable=False)
+
+
+class ArchivedArticle(models.Model):  # noqa: DJ008
+    """Test model storing its ProseMirror content compressed, and a JSON column."""
+
+    content = ProsemirrorBinaryField(null=True, blank=True, verbose_name="Content")
+    legacy_content = ProsemirrorModelField(
+        null=True, blank=True, verbose_name="Legacy content"
+    )
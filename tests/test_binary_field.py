@@ -0,0 +1,154 @@
+"""Tests for ProsemirrorBinaryField and its packed storage format."""
+
+import zlib
+
+from django.core.exceptions import FieldError
+from django.db import connection
+from django.db.models import F
+
+import pytest
+
+from django_prosemirror.codec import JSONCodec, pack_json, unpack_json
+from django_prosemirror.fields import ProsemirrorBinaryField, _UndecodedBinary
+from django_prosemirror.migration_utils import (
+    copy_prosemirror_documents,
+    iter_corrupt_prosemirror_rows,
+)
+from testapp.models import ArchivedArticle
+
+DOC = {
+    "type": "doc",
+    "content": [
+        {"type": "paragraph", "content": [{"type": "text", "text": f"Paragraph {i}"}]}
+        for i in range(20)
+    ],
+}
+
+
+def _stored_value(obj):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT content FROM {ArchivedArticle._meta.db_table} WHERE id = %s",
+            [obj.pk],
+        )
+        return bytes(cursor.fetchone()[0])
+
+
+class TestPackJson:
+    def test_round_trip(self):
+        value = JSONCodec().dumps(DOC)
+
+        assert unpack_json(pack_json(value)) == value
+
+    def test_compresses_with_header(self):
+        value = JSONCodec().dumps(DOC)
+
+        packed = pack_json(value)
+
+        assert packed[:4] == b"PM\x01\x01"
+        assert zlib.decompress(packed[4:]) == value.encode()
+        assert len(packed) < len(value) / 2
+
+    def test_stores_tiny_documents_uncompressed(self):
+        assert pack_json('{"type":"doc"}') == b'PM\x01\x00{"type":"doc"}'
+
+    @pytest.mark.parametrize(
+        ("value", "message"),
+        [
+            (b"", "Not a packed"),
+            (b'{"type":"doc"}', "Not a packed"),
+            (b"PM\x02\x00{}", "format version 2"),
+            (b"PM\x01\x07{}", "compression method 7"),
+            (b"PM\x01\x01{}", "Corrupt"),
+        ],
+    )
+    def test_rejects_invalid_values(self, value, message):
+        with pytest.raises(ValueError, match=message):
+            unpack_json(value)
+
+
+@pytest.mark.django_db
+class TestProsemirrorBinaryField:
+    def test_stores_packed_documents(self):
+        obj = ArchivedArticle.objects.create(content=DOC)
+
+        stored = _stored_value(obj)
+        assert stored == pack_json(JSONCodec().dumps(DOC))
+
+        loaded = ArchivedArticle.objects.get(pk=obj.pk)
+        assert loaded.content.doc == DOC
+        assert loaded.content.html.startswith("<p>Paragraph 0</p>")
+
+    def test_null(self):
+        obj = ArchivedArticle.objects.create(content=None)
+
+        assert not ArchivedArticle.objects.get(pk=obj.pk).content
+        assert ArchivedArticle.objects.filter(content__isnull=True).count() == 1
+
+    def test_content_lookups_are_not_supported(self):
+        with pytest.raises(FieldError):
+            ArchivedArticle.objects.filter(content__type="doc")
+        with pytest.raises(FieldError):
+            ArchivedArticle.objects.filter(content__contains={"type": "doc"})
+
+    def test_lazy_field_unpacks_on_first_access(self, monkeypatch):
+        obj = ArchivedArticle.objects.create(content=DOC)
+        field = ArchivedArticle._meta.get_field("content")
+        monkeypatch.setattr(field, "lazy", True)
+
+        loaded = ArchivedArticle.objects.get(pk=obj.pk)
+        assert isinstance(loaded.__dict__["content"], _UndecodedBinary)
+
+        assert loaded.content.doc == DOC
+        assert loaded.__dict__["content"] == DOC
+
+    def test_corrupt_values_are_reported(self):
+        obj = ArchivedArticle.objects.create(content=DOC)
+        ArchivedArticle.objects.create(content=DOC)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {ArchivedArticle._meta.db_table} SET content = %s "
+                "WHERE id = %s",
+                [b"garbage", obj.pk],
+            )
+
+        assert list(iter_corrupt_prosemirror_rows(ArchivedArticle, "content")) == [
+            (obj.pk, b"garbage")
+        ]
+
+    def test_expressions_are_passed_through(self):
+        objs = [ArchivedArticle.objects.create(content=None) for _ in range(2)]
+        for obj in objs:
+            obj.content = DOC
+
+        ArchivedArticle.objects.bulk_update(objs, ["content"])
+        ArchivedArticle.objects.update(content=F("content"))
+
+        assert _stored_value(objs[0]) == pack_json(JSONCodec().dumps(DOC))
+        assert [obj.content.doc for obj in ArchivedArticle.objects.all()] == [DOC, DOC]
+
+    def test_deconstruct(self):
+        _, path, _, kwargs = ProsemirrorBinaryField(lazy=True).deconstruct()
+
+        assert path == "django_prosemirror.fields.ProsemirrorBinaryField"
+        assert kwargs["lazy"] is True
+
+
+@pytest.mark.django_db
+def test_copy_prosemirror_documents():
+    objs = [
+        ArchivedArticle.objects.create(legacy_content=DOC),
+        ArchivedArticle.objects.create(legacy_content=None),
+        ArchivedArticle.objects.create(legacy_content={"type": "doc", "content": []}),
+    ]
+
+    copied = copy_prosemirror_documents(
+        ArchivedArticle, "legacy_content", "content", batch_size=2
+    )
+
+    assert copied == 3
+    assert [ArchivedArticle.objects.get(pk=obj.pk).content.doc for obj in objs] == [
+        DOC,
+        None,
+        {"type": "doc", "content": []},
+    ]
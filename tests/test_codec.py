@@ -0,0 +1,165 @@
+"""Tests for the pluggable JSON codec of stored documents."""
+
+import json
+import sys
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import F, JSONField, Value
+from django.db.models.functions import Coalesce
+from django.test import override_settings
+
+import pytest
+
+from django_prosemirror.codec import JSONCodec, OrjsonCodec, get_codec
+from testapp.models import TestModel
+
+from .serde_test_spec import SERDE_TEST_CASES
+
+DOC = {
+    "type": "doc",
+    "content": [
+        {
+            "type": "heading",
+            "attrs": {"level": 2},
+            "content": [{"type": "text", "text": "Hé ✓ 😀"}],
+        },
+        {"type": "paragraph", "content": [{"type": "text", "text": 'Quote " \\ \n\t'}]},
+    ],
+}
+
+
+class IndentedCodec(JSONCodec):
+    def dumps(self, value):
+        return json.dumps(value, indent=1)
+
+
+@pytest.fixture
+def orjson_codec():
+    pytest.importorskip("orjson")
+    return OrjsonCodec()
+
+
+@pytest.mark.parametrize(
+    "document",
+    [DOC, *(tc.document for tc in SERDE_TEST_CASES if tc.document)],
+)
+def test_codecs_produce_identical_json(orjson_codec, document):
+    encoded = JSONCodec().dumps(document)
+
+    assert orjson_codec.dumps(document) == encoded
+    assert encoded == json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+    assert orjson_codec.loads(encoded) == JSONCodec().loads(encoded) == document
+
+
+@pytest.mark.parametrize(
+    "value", [{"big": 2**70}, {"text": "\ud800"}], ids=["big-int", "surrogate"]
+)
+def test_orjson_falls_back_for_unsupported_values(orjson_codec, value):
+    assert orjson_codec.dumps(value) == JSONCodec().dumps(value)
+
+
+def test_orjson_falls_back_for_unsupported_json(orjson_codec):
+    assert orjson_codec.loads('{"text": "\\ud800"}') == {"text": "\ud800"}
+    with pytest.raises(json.JSONDecodeError):
+        orjson_codec.loads("{")
+
+
+class TestGetCodec:
+    @pytest.mark.parametrize(
+        ("setting", "codec_class"),
+        [("json", JSONCodec), ("tests.test_codec.IndentedCodec", IndentedCodec)],
+    )
+    def test_returns_configured_codec(self, setting, codec_class):
+        with override_settings(DJANGO_PROSEMIRROR={"json_codec": setting}):
+            assert type(get_codec()) is codec_class
+
+    def test_auto_prefers_orjson(self, orjson_codec):
+        with override_settings(DJANGO_PROSEMIRROR={"json_codec": "auto"}):
+            assert isinstance(get_codec(), OrjsonCodec)
+
+    def test_auto_falls_back_to_json(self):
+        with (
+            patch.dict(sys.modules, {"orjson": None}),
+            override_settings(DJANGO_PROSEMIRROR={"json_codec": "auto"}),
+        ):
+            assert type(get_codec()) is JSONCodec
+
+    def test_missing_orjson_is_reported(self):
+        with (
+            patch.dict(sys.modules, {"orjson": None}),
+            override_settings(DJANGO_PROSEMIRROR={"json_codec": "orjson"}),
+            pytest.raises(ImproperlyConfigured, match="requires orjson"),
+        ):
+            get_codec()
+
+    def test_unknown_codec_is_reported(self):
+        with (
+            override_settings(DJANGO_PROSEMIRROR={"json_codec": "tests.nope.Codec"}),
+            pytest.raises(ImproperlyConfigured, match="tests.nope.Codec"),
+        ):
+            get_codec()
+
+
+@pytest.mark.django_db
+class TestModelFieldCodec:
+    def _stored_json(self, obj):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT full_schema_nullable FROM {TestModel._meta.db_table} "
+                "WHERE id = %s",
+                [obj.pk],
+            )
+            return cursor.fetchone()[0]
+
+    def test_documents_are_stored_with_codec(self):
+        obj = TestModel.objects.create(full_schema_nullable=DOC)
+
+        assert self._stored_json(obj) == JSONCodec().dumps(DOC)
+        assert TestModel.objects.get(pk=obj.pk).full_schema_nullable.doc == DOC
+
+    def test_configured_codec_is_used(self):
+        with override_settings(
+            DJANGO_PROSEMIRROR={"json_codec": "tests.test_codec.IndentedCodec"}
+        ):
+            obj = TestModel.objects.create(full_schema_nullable={"type": "doc"})
+            field = TestModel._meta.get_field("full_schema_nullable")
+
+            assert self._stored_json(obj) == '{\n "type": "doc"\n}'
+            assert field.value_to_string(obj) == '{\n "type": "doc"\n}'
+
+    def test_encoder_of_field_takes_precedence(self):
+        field = TestModel._meta.get_field("full_schema_nullable")
+
+        with patch.object(field, "encoder", json.JSONEncoder):
+            obj = TestModel.objects.create(full_schema_nullable={"type": "doc"})
+
+            assert self._stored_json(obj) == '{"type": "doc"}'
+
+    def test_expressions_are_passed_through(self):
+        obj = TestModel.objects.create(full_schema_nullable={"type": "doc"})
+
+        TestModel.objects.update(
+            full_schema_nullable=Coalesce(
+                "full_schema_nullable__missing", Value(DOC, output_field=JSONField())
+            )
+        )
+        assert TestModel.objects.get(pk=obj.pk).full_schema_nullable.doc == DOC
+
+        TestModel.objects.update(full_schema_nullable=F("basic_text_only"))
+        assert TestModel.objects.get(pk=obj.pk).full_schema_nullable.doc == (
+            obj.basic_text_only.doc
+        )
+
+    def test_bulk_update(self):
+        objs = [TestModel.objects.create(full_schema_nullable=None) for _ in range(2)]
+        for obj in objs:
+            obj.full_schema_nullable = DOC
+
+        TestModel.objects.bulk_update(objs, ["full_schema_nullable"])
+
+        assert self._stored_json(objs[0]) == JSONCodec().dumps(DOC)
+        assert [
+            obj.full_schema_nullable.doc for obj in TestModel.objects.order_by("pk")
+        ] == [DOC, DOC]
@@ -8,7 +8,7 @@ from django.test import TestCase, override_settings
 import pytest
 from prosemirror import Schema
 
-from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.config import ProsemirrorConfig, clear_schema_cache
 from django_prosemirror.constants import DEFAULT_SETTINGS
 from django_prosemirror.schema import MarkType, NodeType
 
@@ -350,3 +350,66 @@ class TestProsemirrorConfigSchema:
 
         assert set(schema.nodes.keys()) == expected_nodes
         assert set(schema.marks.keys()) == expected_marks
+
+
+class TestProsemirrorConfigSchemaCache:
+    """Test the process-wide schema registry."""
+
+    def test_same_configuration_shares_schema_instance(self):
+        config1 = ProsemirrorConfig(
+            allowed_node_types=[NodeType.PARAGRAPH, NodeType.HEADING],
+            allowed_mark_types=[MarkType.STRONG],
+        )
+        config2 = ProsemirrorConfig(
+            allowed_node_types=[NodeType.PARAGRAPH, NodeType.HEADING],
+            allowed_mark_types=[MarkType.STRONG],
+        )
+
+        assert config1.schema_fingerprint == config2.schema_fingerprint
+        assert config1.schema is config2.schema
+        assert config1.schema is config1.schema
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"allowed_node_types": [NodeType.PARAGRAPH, NodeType.BLOCKQUOTE]},
+            {"allowed_mark_types": [MarkType.ITALIC]},
+            {"allowed_mark_types": [MarkType.ITALIC, MarkType.STRONG]},
+            {"tag_to_classes": {"paragraph": "para"}},
+        ],
+    )
+    def test_different_configuration_gets_different_schema(self, kwargs):
+        base_kwargs = {
+            "allowed_node_types": [NodeType.PARAGRAPH, NodeType.HEADING],
+            "allowed_mark_types": [MarkType.STRONG, MarkType.ITALIC],
+        }
+        base = ProsemirrorConfig(**base_kwargs)
+        other = ProsemirrorConfig(**(base_kwargs | kwargs))
+
+        assert base.schema_fingerprint != other.schema_fingerprint
+        assert base.schema is not other.schema
+
+    def test_history_does_not_affect_schema(self):
+        assert (
+            ProsemirrorConfig(history=True).schema
+            is ProsemirrorConfig(history=False).schema
+        )
+
+    def test_clear_schema_cache(self):
+        schema = ProsemirrorConfig().schema
+
+        clear_schema_cache()
+
+        assert ProsemirrorConfig().schema is not schema
+
+    def test_cache_cleared_when_settings_change(self):
+        schema = ProsemirrorConfig().schema
+
+        with override_settings(DJANGO_PROSEMIRROR={"history": False}):
+            assert ProsemirrorConfig().schema is not schema
+
+    def test_cache_not_cleared_when_unrelated_settings_change(self):
+        schema = ProsemirrorConfig().schema
+
+        with override_settings(USE_TZ=False):
+            assert ProsemirrorConfig().schema is schema
@@ -0,0 +1,90 @@
+"""Tests for the canonical serialization and hash of documents."""
+
+import pytest
+
+from django_prosemirror.cache import canonical_json, doc_hash
+from django_prosemirror.config import ProsemirrorConfig
+
+
+def heading(attrs=None, **extra):
+    node = {"type": "heading", "content": [{"type": "text", "text": "Hé"}], **extra}
+    if attrs is not None:
+        node["attrs"] = attrs
+    return {"type": "doc", "content": [node]}
+
+
+@pytest.fixture
+def schema():
+    return ProsemirrorConfig().schema
+
+
+def test_canonical_json(schema):
+    assert canonical_json(heading({"level": 1}), schema) == (
+        '{"content":[{"content":[{"text":"H\\u00e9","type":"text"}],'
+        '"type":"heading"}],"type":"doc"}'
+    )
+
+
+def test_hash_is_stable():
+    # Must not change between processes, Python versions or releases
+    assert doc_hash(heading()) == "f3fe80f83defc82e2912c62aa61f044e"
+
+
+@pytest.mark.parametrize(
+    "equivalent",
+    [
+        heading({}),
+        heading({"level": 1}),
+        heading(marks=[]),
+        {"content": heading()["content"], "type": "doc"},
+    ],
+    ids=["empty attrs", "default attrs", "empty marks", "key order"],
+)
+def test_equivalent_documents_have_the_same_hash(schema, equivalent):
+    assert doc_hash(equivalent, schema) == doc_hash(heading(), schema)
+
+
+@pytest.mark.parametrize(
+    "different",
+    [
+        heading({"level": 2}),
+        heading({"level": True}),
+        heading(marks=[{"type": "em"}]),
+    ],
+    ids=["attrs", "attr type", "marks"],
+)
+def test_different_documents_have_different_hashes(schema, different):
+    assert doc_hash(different, schema) != doc_hash(heading(), schema)
+
+
+def test_default_attrs_of_marks_are_ignored(schema):
+    def linked(attrs):
+        text = {
+            "type": "text",
+            "text": "a",
+            "marks": [{"type": "link", "attrs": attrs}],
+        }
+        return {"type": "doc", "content": [{"type": "paragraph", "content": [text]}]}
+
+    assert doc_hash(linked({"href": "/", "title": None}), schema) == doc_hash(
+        linked({"href": "/"}), schema
+    )
+
+
+def test_default_attrs_are_kept_without_schema():
+    assert doc_hash(heading({"level": 1})) != doc_hash(heading())
+    assert doc_hash(heading({})) == doc_hash(heading())
+
+
+def test_does_not_modify_document(schema):
+    doc = heading({"level": 1}, marks=[])
+
+    doc_hash(doc, schema)
+
+    assert doc == heading({"level": 1}, marks=[])
+
+
+def test_lone_surrogates(schema):
+    doc = {"type": "doc", "content": [{"type": "text", "text": "\ud800"}]}
+
+    assert len(doc_hash(doc, schema)) == 32
@@ -8,11 +8,14 @@ from django.core.exceptions import ValidationError
 
 import pytest
 
+from django_prosemirror.codec import get_codec
 from django_prosemirror.config import ProsemirrorConfig
 from django_prosemirror.constants import get_empty_doc
 from django_prosemirror.fields import ProsemirrorFieldDocument, ProsemirrorFormField
 from django_prosemirror.schema import MarkType, NodeType
 from django_prosemirror.widgets import ProsemirrorWidget
+from testapp.forms import TestModelForm
+from testapp.models import TestModel
 
 
 def test_init_with_default_schema():
@@ -68,12 +71,17 @@ def test_prepare_value_with_prosemirror_document():
         ],
     }
 
-    # Test with dict directly since ProsemirrorFieldDocument isn't JSON serializable
+    # Dicts and documents are both serialized to compact JSON
     result = field.prepare_value(doc_data)
 
-    # Should convert dict to JSON string
-    expected_json = json.dumps(doc_data)
+    expected_json = json.dumps(doc_data, separators=(",", ":"))
     assert result == expected_json
+    assert (
+        field.prepare_value(
+            ProsemirrorFieldDocument(doc_data, schema=field.config.schema)
+        )
+        == expected_json
+    )
 
 
 def test_to_python_with_valid_json_string():
@@ -280,3 +288,136 @@ def test_init_with_invalid_mark_types_raises_exception():
         ProsemirrorFormField(
             allowed_mark_types="invalid_string",
         )
+
+
+# Unchanged documents
+PARAGRAPH_DOC = {
+    "type": "doc",
+    "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Hi"}]}],
+}
+HEADING_DOC = {
+    "type": "doc",
+    "content": [
+        {
+            "type": "heading",
+            "attrs": {"level": 1},
+            "content": [{"type": "text", "text": "Hi"}],
+        }
+    ],
+}
+
+
+class ContentForm(forms.Form):
+    content = ProsemirrorFormField(allowed_node_types=[NodeType.PARAGRAPH])
+
+
+@pytest.mark.parametrize(
+    ("initial", "data", "changed"),
+    [
+        (PARAGRAPH_DOC, json.dumps(PARAGRAPH_DOC), False),
+        (PARAGRAPH_DOC, json.dumps(dict(reversed(PARAGRAPH_DOC.items()))), False),
+        (PARAGRAPH_DOC, json.dumps(get_empty_doc()), True),
+        (PARAGRAPH_DOC, "{invalid", True),
+        (None, "", False),
+        (None, json.dumps(PARAGRAPH_DOC), True),
+    ],
+)
+def test_has_changed(initial, data, changed):
+    assert ProsemirrorFormField().has_changed(initial, data) is changed
+
+
+def test_has_changed_with_document_initial():
+    field = ProsemirrorFormField()
+    initial = ProsemirrorFieldDocument(PARAGRAPH_DOC, schema=field.config.schema)
+
+    assert field.has_changed(initial, json.dumps(PARAGRAPH_DOC)) is False
+
+
+def test_unchanged_document_is_not_validated(monkeypatch):
+    def fail(*args, **kwargs):
+        pytest.fail("The unchanged document was validated")
+
+    monkeypatch.setattr("django_prosemirror.fields.validate_doc", fail)
+    form = ContentForm(
+        data={"content": json.dumps(PARAGRAPH_DOC)},
+        initial={"content": PARAGRAPH_DOC},
+    )
+
+    assert form.is_valid()
+    assert form.cleaned_data["content"].doc == PARAGRAPH_DOC
+    assert form.changed_data == []
+
+
+def test_unchanged_document_is_accepted_even_if_now_invalid():
+    # E.g. stored before headings were removed from the allowed node types
+    form = ContentForm(
+        data={"content": json.dumps(HEADING_DOC)},
+        initial={"content": HEADING_DOC},
+    )
+
+    assert form.is_valid()
+
+
+def test_document_is_validated_when_cleaned_outside_the_form():
+    field = ContentForm(initial={"content": HEADING_DOC}).fields["content"]
+
+    with pytest.raises(ValidationError):
+        field.clean(json.dumps(HEADING_DOC))
+
+
+def test_changed_document_is_validated():
+    form = ContentForm(
+        data={"content": json.dumps(HEADING_DOC)},
+        initial={"content": PARAGRAPH_DOC},
+    )
+
+    assert not form.is_valid()
+    assert form.changed_data == ["content"]
+
+
+def test_only_changed_blocks_are_validated():
+    # The stored nested paragraph is invalid, but was not edited
+    stale = {"type": "paragraph", "content": PARAGRAPH_DOC["content"]}
+    initial = {"type": "doc", "content": [stale, {"type": "paragraph"}]}
+    data = {"type": "doc", "content": [stale, *PARAGRAPH_DOC["content"]]}
+    form = ContentForm(data={"content": json.dumps(data)}, initial={"content": initial})
+
+    assert form.is_valid(), form.errors
+    assert form.cleaned_data["content"].doc == data
+
+
+def test_submitted_json_is_decoded_once(monkeypatch):
+    calls = []
+    codec = get_codec()
+    loads = codec.loads
+
+    def counting_loads(value):
+        calls.append(value)
+        return loads(value)
+
+    monkeypatch.setattr(codec, "loads", counting_loads)
+    form = ContentForm(
+        data={"content": json.dumps(PARAGRAPH_DOC)},
+        initial={"content": PARAGRAPH_DOC},
+    )
+
+    assert form.is_valid()
+    assert form.changed_data == []
+    assert calls == [json.dumps(PARAGRAPH_DOC)]
+
+
+@pytest.mark.django_db
+def test_model_form_reports_unchanged_documents():
+    instance = TestModel.objects.create(full_schema_nullable=PARAGRAPH_DOC)
+    data = {
+        "full_schema_with_default": json.dumps(instance.full_schema_with_default.doc),
+        "full_schema_nullable": json.dumps(PARAGRAPH_DOC),
+        "text_formatting_only": json.dumps(PARAGRAPH_DOC),
+    }
+
+    form = TestModelForm(data=data, instance=instance)
+
+    assert form.is_valid(), form.errors
+    # The other fields have callable defaults, so their initial value is taken from
+    # a hidden input that this data doesn't include
+    assert "full_schema_nullable" not in form.changed_data
@@ -0,0 +1,175 @@
+"""Tests for the shared rendered-HTML cache."""
+
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import override_settings
+
+import pytest
+from prosemirror import Schema
+
+from django_prosemirror import serde
+from django_prosemirror.cache import html_cache_key, shared_html_cache_stats
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.schema import NodeType
+from django_prosemirror.serde import doc_to_html, docs_to_html
+
+from .utils import doc, paragraph, text
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "prosemirror": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "prosemirror",
+    },
+}
+
+
+@pytest.fixture
+def schema():
+    return ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[]
+    ).schema
+
+
+@pytest.fixture
+def html_cache():
+    with override_settings(
+        CACHES=CACHES, DJANGO_PROSEMIRROR={"html_cache": "prosemirror"}
+    ):
+        cache = caches["prosemirror"]
+        cache.clear()
+        shared_html_cache_stats.reset()
+        yield cache
+        cache.clear()
+        shared_html_cache_stats.reset()
+
+
+@pytest.fixture
+def render_spy():
+    with patch.object(serde, "_render_html", wraps=serde._render_html) as spy:
+        yield spy
+
+
+class TestHtmlCacheKey:
+    def test_key_is_stable_for_equal_documents(self, schema):
+        doc1 = {"content": [], "type": "doc"}
+        doc2 = {"type": "doc", "content": []}
+
+        assert html_cache_key(doc1, schema) == html_cache_key(doc2, schema)
+
+    def test_key_ignores_empty_attrs_and_marks(self, schema):
+        value = doc(paragraph(text("a")))
+        value["content"][0]["attrs"] = {}
+        value["content"][0]["content"][0]["marks"] = []
+
+        assert html_cache_key(value, schema) == html_cache_key(
+            doc(paragraph(text("a"))), schema
+        )
+
+    def test_key_differs_for_different_content(self, schema):
+        assert html_cache_key(doc(paragraph(text("a"))), schema) != html_cache_key(
+            doc(paragraph(text("b"))), schema
+        )
+
+    def test_key_differs_for_different_tag_to_classes(self):
+        schema1 = ProsemirrorConfig().schema
+        schema2 = ProsemirrorConfig(tag_to_classes={"paragraph": "p"}).schema
+
+        assert html_cache_key(doc(paragraph(text("a"))), schema1) != html_cache_key(
+            doc(paragraph(text("a"))), schema2
+        )
+
+    def test_key_changes_with_version_setting(self, schema):
+        key = html_cache_key(doc(paragraph(text("a"))), schema)
+
+        with override_settings(DJANGO_PROSEMIRROR={"html_cache_version": 2}):
+            assert html_cache_key(doc(paragraph(text("a"))), schema) != key
+
+    def test_no_key_for_schema_without_fingerprint(self):
+        schema = Schema(
+            {"nodes": {"doc": {"content": "text*"}, "text": {}}, "marks": {}}
+        )
+
+        assert html_cache_key(doc(paragraph(text("a"))), schema) is None
+
+
+class TestDocToHtmlWithCache:
+    def test_cache_disabled_by_default(self, schema, render_spy):
+        doc_to_html(doc(paragraph(text("a"))), schema=schema)
+        doc_to_html(doc(paragraph(text("a"))), schema=schema)
+
+        assert render_spy.call_count == 2
+
+    def test_rendered_html_is_cached(self, schema, html_cache, render_spy):
+        assert doc_to_html(doc(paragraph(text("a"))), schema=schema) == "<p>a</p>"
+        assert doc_to_html(doc(paragraph(text("a"))), schema=schema) == "<p>a</p>"
+
+        assert render_spy.call_count == 1
+        assert (
+            html_cache.get(html_cache_key(doc(paragraph(text("a"))), schema))
+            == "<p>a</p>"
+        )
+        assert (shared_html_cache_stats.hits, shared_html_cache_stats.misses) == (1, 1)
+
+    def test_timeout_setting_is_used(self, schema, html_cache):
+        with (
+            override_settings(
+                DJANGO_PROSEMIRROR={
+                    "html_cache": "prosemirror",
+                    "html_cache_timeout": 5,
+                }
+            ),
+            patch.object(html_cache, "set") as mock_set,
+        ):
+            doc_to_html(doc(paragraph(text("a"))), schema=schema)
+
+        mock_set.assert_called_once_with(
+            html_cache_key(doc(paragraph(text("a"))), schema), "<p>a</p>", 5
+        )
+
+    def test_empty_documents_skip_cache(self, schema, html_cache):
+        assert doc_to_html(None, schema=schema) == ""
+        assert doc_to_html({}, schema=schema) == ""
+
+        assert shared_html_cache_stats.misses == 0
+
+
+class TestDocsToHtml:
+    def test_renders_documents_in_order(self, schema):
+        docs = [doc(paragraph(text("a"))), None, doc(paragraph(text("b"))), {}]
+
+        assert docs_to_html(docs, schema=schema) == ["<p>a</p>", "", "<p>b</p>", ""]
+
+    def test_uses_get_many_and_set_many(self, schema, html_cache, render_spy):
+        doc_to_html(doc(paragraph(text("a"))), schema=schema)
+        render_spy.reset_mock()
+
+        with (
+            patch.object(html_cache, "get_many", wraps=html_cache.get_many) as get_many,
+            patch.object(html_cache, "set_many", wraps=html_cache.set_many) as set_many,
+        ):
+            html = docs_to_html(
+                [
+                    doc(paragraph(text("a"))),
+                    doc(paragraph(text("b"))),
+                    doc(paragraph(text("b"))),
+                    doc(paragraph(text("c"))),
+                ],
+                schema=schema,
+            )
+
+        assert html == ["<p>a</p>", "<p>b</p>", "<p>b</p>", "<p>c</p>"]
+        get_many.assert_called_once()
+        set_many.assert_called_once()
+        assert set(set_many.call_args.args[0].values()) == {"<p>b</p>", "<p>c</p>"}
+        # "a" was cached, the duplicate "b" is rendered once
+        assert render_spy.call_count == 2
+
+    def test_results_are_served_from_cache(self, schema, html_cache, render_spy):
+        docs = [doc(paragraph(text("a"))), doc(paragraph(text("b")))]
+        docs_to_html(docs, schema=schema)
+        render_spy.reset_mock()
+
+        assert docs_to_html(docs, schema=schema) == ["<p>a</p>", "<p>b</p>"]
+        render_spy.assert_not_called()
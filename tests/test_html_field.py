@@ -0,0 +1,244 @@
+"""Tests for the denormalized rendered-HTML companion column (html_field)."""
+
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import models
+from django.db.models import signals
+from django.test.utils import isolate_apps
+
+import pytest
+
+from django_prosemirror.fields import ProsemirrorModelField
+from django_prosemirror.management.commands import prosemirror_backfill_html
+from django_prosemirror.migration_utils import (
+    backfill_prosemirror_html,
+    iter_drifted_prosemirror_html_rows,
+)
+from testapp.models import Article
+
+DOC = {
+    "type": "doc",
+    "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Hi"}]}],
+}
+OTHER_DOC = {
+    "type": "doc",
+    "content": [{"type": "heading", "content": [{"type": "text", "text": "Bye"}]}],
+}
+
+
+def _drift(article, html="<p>stale</p>"):
+    """Store outdated HTML; .update() bypasses the pre_save signal."""
+    Article.objects.filter(pk=article.pk).update(content_html=html)
+
+
+@pytest.mark.django_db
+class TestHtmlFieldSync:
+    def test_html_is_rendered_on_create(self):
+        article = Article.objects.create(content=DOC)
+
+        assert article.content_html == "<p>Hi</p>"
+        assert Article.objects.get().content_html == "<p>Hi</p>"
+
+    def test_html_is_rendered_on_save(self):
+        article = Article.objects.create(content=DOC)
+
+        article.content = OTHER_DOC
+        article.save()
+
+        assert Article.objects.get().content_html == "<h1>Bye</h1>"
+
+    def test_html_follows_document_mutations(self):
+        article = Article.objects.create(content=DOC)
+
+        article.content.doc = OTHER_DOC
+        article.save()
+
+        assert Article.objects.get().content_html == "<h1>Bye</h1>"
+
+    def test_empty_document_renders_empty_html(self):
+        article = Article.objects.create()
+
+        assert article.content_html == ""
+
+    def test_update_fields_without_html_field(self):
+        article = Article.objects.create(content=DOC)
+
+        article.content = OTHER_DOC
+        article.save(update_fields=["content"])
+
+        assert Article.objects.get().content_html == "<p>Hi</p>"
+
+    @isolate_apps("testapp")
+    def test_html_is_rendered_on_save_of_proxy(self):
+        class ProxyArticle(Article):
+            class Meta:
+                app_label = "testapp"
+                proxy = True
+
+        article = ProxyArticle.objects.create(content=DOC)
+
+        article.content = OTHER_DOC
+        article.save()
+
+        assert Article.objects.get().content_html == "<h1>Bye</h1>"
+
+    @isolate_apps("testapp")
+    def test_html_is_rendered_for_child_models(self):
+        class ChildArticle(Article):
+            class Meta:
+                app_label = "testapp"
+
+        article = ChildArticle(content=DOC)
+
+        signals.pre_save.send(sender=ChildArticle, instance=article)
+
+        assert article.content_html == "<p>Hi</p>"
+
+
+class TestHtmlFieldDefinition:
+    def test_deconstruct_includes_html_field(self):
+        field = Article._meta.get_field("content")
+
+        _, _, _, kwargs = field.deconstruct()
+
+        assert kwargs["html_field"] == "content_html"
+
+    def test_deconstruct_omits_unset_html_field(self):
+        _, _, _, kwargs = ProsemirrorModelField().deconstruct()
+
+        assert "html_field" not in kwargs
+
+    def test_check_passes_for_valid_html_field(self):
+        assert Article._meta.get_field("content").check() == []
+
+    @isolate_apps("testapp")
+    def test_check_nonexistent_html_field(self):
+        class MissingHtmlField(models.Model):  # noqa: DJ008
+            content = ProsemirrorModelField(html_field="missing")
+
+            class Meta:
+                app_label = "testapp"
+
+        errors = MissingHtmlField._meta.get_field("content").check()
+
+        assert [error.id for error in errors] == ["django_prosemirror.E001"]
+
+    @isolate_apps("testapp")
+    def test_check_html_field_must_be_text_field(self):
+        class WrongHtmlField(models.Model):  # noqa: DJ008
+            content = ProsemirrorModelField(html_field="content_html")
+            content_html = models.IntegerField(default=0)
+
+            class Meta:
+                app_label = "testapp"
+
+        errors = WrongHtmlField._meta.get_field("content").check()
+
+        assert [error.id for error in errors] == ["django_prosemirror.E002"]
+
+
+@pytest.mark.django_db
+class TestHtmlFieldBackfill:
+    def test_iter_drifted_rows(self):
+        current = Article.objects.create(content=DOC)
+        stale = Article.objects.create(content=DOC)
+        _drift(stale)
+
+        assert list(iter_drifted_prosemirror_html_rows(Article, "content")) == [
+            (stale.pk, "<p>Hi</p>")
+        ]
+        assert current.pk != stale.pk
+
+    def test_iter_drifted_rows_skips_corrupt_documents(self):
+        article = Article.objects.create(content=DOC)
+        Article.objects.filter(pk=article.pk).update(content="<p>Corrupt</p>")
+
+        assert list(iter_drifted_prosemirror_html_rows(Article, "content")) == []
+
+    def test_iter_drifted_rows_requires_html_field(self):
+        from testapp.models import TestModel
+
+        with pytest.raises(ValueError, match="no html_field"):
+            list(iter_drifted_prosemirror_html_rows(TestModel, "basic_text_only"))
+
+    def test_backfill_updates_only_drifted_rows(self):
+        articles = [Article.objects.create(content=DOC) for _ in range(5)]
+        for article in articles[1:]:
+            _drift(article)
+
+        assert backfill_prosemirror_html(Article, "content", batch_size=2) == 4
+        assert set(Article.objects.values_list("content_html", flat=True)) == {
+            "<p>Hi</p>"
+        }
+        assert backfill_prosemirror_html(Article, "content") == 0
+
+    def test_management_command(self):
+        article = Article.objects.create(content=DOC)
+        _drift(article)
+        out = StringIO()
+
+        call_command("prosemirror_backfill_html", stdout=out)
+
+        assert "testapp.Article.content: 1 row(s) updated in content_html" in (
+            out.getvalue()
+        )
+        assert Article.objects.get().content_html == "<p>Hi</p>"
+
+    def test_management_command_with_label(self):
+        article = Article.objects.create(content=DOC)
+        _drift(article)
+
+        call_command(
+            "prosemirror_backfill_html",
+            "testapp.Article.content",
+            "--batch-size=1",
+            stdout=StringIO(),
+        )
+
+        assert Article.objects.get().content_html == "<p>Hi</p>"
+
+    @isolate_apps("testapp")
+    def test_management_command_lists_each_field_once(self, monkeypatch):
+        class ProxyArticle(Article):
+            class Meta:
+                app_label = "testapp"
+                proxy = True
+
+        class ChildArticle(Article):
+            class Meta:
+                app_label = "testapp"
+
+        monkeypatch.setattr(
+            prosemirror_backfill_html.apps,
+            "get_models",
+            lambda: [Article, ProxyArticle, ChildArticle],
+        )
+
+        assert prosemirror_backfill_html.get_html_fields([]) == [
+            Article._meta.get_field("content")
+        ]
+
+    @pytest.mark.parametrize(
+        "label",
+        ["testapp.Article", "testapp.Missing.content", "testapp.TestModel.id"],
+    )
+    def test_management_command_rejects_invalid_labels(self, label):
+        with pytest.raises(CommandError):
+            call_command("prosemirror_backfill_html", label, stdout=StringIO())
+
+    def test_management_command_check(self):
+        article = Article.objects.create(content=DOC)
+        out = StringIO()
+
+        call_command("prosemirror_backfill_html", "--check", stdout=out)
+
+        assert "testapp.Article.content: 0 row(s) out of date" in out.getvalue()
+
+        _drift(article)
+        with pytest.raises(SystemExit) as exc_info:
+            call_command("prosemirror_backfill_html", "--check", stdout=out)
+
+        assert exc_info.value.code == 1
+        assert "testapp.Article.content: 1 row(s) out of date" in out.getvalue()
+        assert Article.objects.get().content_html == "<p>stale</p>"
@@ -0,0 +1,208 @@
+"""Tests for the bulk HTML import pipeline."""
+
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+
+import pytest
+
+from django_prosemirror.migration_utils import (
+    HTMLImportFailure,
+    import_prosemirror_html,
+    iter_html_column_rows,
+    iter_jsonl_html_rows,
+)
+from testapp.models import Article
+
+from .utils import doc, paragraph, text
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    def write(*rows):
+        path = tmp_path / "rows.jsonl"
+        path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+        return path
+
+    return write
+
+
+def create_articles(*html):
+    articles = [Article.objects.create() for _ in html]
+    for article, value in zip(articles, html, strict=True):
+        # .update() bypasses the pre_save signal that renders content_html
+        Article.objects.filter(pk=article.pk).update(content_html=value)
+    return [article.pk for article in articles]
+
+
+class TestRowSources:
+    def test_iter_jsonl_html_rows(self, jsonl_file):
+        path = jsonl_file({"pk": 1, "html": "<p>a</p>"}, {"pk": "x", "html": ""})
+
+        assert list(iter_jsonl_html_rows(path)) == [(1, "<p>a</p>"), ("x", "")]
+
+    def test_iter_jsonl_html_rows_skips_blank_lines(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_text('\n{"pk": 1, "html": "<p>a</p>"}\n\n')
+
+        assert list(iter_jsonl_html_rows(path)) == [(1, "<p>a</p>")]
+
+    @pytest.mark.parametrize("line", ["not json", '{"pk": 1}', "[1, 2]"])
+    def test_iter_jsonl_html_rows_rejects_invalid_lines(self, tmp_path, line):
+        path = tmp_path / "rows.jsonl"
+        path.write_text(f'{{"pk": 1, "html": ""}}\n{line}\n')
+
+        with pytest.raises(ValueError, match="line 2"):
+            list(iter_jsonl_html_rows(path))
+
+    @pytest.mark.django_db
+    def test_iter_html_column_rows(self):
+        pks = create_articles("<p>a</p>", "<p>b</p>")
+
+        assert list(iter_html_column_rows(Article, "content_html")) == [
+            (pks[0], "<p>a</p>"),
+            (pks[1], "<p>b</p>"),
+        ]
+        assert list(
+            iter_html_column_rows(
+                Article.objects.filter(pk=pks[1]), "content_html", chunk_size=1
+            )
+        ) == [(pks[1], "<p>b</p>")]
+
+
+@pytest.mark.django_db
+class TestImportProsemirrorHtml:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_imports_rows(self, workers):
+        pks = create_articles("<p>a</p>", "<p>b</p>", "<p>c</p>")
+
+        result = import_prosemirror_html(
+            Article,
+            "content",
+            iter_html_column_rows(Article, "content_html"),
+            batch_size=2,
+            workers=workers,
+        )
+
+        assert result.imported == 3
+        assert result.failures == []
+        for pk, value in zip(pks, "abc", strict=True):
+            article = Article.objects.get(pk=pk)
+            assert article.content.doc == doc(paragraph(text(value)))
+            assert article.content_html == f"<p>{value}</p>"
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_collects_failures(self, workers):
+        pks = create_articles("<p>a</p>", "<p>b</p>")
+        rows = [(pks[0], "<p>new</p>"), (pks[1], None)]
+
+        result = import_prosemirror_html(Article, "content", rows, workers=workers)
+
+        assert result.imported == 1
+        assert result.failures == [
+            HTMLImportFailure(
+                pks[1], "AttributeError: 'NoneType' object has no attribute 'strip'"
+            )
+        ]
+        assert Article.objects.get(pk=pks[0]).content.doc == doc(paragraph(text("new")))
+        assert Article.objects.get(pk=pks[1]).content_html == "<p>b</p>"
+
+    def test_reports_rows_without_pk(self):
+        (pk,) = create_articles("<p>a</p>")
+        rows = [(str(pk), "<p>new</p>"), (pk + 1, "<p>b</p>"), ("x", "<p>c</p>")]
+
+        result = import_prosemirror_html(Article, "content", rows, workers=1)
+
+        assert result.imported == 1
+        assert [failure.pk for failure in result.failures] == ["x", pk + 1]
+        assert result.failures[1].error == "No row with this pk"
+        assert Article.objects.get(pk=pk).content.doc == doc(paragraph(text("new")))
+
+    def test_stream_engine(self):
+        (pk,) = create_articles("<p>a<strong>b</strong></p>")
+
+        result = import_prosemirror_html(
+            Article,
+            "content",
+            iter_html_column_rows(Article, "content_html"),
+            workers=1,
+            engine="stream",
+        )
+
+        assert result.imported == 1
+        assert Article.objects.get(pk=pk).content_html == "<p>a<strong>b</strong></p>"
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"batch_size": 0}, {"workers": 0}], ids=["batch_size", "workers"]
+    )
+    def test_rejects_invalid_options(self, kwargs):
+        with pytest.raises(ValueError, match="must be positive"):
+            import_prosemirror_html(Article, "content", [], **kwargs)
+
+
+@pytest.mark.django_db
+class TestImportHtmlCommand:
+    def test_from_column(self):
+        pks = create_articles("<p>a</p>", "<p>b</p>")
+        out = StringIO()
+
+        call_command(
+            "prosemirror_import_html",
+            "testapp.Article.content",
+            "--from-column=content_html",
+            "--workers=1",
+            stdout=out,
+        )
+
+        assert "testapp.Article.content: 2 row(s) imported, 0 failed" in out.getvalue()
+        assert Article.objects.get(pk=pks[1]).content.doc == doc(paragraph(text("b")))
+
+    def test_from_jsonl_with_errors_file(self, jsonl_file, tmp_path):
+        pks = create_articles("<p>a</p>", "<p>b</p>")
+        path = jsonl_file(
+            {"pk": pks[0], "html": "<p>new</p>"}, {"pk": pks[1], "html": None}
+        )
+        errors_file = tmp_path / "errors.jsonl"
+        out, err = StringIO(), StringIO()
+
+        call_command(
+            "prosemirror_import_html",
+            "testapp.Article.content",
+            f"--jsonl={path}",
+            "--workers=1",
+            f"--errors-file={errors_file}",
+            stdout=out,
+            stderr=err,
+        )
+
+        assert "1 row(s) imported, 1 failed" in out.getvalue()
+        assert f"pk={pks[1]}: AttributeError" in err.getvalue()
+        assert [json.loads(line)["pk"] for line in errors_file.open()] == [pks[1]]
+        assert Article.objects.get(pk=pks[0]).content.doc == doc(paragraph(text("new")))
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["testapp.Article", "--from-column=content_html"],
+            ["testapp.Article.content_html", "--from-column=content_html"],
+            ["testapp.Article.content", "--from-column=missing"],
+            ["testapp.Article.content", "--from-column=content_html", "--workers=0"],
+        ],
+    )
+    def test_rejects_invalid_arguments(self, args):
+        with pytest.raises(CommandError):
+            call_command("prosemirror_import_html", *args, stdout=StringIO())
+
+    def test_reports_invalid_jsonl(self, tmp_path):
+        path = tmp_path / "rows.jsonl"
+        path.write_text("not json\n")
+
+        with pytest.raises(CommandError, match="line 1"):
+            call_command(
+                "prosemirror_import_html",
+                "testapp.Article.content",
+                f"--jsonl={path}",
+                "--workers=1",
+                stdout=StringIO(),
+            )
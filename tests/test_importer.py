@@ -0,0 +1,165 @@
+"""Equivalence tests for the streaming HTML importer."""
+
+from importlib.metadata import version
+
+import pytest
+from prosemirror import Schema
+
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.importer import get_importer
+from django_prosemirror.schema import MarkType, NodeType
+from django_prosemirror.serde import doc_to_html, html_to_doc
+
+from .serde_test_spec import SERDE_TEST_CASES
+
+# Inputs the DOMParser of prosemirror < 0.6 fails on or imports incorrectly
+dom_engine_bug = pytest.mark.skipif(
+    tuple(int(part) for part in version("prosemirror").split(".")[:2]) < (0, 6),
+    reason="The DOM engine of prosemirror < 0.6 handles this input incorrectly",
+)
+
+
+def assert_engines_equivalent(html, schema):
+    stream_doc = html_to_doc(html, schema=schema, engine="stream")
+    dom_doc = html_to_doc(html, schema=schema, engine="dom")
+
+    assert stream_doc == dom_doc
+    return stream_doc
+
+
+@pytest.mark.parametrize("test_case", SERDE_TEST_CASES, ids=lambda tc: tc.name)
+def test_stream_engine_matches_dom_engine_for_serde_spec(test_case):
+    if not test_case.round_trip_compatible:
+        pytest.skip(f"Skipping {test_case.name}: not round-trip compatible")
+
+    schema = ProsemirrorConfig(
+        allowed_node_types=test_case.config_node_types,
+        allowed_mark_types=test_case.config_mark_types,
+    ).schema
+
+    doc = assert_engines_equivalent(test_case.expected_html, schema)
+
+    assert doc == test_case.document
+
+
+def test_stream_engine_round_trips_full_document(full_document):
+    schema = ProsemirrorConfig().schema
+    html = doc_to_html(full_document, schema=schema)
+
+    assert assert_engines_equivalent(html, schema) == full_document
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        # Implied end tags
+        "<p>one<p>two<div>three</div>four</p>",
+        "<ul><li>one<li>two</ul><ol><li><p>three<li>four</ol>",
+        "<table><tr><td>a<td>b<tr><th>c</table>",
+        "<b>bold<p>paragraph</p>after</b>",
+        "<h1>title<p>text</h1>more",
+        # Stray and unclosed tags
+        "</p>text</em><strong>bold",
+        "<div><span>a<div>b</span>c</div>d</div>",
+        "<table><tr><td><div>a</td></tr></table>b",
+        # Text outside blocks, whitespace and line breaks
+        "loose text<p>  spaced \n\t text  </p>more <em> loose </em>",
+        "<p>line<br>  after break<br><br>end</p>",
+        "<p>line\nbreak</p>",
+        "<pre>  keep\n  this\r\n  </pre><p>a b</p>",
+        "<br><hr><br>text",
+        # Entities, attributes and styles
+        "<p>&lt;tag&gt; &amp; &copy; &#169; &#xa9;</p>",
+        pytest.param(
+            '<p><a href="https://example.com" title="t">link</a><a>bare</a></p>',
+            marks=dom_engine_bug,
+        ),
+        pytest.param(
+            '<p style="font-weight: bold">a '
+            '<span style="font-weight: 700">b</span></p>',
+            marks=dom_engine_bug,
+        ),
+        '<table><tr><td colspan="2" data-colwidth="10,20">a</td></tr></table>',
+        '<ol start="4"><li>four</li></ol><h3 class="x">h</h3>',
+        '<img src="/a.png" alt="a"><p>x<img src="/b.png">y</p>',
+        # Nested lists directly inside a list
+        "<ul><li>one</li><ul><li>nested</li></ul><li>two</li></ul>",
+        "<ol><li>a</li><ol><li>b</li></ol><ul><li>c</li></ul></ol>",
+        pytest.param("<ol><pre><li>a</li>b</pre><ol>c<hr></ol>", marks=dom_engine_bug),
+        "<ul><li>a</li>b<ul><li>c</li></ul>d<ul><li>e</li></ul>f<p>g</p>h</ul>",
+        pytest.param(
+            "<ol><li><!----></li>b<ul><li>c</li></ul></ol>", marks=dom_engine_bug
+        ),
+        pytest.param(
+            "<ul><li> </li><ul><li>nested</li></ul><li><!----></li><ul><li>x</ul></ul>",
+            marks=dom_engine_bug,
+        ),
+        # Ignored and unknown elements
+        "<p>a<script>var x = '<p>';</script>b<style>p {}</style>c</p>",
+        "<section><article><custom-element>text</custom-element></article></section>",
+        "<html><body><p>document</p></body></html>",
+        "<p><!---->a<!---->b</p>",
+    ],
+)
+def test_stream_engine_matches_dom_engine_for_messy_html(html):
+    assert_engines_equivalent(html, ProsemirrorConfig().schema)
+
+
+def test_stream_engine_ignores_comments():
+    # The DOM engine fails on comments with content
+    schema = ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[]
+    ).schema
+
+    doc = html_to_doc("<p>a<!-- comment -->b</p>", schema=schema, engine="stream")
+
+    assert doc == {
+        "type": "doc",
+        "content": [{"type": "paragraph", "content": [{"type": "text", "text": "ab"}]}],
+    }
+
+
+def test_stream_engine_accepts_empty_html():
+    schema = ProsemirrorConfig().schema
+
+    assert html_to_doc("  ", schema=schema, engine="stream") == html_to_doc(
+        "  ", schema=schema
+    )
+
+
+def test_importer_accepts_chunks():
+    schema = ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[MarkType.STRONG]
+    ).schema
+    html = "<p>first <strong>bold</strong></p><p>second &amp; last</p>"
+
+    chunks = [html[i : i + 3] for i in range(0, len(html), 3)]
+
+    assert get_importer(schema).parse(chunks) == get_importer(schema).parse(html)
+
+
+def test_get_importer_returns_same_importer_for_same_schema():
+    schema = ProsemirrorConfig().schema
+
+    assert get_importer(schema) is get_importer(schema)
+    assert get_importer(schema).schema is schema
+
+
+def test_get_importer_rejects_unsupported_parse_rules():
+    schema = Schema(
+        {
+            "nodes": {
+                "doc": {"content": "block+"},
+                "paragraph": {
+                    "content": "text*",
+                    "group": "block",
+                    "parseDOM": [{"tag": "div", "contentElement": "p"}],
+                },
+                "text": {},
+            },
+            "marks": {},
+        }
+    )
+
+    with pytest.raises(ValueError, match="not supported by the streaming importer"):
+        get_importer(schema)
@@ -0,0 +1,156 @@
+"""Tests for ProsemirrorModelField(lazy=True)."""
+
+import json
+import pickle
+from unittest.mock import patch
+
+from django.core import serializers
+from django.db import connection
+from django.forms import model_to_dict
+
+import pytest
+
+from django_prosemirror.codec import get_codec
+from django_prosemirror.fields import ProsemirrorModelField, _UndecodedJSON
+from django_prosemirror.migration_utils import iter_corrupt_prosemirror_rows
+from testapp.models import Article, TestModel
+
+DOC = {
+    "type": "doc",
+    "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Hi"}]}],
+}
+OTHER_DOC = {
+    "type": "doc",
+    "content": [{"type": "paragraph", "content": [{"type": "text", "text": "Bye"}]}],
+}
+
+
+@pytest.fixture
+def article():
+    return Article.objects.create(content=DOC)
+
+
+@pytest.fixture
+def codec():
+    return get_codec()
+
+
+@pytest.mark.django_db
+class TestLazyLoading:
+    def test_json_is_not_decoded_on_load(self, article, codec):
+        with patch.object(codec, "loads", wraps=codec.loads) as spy:
+            loaded = Article.objects.get(pk=article.pk)
+
+        spy.assert_not_called()
+        assert isinstance(loaded.__dict__["content"], _UndecodedJSON)
+
+    def test_json_is_decoded_once_on_first_access(self, article, codec):
+        loaded = Article.objects.get(pk=article.pk)
+
+        with patch.object(codec, "loads", wraps=codec.loads) as spy:
+            assert loaded.content.doc == DOC
+            assert loaded.content.html == "<p>Hi</p>"
+
+        spy.assert_called_once()
+        assert loaded.__dict__["content"] == DOC
+
+    def test_eager_field_decodes_on_load(self):
+        obj = TestModel.objects.create(full_schema_nullable=DOC)
+
+        loaded = TestModel.objects.get(pk=obj.pk)
+
+        assert loaded.__dict__["full_schema_nullable"] == DOC
+
+    def test_assigning_replaces_undecoded_json(self, article):
+        loaded = Article.objects.get(pk=article.pk)
+
+        loaded.content = OTHER_DOC
+        loaded.save()
+
+        assert Article.objects.get(pk=article.pk).content.doc == OTHER_DOC
+
+    def test_save_without_access_keeps_document(self, article):
+        loaded = Article.objects.get(pk=article.pk)
+
+        loaded.save()
+
+        assert Article.objects.get(pk=article.pk).content.doc == DOC
+        assert loaded.content_html == "<p>Hi</p>"
+
+    def test_refresh_from_db_updates_cached_document(self, article):
+        document = article.content
+        Article.objects.filter(pk=article.pk).update(content=OTHER_DOC)
+
+        article.refresh_from_db()
+
+        assert article.content is document
+        assert document.doc == OTHER_DOC
+
+    def test_value_from_object_decodes(self, article):
+        loaded = Article.objects.get(pk=article.pk)
+
+        assert model_to_dict(loaded)["content"] == DOC
+
+    def test_serializes_decoded_document(self, article):
+        loaded = Article.objects.get(pk=article.pk)
+
+        data = json.loads(serializers.serialize("json", [loaded]))
+
+        assert json.loads(data[0]["fields"]["content"]) == DOC
+
+    def test_pickles_undecoded_instance(self, article):
+        loaded = pickle.loads(pickle.dumps(Article.objects.get(pk=article.pk)))
+
+        assert loaded.content.doc == DOC
+
+    def test_null_is_loaded_as_none(self):
+        field = Article._meta.get_field("content")
+
+        assert field.from_db_value(None, None, connection) is None
+
+
+@pytest.mark.django_db
+class TestLazyValues:
+    def test_values_return_json(self, article):
+        value = Article.objects.values_list("content", flat=True).get()
+
+        assert isinstance(value, str)
+        assert Article._meta.get_field("content").to_python(value) == DOC
+
+    def test_key_transforms_are_decoded(self, article):
+        assert Article.objects.values_list("content__type", flat=True).get() == "doc"
+
+    def test_migration_utils_decode_values(self, article):
+        Article.objects.create(content=DOC)
+        Article.objects.filter(pk=article.pk).update(content=["not", "a", "doc"])
+
+        assert list(iter_corrupt_prosemirror_rows(Article, "content")) == [
+            (article.pk, ["not", "a", "doc"])
+        ]
+
+
+class TestFromDbValue:
+    @pytest.fixture
+    def field(self):
+        return ProsemirrorModelField(lazy=True)
+
+    def test_keeps_bytes_as_json(self, field):
+        value = field.from_db_value(json.dumps(DOC).encode(), None, connection)
+
+        assert isinstance(value, _UndecodedJSON)
+        assert field.to_python(value) == DOC
+
+    def test_passes_decoded_values_through(self, field):
+        assert field.from_db_value(DOC, None, connection) is DOC
+
+    def test_invalid_json_is_returned_as_string(self, field):
+        value = field.to_python(field.from_db_value("<p>", None, connection))
+
+        assert value == "<p>"
+        assert type(value) is str
+
+    def test_deconstruct(self, field):
+        _, _, _, kwargs = field.deconstruct()
+
+        assert kwargs["lazy"] is True
+        assert "lazy" not in ProsemirrorModelField().deconstruct()[3]
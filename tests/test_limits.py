@@ -0,0 +1,224 @@
+"""Tests for the resource limits on parsed and submitted documents."""
+
+import json
+
+from django.core.exceptions import ValidationError
+from django.test import override_settings
+
+import pytest
+
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.fields import ProsemirrorFormField
+from django_prosemirror.importer import get_importer
+from django_prosemirror.limits import DocumentLimits
+from django_prosemirror.schema import validate_doc
+from django_prosemirror.serde import html_to_doc
+from testapp.models import TestModel
+
+from .utils import paragraph, text
+
+
+def nested_blockquotes(depth):
+    node = paragraph(text("deep"))
+    for _ in range(depth):
+        node = {"type": "blockquote", "content": [node]}
+    return {"type": "doc", "content": [node]}
+
+
+def table(cells):
+    return {
+        "type": "doc",
+        "content": [
+            {
+                "type": "table",
+                "content": [
+                    {
+                        "type": "table_row",
+                        "content": [
+                            {"type": "table_cell", "content": [paragraph(text("c"))]}
+                            for _ in range(cells)
+                        ],
+                    }
+                ],
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def schema():
+    return ProsemirrorConfig().schema
+
+
+class TestDocumentLimits:
+    def test_from_settings_defaults_to_no_limits(self):
+        assert DocumentLimits.from_settings() == DocumentLimits()
+
+    def test_from_settings(self):
+        with override_settings(DJANGO_PROSEMIRROR={"max_depth": 5, "max_nodes": 10}):
+            assert DocumentLimits.from_settings() == DocumentLimits(
+                max_depth=5, max_nodes=10
+            )
+
+    @pytest.mark.parametrize(
+        ("value", "valid"),
+        [
+            ("a" * 8, True),
+            ("a" * 9, False),
+            ("é" * 4, True),
+            ("é" * 5, False),
+            (b"a" * 9, False),
+        ],
+    )
+    def test_check_input(self, value, valid):
+        limits = DocumentLimits(max_input_bytes=8)
+
+        if valid:
+            limits.check_input(value)
+        else:
+            with pytest.raises(ValidationError, match="maximum input size of 8 bytes"):
+                limits.check_input(value)
+
+    def test_check_doc_depth(self, schema):
+        # The paragraph is at depth 3 and its text at depth 4
+        DocumentLimits(max_depth=4).check_doc(nested_blockquotes(2), schema)
+
+        with pytest.raises(ValidationError, match="maximum nesting depth of 3"):
+            DocumentLimits(max_depth=3).check_doc(nested_blockquotes(2), schema)
+
+    def test_check_doc_nodes(self, schema):
+        doc = {"type": "doc", "content": [paragraph(text("a")), paragraph(text("b"))]}
+
+        DocumentLimits(max_nodes=4).check_doc(doc, schema)
+        with pytest.raises(ValidationError, match="maximum of 3 nodes"):
+            DocumentLimits(max_nodes=3).check_doc(doc, schema)
+
+    def test_check_doc_table_cells(self, schema):
+        DocumentLimits(max_table_cells=3).check_doc(table(3), schema)
+
+        with pytest.raises(ValidationError, match="maximum of 3 table cells"):
+            DocumentLimits(max_table_cells=3).check_doc(table(4), schema)
+
+    def test_check_doc_skips_malformed_content(self, schema):
+        doc = {"type": "doc", "content": ["text", {"type": ["x"]}, {"content": 1}]}
+
+        DocumentLimits(max_nodes=2).check_doc(doc, schema)
+
+    def test_counter_is_none_without_node_limits(self, schema):
+        assert DocumentLimits(max_input_bytes=10).counter(schema) is None
+
+
+class TestHtmlToDoc:
+    @pytest.mark.parametrize("engine", ["dom", "stream"])
+    @pytest.mark.parametrize(
+        ("limits", "message"),
+        [
+            (DocumentLimits(max_input_bytes=20), "maximum input size"),
+            (DocumentLimits(max_depth=3), "maximum nesting depth"),
+            (DocumentLimits(max_nodes=5), "maximum of 5 nodes"),
+            (DocumentLimits(max_table_cells=1), "maximum of 1 table cells"),
+        ],
+    )
+    def test_enforces_limits(self, schema, engine, limits, message):
+        html = (
+            "<blockquote><blockquote><p>a</p></blockquote></blockquote>"
+            "<table><tr><td>a</td><td>b</td></tr></table>"
+        )
+
+        with pytest.raises(ValidationError, match=message):
+            html_to_doc(html, schema=schema, engine=engine, limits=limits)
+
+    @pytest.mark.parametrize("engine", ["dom", "stream"])
+    def test_within_limits(self, schema, engine):
+        html = "<blockquote><p>a</p></blockquote><p>b</p>"
+        limits = DocumentLimits(
+            max_input_bytes=len(html), max_depth=3, max_nodes=5, max_table_cells=0
+        )
+
+        assert html_to_doc(html, schema=schema, engine=engine, limits=limits) == (
+            html_to_doc(html, schema=schema, engine=engine)
+        )
+
+    def test_stream_engine_stops_at_limit(self, schema):
+        importer = get_importer(schema)
+
+        def chunks():
+            yield "<p>a</p>" * 10
+            pytest.fail("Parsing continued after the limit was exceeded")
+
+        with pytest.raises(ValidationError, match="maximum of 5 nodes"):
+            importer.parse(chunks(), DocumentLimits(max_nodes=5))
+
+    def test_stream_engine_checks_size_of_chunks(self, schema):
+        importer = get_importer(schema)
+
+        with pytest.raises(ValidationError, match="maximum input size of 10 bytes"):
+            importer.parse(
+                ["<p>ab</p>", "<p>é</p>"], DocumentLimits(max_input_bytes=10)
+            )
+
+
+def test_validate_doc_enforces_limits(schema):
+    with pytest.raises(ValidationError, match="maximum nesting depth of 2"):
+        validate_doc(
+            nested_blockquotes(3), schema=schema, limits=DocumentLimits(max_depth=2)
+        )
+
+
+class TestSettings:
+    @pytest.fixture(autouse=True)
+    def limits(self, settings):
+        settings.DJANGO_PROSEMIRROR = {"max_input_bytes": 400, "max_nodes": 4}
+
+    def test_form_field_rejects_oversized_input(self):
+        field = ProsemirrorFormField()
+        doc = {"type": "doc", "content": [paragraph(text("a" * 400))]}
+
+        with pytest.raises(ValidationError, match="maximum input size"):
+            field.clean(json.dumps(doc))
+
+    def test_form_field_rejects_too_many_nodes(self):
+        field = ProsemirrorFormField()
+        doc = {
+            "type": "doc",
+            "content": [
+                paragraph(text("a")),
+                paragraph(text("b")),
+                paragraph(text("c")),
+            ],
+        }
+
+        with pytest.raises(ValidationError, match="maximum of 4 nodes"):
+            field.clean(json.dumps(doc))
+
+    def test_form_field_accepts_document_within_limits(self):
+        field = ProsemirrorFormField()
+        doc = {"type": "doc", "content": [paragraph(text("a")), paragraph(text("b"))]}
+
+        assert field.clean(json.dumps(doc)).doc == doc
+
+    def test_descriptor_rejects_html_exceeding_limits(self):
+        instance = TestModel()
+
+        with pytest.raises(ValidationError, match="maximum of 4 nodes"):
+            instance.full_schema_nullable = "<p>a</p><p>b</p><p>c</p>"
+
+        instance.full_schema_nullable = "<p>a</p><p>b</p>"
+        assert len(instance.full_schema_nullable.doc["content"]) == 2
+
+    def test_document_html_setter_rejects_html_exceeding_limits(self):
+        instance = TestModel()
+
+        with pytest.raises(ValidationError, match="maximum input size"):
+            instance.full_schema_nullable.html = "<p>" + "a" * 400 + "</p>"
+
+    def test_descriptor_accepts_dicts(self):
+        # Documents loaded from the database are not checked against the limits
+        instance = TestModel(
+            full_schema_nullable={
+                "type": "doc",
+                "content": [paragraph(text(str(i))) for i in range(5)],
+            }
+        )
+
+        assert len(instance.full_schema_nullable.doc["content"]) == 5
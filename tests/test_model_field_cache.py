@@ -1,4 +1,6 @@
+import copy
 import gc
+import pickle
 import weakref
 
 import pytest
@@ -151,58 +153,49 @@ class TestProsemirrorFieldCache:
         assert doc2.doc == another_document
 
     def test_cache_cleanup_for_saved_instances(self, test_document):
-        descriptor = TestModel.full_schema_with_default
-        initial_cache_size = len(descriptor._saved_instance_cache)
-
         # Create saved instance and access field to cache it
         instance = TestModel.objects.create(full_schema_with_default=test_document)
         doc = instance.full_schema_with_default
 
-        # Should be in cache
-        assert instance in descriptor._saved_instance_cache
-        assert len(descriptor._saved_instance_cache) == initial_cache_size + 1
-
-        # Create weak reference to verify instance deletion
+        # Create weak references to verify deletion
         instance_ref = weakref.ref(instance)
+        doc_ref = weakref.ref(doc)
 
         # Delete instance and document references
         del instance
         del doc
 
-        # Force garbage collection
-        gc.collect()
+        # There are no reference cycles, so both are freed right away
         assert instance_ref() is None, "Instance should be garbage collected"
-
-        # Cache should be cleaned up since WeakKeyDictionary removes dead references
-        assert len(descriptor._saved_instance_cache) == initial_cache_size
+        assert doc_ref() is None, "Document should be garbage collected"
 
     def test_cache_cleanup_for_unsaved_instances(self, test_document):
-        """Test that unsaved instance cache is cleaned up when instances are deleted."""
-        descriptor = TestModel.full_schema_with_default
-        initial_cache_size = len(descriptor._unsaved_instance_cache)
-
+        """Test that cached documents are freed when unsaved instances are deleted."""
         # Create unsaved instance and access field to cache it
         instance = TestModel(full_schema_with_default=test_document)
         doc = instance.full_schema_with_default
 
-        # Should be in cache
-        cache_key = descriptor._get_cache_key(instance)
-        assert cache_key in descriptor._unsaved_instance_cache
-        assert len(descriptor._unsaved_instance_cache) == initial_cache_size + 1
-
-        # Create weak reference to verify instance deletion
+        # Create weak references to verify deletion
         instance_ref = weakref.ref(instance)
+        doc_ref = weakref.ref(doc)
 
         # Delete instance and document references
         del instance
         del doc
 
-        # Force garbage collection - this should trigger weakref.finalize cleanup
-        gc.collect()
+        # There are no reference cycles, so both are freed right away
         assert instance_ref() is None, "Instance should be garbage collected"
+        assert doc_ref() is None, "Document should be garbage collected"
+
+    def test_document_outliving_instance_does_not_sync(self, test_document):
+        instance = TestModel(full_schema_with_default=test_document)
+        doc = instance.full_schema_with_default
+        del instance
+        gc.collect()
 
-        # Cache should be cleaned up since weakref.finalize removes the entry
-        assert len(descriptor._unsaved_instance_cache) == initial_cache_size
+        doc.html = "<p>Orphaned</p>"
+
+        assert doc.html == "<p>Orphaned</p>"
 
     def test_cache_saved_handles_none_values(self):
         instance = TestModel.objects.create(full_schema_nullable=None)
@@ -229,16 +222,10 @@ class TestProsemirrorFieldCache:
 
     def test_cache_across_save_boundary(self, test_document):
         """Test cache behavior when instance transitions from unsaved to saved."""
-        descriptor = TestModel.full_schema_with_default
-
         # Create unsaved instance
         unsaved = TestModel(full_schema_with_default=test_document)
         doc_before_save = unsaved.full_schema_with_default
 
-        # Should be in unsaved cache
-        unsaved_key = descriptor._get_cache_key(unsaved)
-        assert unsaved_key in descriptor._unsaved_instance_cache
-
         # Save the instance
         unsaved.save()
 
@@ -248,10 +235,6 @@ class TestProsemirrorFieldCache:
         # Should be same cached object
         assert doc_before_save is doc_after_save
 
-        # Should now be in saved cache
-        assert unsaved in descriptor._saved_instance_cache
-        # Note: may or may not be removed from unsaved cache immediately
-
     def test_multiple_field_descriptors_separate_caches(self, test_document):
         """Test that different field descriptors maintain separate caches."""
         full_schema_with_default_descriptor = TestModel.full_schema_with_default
@@ -270,9 +253,64 @@ class TestProsemirrorFieldCache:
         doc1 = instance.full_schema_with_default
         doc2 = instance.full_schema_nullable
 
-        # Should be in different caches
-        assert instance in full_schema_with_default_descriptor._saved_instance_cache
-        assert instance in full_schema_nullable_descriptor._saved_instance_cache
-
-        # But the cached documents should be different objects
+        # The cached documents should be different objects
         assert doc1 is not doc2
+        assert instance.full_schema_with_default is doc1
+        assert instance.full_schema_nullable is doc2
+
+    def test_instances_of_same_row_have_separate_documents(self, test_document):
+        instance = TestModel.objects.create(full_schema_with_default=test_document)
+        loaded1 = TestModel.objects.get(pk=instance.pk)
+        loaded2 = TestModel.objects.get(pk=instance.pk)
+
+        loaded1.full_schema_with_default.html = "<p>Changed</p>"
+
+        assert loaded1.full_schema_with_default is not loaded2.full_schema_with_default
+        assert loaded2.full_schema_with_default.doc == test_document
+
+    def test_copied_instance_has_own_document(self, test_document):
+        instance = TestModel.objects.create(full_schema_with_default=test_document)
+        doc = instance.full_schema_with_default
+
+        copied = copy.copy(instance)
+        copied.full_schema_with_default.html = "<p>Copy</p>"
+
+        assert copied.full_schema_with_default is not doc
+        assert copied.__dict__["full_schema_with_default"] != test_document
+        assert instance.full_schema_with_default is doc
+        assert doc.doc == test_document
+
+    def test_pickled_instance_has_own_document(self, test_document):
+        instance = TestModel.objects.create(full_schema_with_default=test_document)
+        instance.full_schema_with_default  # noqa: B018
+
+        restored = pickle.loads(pickle.dumps(instance))
+
+        doc = restored.full_schema_with_default
+        assert doc.doc == test_document
+        assert restored.full_schema_with_default is doc
+        doc.html = "<p>Restored</p>"
+        assert restored.__dict__["full_schema_with_default"] == doc.doc
+
+    def test_cached_html_invalidated_on_external_change(self, test_document):
+        instance = TestModel.objects.create(full_schema_with_default=test_document)
+        doc = instance.full_schema_with_default
+        assert doc.html == "<p>Test content</p>"
+
+        instance.__dict__["full_schema_with_default"] = {
+            "type": "doc",
+            "content": [
+                {"type": "paragraph", "content": [{"type": "text", "text": "New"}]}
+            ],
+        }
+
+        assert instance.full_schema_with_default.html == "<p>New</p>"
+
+    def test_cached_html_invalidated_on_assignment(self, test_document):
+        instance = TestModel.objects.create(full_schema_with_default=test_document)
+        doc = instance.full_schema_with_default
+        assert doc.html == "<p>Test content</p>"
+
+        instance.full_schema_with_default = "<p>Assigned</p>"
+
+        assert doc.html == "<p>Assigned</p>"
@@ -1,11 +1,17 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from django.utils.safestring import SafeString
 
+import pytest
+
+from django_prosemirror.cache import doc_hash
 from django_prosemirror.config import ProsemirrorConfig
 from django_prosemirror.constants import get_empty_doc
 from django_prosemirror.fields import ProsemirrorFieldDocument
 from django_prosemirror.schema import NodeType
+from django_prosemirror.serde import doc_to_html
+
+from .utils import doc, paragraph, text
 
 
 class TestProsemirrorFieldDocument:
@@ -139,6 +145,15 @@ class TestProsemirrorFieldDocument:
         assert restored_doc.doc == doc_data, "Reconstructed doc should match original"
         assert restored_doc._sync_callback is None, "Callback should not be preserved"
 
+    def test_has_no_instance_dict(self):
+        doc = ProsemirrorFieldDocument(
+            {"type": "doc", "content": []}, schema=ProsemirrorConfig().schema
+        )
+
+        assert not hasattr(doc, "__dict__")
+        with pytest.raises(AttributeError):
+            doc.unknown_attribute = 1
+
     def test_clear_document_handling(self):
         config = ProsemirrorConfig(
             allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[]
@@ -515,3 +530,181 @@ class TestProsemirrorFieldDocument:
         doc.doc = new_data
 
         assert doc.doc == new_data
+
+
+class TestProsemirrorFieldDocumentHtmlCache:
+    @pytest.fixture
+    def document(self):
+        config = ProsemirrorConfig(
+            allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[]
+        )
+        return ProsemirrorFieldDocument(
+            doc(paragraph(text("Hello"))), schema=config.schema
+        )
+
+    @pytest.fixture
+    def stats(self):
+        stats = ProsemirrorFieldDocument.html_cache_stats
+        stats.reset()
+        yield stats
+        stats.reset()
+
+    def test_html_is_rendered_once(self, document, stats):
+        with patch(
+            "django_prosemirror.fields.doc_to_html", wraps=doc_to_html
+        ) as mock_doc_to_html:
+            assert document.html == "<p>Hello</p>"
+            assert str(document) == "<p>Hello</p>"
+            assert document.safe_html == "<p>Hello</p>"
+
+        mock_doc_to_html.assert_called_once()
+        assert stats.misses == 1
+        assert stats.hits == 2
+        assert stats.hit_rate == pytest.approx(2 / 3)
+
+    @pytest.mark.parametrize(
+        "mutate,expected_html",
+        [
+            (
+                lambda document: setattr(document, "doc", doc(paragraph(text("New")))),
+                "<p>New</p>",
+            ),
+            (
+                lambda document: setattr(
+                    document, "raw_data", doc(paragraph(text("New")))
+                ),
+                "<p>New</p>",
+            ),
+            (lambda document: setattr(document, "html", "<p>New</p>"), "<p>New</p>"),
+            (lambda document: document.clear(), ""),
+            (lambda document: document.nullify(), ""),
+        ],
+        ids=["doc", "raw_data", "html", "clear", "nullify"],
+    )
+    def test_mutations_invalidate_cached_html(self, document, mutate, expected_html):
+        assert document.html == "<p>Hello</p>"
+
+        mutate(document)
+
+        assert document.html == expected_html
+
+    def test_stats_reset(self, document, stats):
+        document.html  # noqa: B018
+        document.html  # noqa: B018
+
+        stats.reset()
+
+        assert (stats.hits, stats.misses, stats.hit_rate) == (0, 0, 0.0)
+
+    def test_iter_html_does_not_cache(self, document):
+        with patch(
+            "django_prosemirror.fields.doc_to_html", wraps=doc_to_html
+        ) as mock_doc_to_html:
+            assert list(document.iter_html()) == ["<p>Hello</p>"]
+
+        mock_doc_to_html.assert_not_called()
+        assert document._html is None
+
+    def test_iter_html_uses_cached_html(self, document, stats):
+        document.html  # noqa: B018
+
+        with patch("django_prosemirror.fields.iter_doc_html") as mock_iter_doc_html:
+            assert list(document.iter_html()) == ["<p>Hello</p>"]
+
+        mock_iter_doc_html.assert_not_called()
+        assert stats.hits == 1
+
+
+class TestProsemirrorFieldDocumentContentHash:
+    @pytest.fixture
+    def document(self):
+        return ProsemirrorFieldDocument(
+            doc(paragraph(text("Hello"))), schema=ProsemirrorConfig().schema
+        )
+
+    def test_content_hash_matches_doc_hash(self, document):
+        assert document.content_hash == doc_hash(
+            doc(paragraph(text("Hello"))), document.schema
+        )
+
+    def test_content_hash_is_computed_once(self, document):
+        with patch(
+            "django_prosemirror.fields.doc_hash", wraps=doc_hash
+        ) as mock_doc_hash:
+            assert document.content_hash == document.content_hash
+
+        mock_doc_hash.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "mutate",
+        [
+            lambda document: setattr(document, "doc", doc(paragraph(text("New")))),
+            lambda document: setattr(document, "html", "<p>New</p>"),
+            lambda document: document.clear(),
+        ],
+        ids=["doc", "html", "clear"],
+    )
+    def test_mutations_invalidate_content_hash(self, document, mutate):
+        content_hash = document.content_hash
+
+        mutate(document)
+
+        assert document.content_hash != content_hash
+        assert document.content_hash == doc_hash(document.doc, document.schema)
+
+    def test_content_hash_of_none_document(self, document):
+        document.nullify()
+
+        assert document.content_hash is None
+
+
+class TestProsemirrorFieldDocumentPagination:
+    @pytest.fixture
+    def document(self):
+        config = ProsemirrorConfig(
+            allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[]
+        )
+        value = doc(
+            paragraph(text("one two")),
+            paragraph(text("three four")),
+            paragraph(text("five")),
+            paragraph(text("six seven eight")),
+        )
+        return ProsemirrorFieldDocument(value, schema=config.schema)
+
+    def test_render_blocks(self, document):
+        assert document.render_blocks(1, 3) == "<p>three four</p><p>five</p>"
+        assert document.render_blocks(3) == "<p>six seven eight</p>"
+
+    def test_block_index(self, document):
+        assert [
+            (entry.word_offset, entry.word_count) for entry in document.block_index
+        ] == [
+            (0, 2),
+            (2, 2),
+            (4, 1),
+            (5, 3),
+        ]
+
+    def test_block_index_is_cached_until_document_changes(self, document):
+        assert document.block_index is document.block_index
+
+        document.doc = doc(paragraph(text("new")))
+
+        assert [entry.word_count for entry in document.block_index] == [1]
+
+    def test_pages(self, document):
+        pages = document.pages(words_per_page=4)
+
+        assert pages == [(0, 2), (2, 4)]
+        assert [document.render_blocks(*page) for page in pages] == [
+            "<p>one two</p><p>three four</p>",
+            "<p>five</p><p>six seven eight</p>",
+        ]
+
+    def test_empty_document(self):
+        doc = ProsemirrorFieldDocument(None, schema=ProsemirrorConfig().schema)
+
+        assert doc.block_index == []
+        assert doc.pages(100) == []
+        assert doc.render_blocks(0, 1) == ""
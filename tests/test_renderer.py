@@ -0,0 +1,355 @@
+"""Equivalence tests for the direct dict-to-HTML renderer."""
+
+import pytest
+
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.renderer import get_renderer
+from django_prosemirror.schema import MarkType, NodeType
+from django_prosemirror.serde import doc_blocks_to_html, doc_to_html, iter_doc_html
+
+from .serde_test_spec import SERDE_TEST_CASES
+from .utils import doc, paragraph, text
+
+
+def assert_engines_equivalent(document, schema):
+    direct_html = doc_to_html(document, schema=schema, engine="direct")
+    dom_html = doc_to_html(document, schema=schema, engine="dom")
+
+    assert direct_html == dom_html
+    return direct_html
+
+
+def link(href, title=None):
+    return {"type": "link", "attrs": {"href": href, "title": title}}
+
+
+@pytest.mark.parametrize("test_case", SERDE_TEST_CASES, ids=lambda tc: tc.name)
+def test_direct_engine_matches_dom_engine_for_serde_spec(test_case):
+    schema = ProsemirrorConfig(
+        allowed_node_types=test_case.config_node_types,
+        allowed_mark_types=test_case.config_mark_types,
+    ).schema
+
+    html = assert_engines_equivalent(test_case.document, schema)
+
+    assert html == test_case.expected_html
+
+
+def test_direct_engine_matches_dom_engine_for_full_document(full_document):
+    assert_engines_equivalent(full_document, ProsemirrorConfig().schema)
+
+
+def test_direct_engine_matches_dom_engine_with_tag_to_classes(full_document):
+    config = ProsemirrorConfig(
+        tag_to_classes={
+            node_or_mark: f"{node_or_mark}-class"
+            for node_or_mark in ProsemirrorConfig().all_schema_types
+        }
+    )
+
+    html = assert_engines_equivalent(full_document, config.schema)
+
+    assert '<h1 class="heading-class-1">' in html
+    assert '<table class="table-class"><tbody>' in html
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        # Marks spanning several text nodes are kept open
+        doc(
+            paragraph(
+                text("a", {"type": "strong"}),
+                text("b", {"type": "strong"}, {"type": "em"}),
+                text("c", {"type": "em"}),
+                text("d", {"type": "strong"}),
+            )
+        ),
+        # Marks given out of schema order are sorted by rank
+        doc(paragraph(text("a", {"type": "em"}, {"type": "strong"}))),
+        doc(
+            paragraph(
+                text("a", {"type": "strong"}, {"type": "em"}),
+                text("b", {"type": "em"}, {"type": "strong"}),
+            )
+        ),
+        # Adjacent marks of the same type with different attrs are not merged
+        doc(
+            paragraph(
+                text("one", link("https://example.com/1")),
+                text("two", link("https://example.com/2", "Two")),
+                text("three", link("https://example.com/2", "Two")),
+            )
+        ),
+        # Link marks without explicit title get the default attr
+        doc(paragraph(text("x", {"type": "link", "attrs": {"href": "/x"}}))),
+        # Escaping of text and attribute values
+        doc(
+            paragraph(
+                text("<script>alert('x') & \"y\"</script>"),
+                text("q", link('https://example.com/?a=1&b="2"', "<b>")),
+            )
+        ),
+        # Attribute values containing NUL characters
+        doc(paragraph(text("q", link("https://example.com/\x00", "a\x00b")))),
+        # Marked inline leaf nodes
+        doc(
+            paragraph(
+                text("a", {"type": "strong"}),
+                {"type": "hard_break", "marks": [{"type": "strong"}]},
+                text("b", {"type": "strong"}),
+            )
+        ),
+        # Unsupported attrs are ignored
+        {
+            "type": "doc",
+            "content": [
+                {
+                    "type": "heading",
+                    "attrs": {"level": 3, "unknown": "x"},
+                    "content": [text("Title")],
+                }
+            ],
+        },
+        # Attr values that are equal but of different types
+        {
+            "type": "doc",
+            "content": [
+                {"type": "heading", "attrs": {"level": level}, "content": [text("T")]}
+                for level in (True, 1, 1.0)
+            ],
+        },
+        # Headings fall back to the default level
+        {"type": "doc", "content": [{"type": "heading", "content": [text("T")]}]},
+        # Unhashable attr values
+        {
+            "type": "doc",
+            "content": [
+                {
+                    "type": "table",
+                    "content": [
+                        {
+                            "type": "table_row",
+                            "content": [
+                                {
+                                    "type": "table_cell",
+                                    "attrs": {"colspan": 2, "colwidth": [100, 50]},
+                                    "content": [{"type": "paragraph"}],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        },
+        # Empty content
+        {"type": "doc", "content": []},
+        {"type": "doc", "content": [{"type": "paragraph", "content": []}]},
+    ],
+)
+def test_direct_engine_matches_dom_engine_for_edge_cases(document):
+    assert_engines_equivalent(document, ProsemirrorConfig().schema)
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"type": "doc", "content": [{"type": "unknown"}]},
+        {"type": "doc", "content": "not a list"},
+        {"type": "doc", "content": [{}]},
+        doc(paragraph({"type": "text", "text": ""})),
+        doc(paragraph({"type": "text"})),
+        doc(paragraph(text("x", {"type": "unknown"}))),
+        doc(paragraph(text("x", {"type": "link"}))),
+        {"type": "doc", "content": [{"type": "paragraph", "marks": "strong"}]},
+    ],
+)
+def test_direct_engine_rejects_invalid_documents_like_dom_engine(document):
+    schema = ProsemirrorConfig().schema
+
+    with pytest.raises((ValueError, KeyError)):
+        doc_to_html(document, schema=schema, engine="dom")
+    with pytest.raises((ValueError, KeyError)):
+        doc_to_html(document, schema=schema, engine="direct")
+
+
+def test_direct_engine_rejects_types_not_in_schema():
+    schema = ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[MarkType.STRONG]
+    ).schema
+
+    with pytest.raises(ValueError):
+        doc_to_html(doc(paragraph(text("x", {"type": "em"}))), schema=schema)
+
+
+def test_get_renderer_returns_same_renderer_for_same_schema():
+    schema = ProsemirrorConfig().schema
+
+    assert get_renderer(schema) is get_renderer(schema)
+
+
+def test_templates_are_reused(full_document):
+    schema = ProsemirrorConfig().schema
+    renderer = get_renderer(schema)
+
+    renderer.render(full_document)
+    template_count = len(renderer._templates)
+    renderer.render(full_document)
+
+    assert len(renderer._templates) == template_count
+
+
+@pytest.mark.parametrize("test_case", SERDE_TEST_CASES, ids=lambda tc: tc.name)
+def test_iter_doc_html_matches_doc_to_html_for_serde_spec(test_case):
+    schema = ProsemirrorConfig(
+        allowed_node_types=test_case.config_node_types,
+        allowed_mark_types=test_case.config_mark_types,
+    ).schema
+
+    html = "".join(iter_doc_html(test_case.document, schema=schema))
+
+    assert html == doc_to_html(test_case.document, schema=schema)
+
+
+def test_iter_doc_html_yields_one_chunk_per_block(full_document):
+    schema = ProsemirrorConfig().schema
+
+    chunks = list(iter_doc_html(full_document, schema=schema))
+
+    assert len(chunks) == len(full_document["content"])
+    assert "".join(chunks) == doc_to_html(full_document, schema=schema)
+
+
+def test_iter_doc_html_closes_marks_spanning_blocks():
+    schema = ProsemirrorConfig().schema
+    document = doc(
+        paragraph(text("a", {"type": "strong"}), text("b", {"type": "strong"}))
+    )
+    # Inline content at the top level, so marks stay open across chunks
+    fragment = {"type": "paragraph", "content": document["content"][0]["content"]}
+
+    chunks = list(iter_doc_html(fragment, schema=schema))
+
+    assert chunks == ["<strong>a", "b", "</strong>"]
+    assert "".join(chunks) == doc_to_html(fragment, schema=schema)
+
+
+@pytest.mark.parametrize("document", [None, {}, {"type": "doc", "content": []}])
+def test_iter_doc_html_empty_documents(document):
+    assert list(iter_doc_html(document, schema=ProsemirrorConfig().schema)) == []
+
+
+def test_iter_doc_html_renders_lazily():
+    schema = ProsemirrorConfig().schema
+    document = {
+        "type": "doc",
+        "content": [paragraph(text("ok")), {"type": "unknown"}],
+    }
+
+    chunks = iter_doc_html(document, schema=schema)
+
+    assert next(chunks) == "<p>ok</p>"
+    with pytest.raises(ValueError):
+        next(chunks)
+
+
+class TestExcerpt:
+    @pytest.fixture
+    def schema(self):
+        return ProsemirrorConfig().schema
+
+    def test_excerpt_of_short_document_is_full_html(self, schema, full_document):
+        html = doc_to_html(full_document, schema=schema, max_chars=100_000)
+
+        assert html == doc_to_html(full_document, schema=schema)
+
+    def test_text_is_cut_at_word_boundary(self, schema):
+        document = doc(paragraph(text("Hello brave new world")))
+
+        assert (
+            doc_to_html(document, schema=schema, max_chars=13) == "<p>Hello brave</p>"
+        )
+
+    def test_word_longer_than_budget_is_cut(self, schema):
+        document = doc(paragraph(text("Supercalifragilistic")))
+
+        assert doc_to_html(document, schema=schema, max_chars=5) == "<p>Super</p>"
+
+    def test_open_marks_and_nodes_are_closed(self, schema):
+        document = {
+            "type": "doc",
+            "content": [
+                {
+                    "type": "bullet_list",
+                    "content": [
+                        {
+                            "type": "list_item",
+                            "content": [
+                                paragraph(
+                                    text("one ", {"type": "strong"}),
+                                    text("two three", {"type": "strong"}, link("/x")),
+                                )
+                            ],
+                        },
+                        {
+                            "type": "list_item",
+                            "content": [paragraph(text("four"))],
+                        },
+                    ],
+                }
+            ],
+        }
+
+        html = doc_to_html(document, schema=schema, max_chars=7)
+
+        assert html == (
+            '<ul><li><p><strong>one <a href="/x">two</a></strong></p></li></ul>'
+        )
+
+    def test_rest_of_document_is_not_visited(self, schema):
+        document = {
+            "type": "doc",
+            "content": [
+                paragraph(text("Intro")),
+                {"type": "unknown"},
+            ],
+        }
+
+        assert doc_to_html(document, schema=schema, max_chars=5) == "<p>Intro</p>"
+        with pytest.raises(ValueError):
+            doc_to_html(document, schema=schema, max_chars=6)
+
+    def test_zero_budget(self, schema):
+        assert doc_to_html(doc(paragraph(text("a"))), schema=schema, max_chars=0) == ""
+
+    def test_negative_budget(self, schema):
+        with pytest.raises(ValueError, match="must not be negative"):
+            doc_to_html(doc(paragraph(text("a"))), schema=schema, max_chars=-1)
+
+    def test_dom_engine_is_not_supported(self, schema):
+        with pytest.raises(ValueError, match="direct"):
+            doc_to_html(
+                doc(paragraph(text("a"))), schema=schema, engine="dom", max_chars=1
+            )
+
+
+def test_doc_blocks_to_html(full_document):
+    schema = ProsemirrorConfig().schema
+    chunks = list(iter_doc_html(full_document, schema=schema))
+
+    assert doc_blocks_to_html(full_document, schema=schema, start=2, stop=5) == (
+        "".join(chunks[2:5])
+    )
+    assert doc_blocks_to_html(full_document, schema=schema, start=-1) == chunks[-1]
+    assert doc_blocks_to_html(full_document, schema=schema) == "".join(chunks)
+    assert doc_blocks_to_html(None, schema=schema, start=1) == ""
+
+
+def test_doc_blocks_to_html_does_not_visit_other_blocks():
+    schema = ProsemirrorConfig().schema
+    document = {
+        "type": "doc",
+        "content": [{"type": "unknown"}, paragraph(text("ok"))],
+    }
+
+    assert doc_blocks_to_html(document, schema=schema, start=1) == "<p>ok</p>"
@@ -1,11 +1,18 @@
 """Tests for serialization and deserialization functions."""
 
 import pytest
+from prosemirror.model import DOMParser, DOMSerializer
 
 from django_prosemirror.config import ProsemirrorConfig
 from django_prosemirror.constants import get_empty_doc
 from django_prosemirror.schema import MarkType, NodeType
-from django_prosemirror.serde import doc_to_html, html_to_doc
+from django_prosemirror.serde import (
+    _clean_empty_attrs,
+    doc_to_html,
+    get_parser,
+    get_serializer,
+    html_to_doc,
+)
 
 from .serde_test_spec import SERDE_TEST_CASES
 
@@ -177,3 +184,202 @@ def test_empty_or_whitespace_string_produces_empty_document(input_html):
     doc = html_to_doc(input_html, schema=schema)
 
     assert doc == get_empty_doc()
+
+
+def test_get_serializer_returns_same_serializer_for_same_schema():
+    schema = ProsemirrorConfig().schema
+
+    assert get_serializer(schema) is get_serializer(schema)
+
+
+def test_get_serializer_returns_different_serializer_for_different_schema():
+    schema1 = ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[]
+    ).schema
+    schema2 = ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[MarkType.STRONG]
+    ).schema
+
+    assert get_serializer(schema1) is not get_serializer(schema2)
+    assert set(get_serializer(schema1).marks) == set()
+    assert set(get_serializer(schema2).marks) == {"strong"}
+
+
+def test_get_serializer_caches_serializer_on_older_prosemirror(monkeypatch):
+    # Before 0.6, DOMSerializer.from_schema() compiled a new serializer every time
+    schema = ProsemirrorConfig().schema
+    monkeypatch.delitem(schema.cached, "domSerializer", raising=False)
+    monkeypatch.setattr(
+        DOMSerializer,
+        "from_schema",
+        classmethod(
+            lambda cls, schema: cls(
+                cls.nodes_from_schema(schema), cls.marks_from_schema(schema)
+            )
+        ),
+    )
+
+    assert get_serializer(schema) is get_serializer(schema)
+
+
+def test_doc_to_html_does_not_rebuild_serializer(monkeypatch, full_document):
+    schema = ProsemirrorConfig().schema
+    get_serializer(schema)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("serializer should not be rebuilt")
+
+    monkeypatch.setattr(DOMSerializer, "nodes_from_schema", fail)
+    monkeypatch.setattr(DOMSerializer, "marks_from_schema", fail)
+
+    assert doc_to_html(full_document, schema=schema)
+
+
+def test_get_parser_returns_same_parser_for_same_schema():
+    schema = ProsemirrorConfig().schema
+
+    assert get_parser(schema) is get_parser(schema)
+
+
+def test_get_parser_returns_different_parser_for_different_schema():
+    schema1 = ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[]
+    ).schema
+    schema2 = ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[MarkType.STRONG]
+    ).schema
+
+    assert get_parser(schema1) is not get_parser(schema2)
+    assert get_parser(schema1).schema is schema1
+
+
+def test_html_to_doc_does_not_rebuild_parse_rules(monkeypatch):
+    schema = ProsemirrorConfig().schema
+    get_parser(schema)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parse rules should not be rebuilt")
+
+    monkeypatch.setattr(DOMParser, "schema_rules", fail)
+
+    assert html_to_doc('<p><a href="/x">link</a></p>', schema=schema)
+
+
+@pytest.mark.parametrize("engine", ["dom", "stream"])
+@pytest.mark.parametrize("white_space", ["pre-wrap", "pre"])
+def test_html_to_doc_imports_newlines_of_preserved_whitespace_as_spaces(
+    engine, white_space
+):
+    # Newlines are not imported as hard breaks, the schema has no
+    # linebreakReplacement node
+    html = f'<p style="white-space: {white_space}">line one\nline two</p>'
+
+    doc = html_to_doc(html, schema=ProsemirrorConfig().schema, engine=engine)
+
+    assert doc == {
+        "type": "doc",
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [{"type": "text", "text": "line one line two"}],
+            }
+        ],
+    }
+
+
+def make_raw_doc():
+    # As produced by prosemirror's Node.to_json before cleaning
+    return {
+        "type": "doc",
+        "content": [
+            {
+                "type": "paragraph",
+                "content": [
+                    {
+                        "type": "text",
+                        "marks": [
+                            {"type": "strong", "attrs": {}},
+                            {"type": "link", "attrs": {"href": "/x", "title": None}},
+                        ],
+                        "text": "link",
+                    },
+                    {
+                        "type": "filer_image",
+                        "attrs": {
+                            "src": "/a.png",
+                            "alt": "",
+                            "title": None,
+                            "imageId": None,
+                            "caption": "",
+                        },
+                    },
+                ],
+            },
+            {
+                "type": "code_block",
+                "content": [
+                    {
+                        "type": "text",
+                        "marks": [{"type": "strong", "attrs": {}}],
+                        "text": "x",
+                    }
+                ],
+            },
+            {"type": "heading", "attrs": {"level": 1}},
+        ],
+    }
+
+
+CLEANED_DOC = {
+    "type": "doc",
+    "content": [
+        {
+            "type": "paragraph",
+            "content": [
+                {
+                    "type": "text",
+                    "marks": [
+                        {"type": "strong"},
+                        {"type": "link", "attrs": {"href": "/x", "title": None}},
+                    ],
+                    "text": "link",
+                },
+                {"type": "filer_image", "attrs": {"src": "/a.png"}},
+            ],
+        },
+        {"type": "code_block", "content": [{"type": "text", "text": "x"}]},
+        # Only node types with stripDefaultAttrs lose their default attributes
+        {"type": "heading", "attrs": {"level": 1}},
+    ],
+}
+
+
+def test_clean_empty_attrs_copies_changed_nodes_only():
+    schema = ProsemirrorConfig().schema
+    doc = make_raw_doc()
+
+    cleaned = _clean_empty_attrs(doc, schema)
+
+    assert cleaned == CLEANED_DOC
+    assert doc == make_raw_doc()
+    assert cleaned["content"][2] is doc["content"][2]
+
+
+def test_clean_empty_attrs_in_place():
+    schema = ProsemirrorConfig().schema
+    doc = make_raw_doc()
+
+    cleaned = _clean_empty_attrs(doc, schema, in_place=True)
+
+    assert cleaned is doc
+    assert doc == CLEANED_DOC
+
+
+@pytest.mark.parametrize("in_place", [False, True])
+def test_clean_empty_attrs_rejects_invalid_nodes(in_place):
+    schema = ProsemirrorConfig().schema
+
+    with pytest.raises(ValueError, match="is not a dict"):
+        _clean_empty_attrs(
+            {"type": "doc", "content": ["text"]}, schema, in_place=in_place
+        )
@@ -2,6 +2,9 @@ from unittest import TestCase
 
 from django.template import Context, Template
 
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.fields import ProsemirrorFieldDocument
+
 
 class ProsemirrorTemplateTagsTests(TestCase):
     def test_include_django_prosemirror_js_tag_renders_script_tag(self):
@@ -66,3 +69,60 @@ class ProsemirrorTemplateTagsTests(TestCase):
         rendered = template.render(Context())
 
         assert rendered == ""
+
+    def test_prosemirror_html_tag_renders_document(self):
+        schema = ProsemirrorConfig().schema
+        document = ProsemirrorFieldDocument(
+            {
+                "type": "doc",
+                "content": [
+                    {"type": "paragraph", "content": [{"type": "text", "text": "<a>"}]}
+                ],
+            },
+            schema=schema,
+        )
+        template = Template("{% load django_prosemirror %}{% prosemirror_html doc %}")
+
+        rendered = template.render(Context({"doc": document}))
+
+        assert rendered == "<p>&lt;a&gt;</p>"
+        assert document._html is None
+
+    def test_prosemirror_html_tag_renders_none_as_empty_string(self):
+        template = Template("{% load django_prosemirror %}{% prosemirror_html doc %}")
+
+        assert template.render(Context({"doc": None})) == ""
+
+    def test_prosemirror_excerpt_filter(self):
+        document = ProsemirrorFieldDocument(
+            {
+                "type": "doc",
+                "content": [
+                    {
+                        "type": "paragraph",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": "Hello brave new world",
+                                "marks": [{"type": "strong"}],
+                            }
+                        ],
+                    }
+                ],
+            },
+            schema=ProsemirrorConfig().schema,
+        )
+        template = Template(
+            "{% load django_prosemirror %}{{ doc|prosemirror_excerpt:13 }}"
+        )
+
+        rendered = template.render(Context({"doc": document}))
+
+        assert rendered == "<p><strong>Hello brave</strong></p>"
+
+    def test_prosemirror_excerpt_filter_with_none(self):
+        template = Template(
+            "{% load django_prosemirror %}{{ doc|prosemirror_excerpt:13 }}"
+        )
+
+        assert template.render(Context({"doc": None})) == ""
@@ -0,0 +1,247 @@
+"""Tests for plain text extraction with doc_to_text."""
+
+import pytest
+
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.fields import ProsemirrorFieldDocument
+from django_prosemirror.schema import NodeType
+from django_prosemirror.serde import doc_to_text
+from django_prosemirror.text import (
+    BlockIndexEntry,
+    get_text_extractor,
+    paginate_blocks,
+)
+
+from .utils import doc, paragraph, text
+
+
+@pytest.fixture
+def schema():
+    return ProsemirrorConfig().schema
+
+
+def table(*rows):
+    return {
+        "type": "table",
+        "content": [
+            {
+                "type": "table_row",
+                "content": [
+                    {"type": cell_type, "content": [paragraph(text(value))]}
+                    for cell_type, value in row
+                ],
+            }
+            for row in rows
+        ],
+    }
+
+
+TABLE = table(
+    [("table_header", "Name"), ("table_header", "Age")],
+    [("table_cell", "Alice"), ("table_cell", "30")],
+)
+CODE_BLOCK = {"type": "code_block", "content": [text("print('hi')")]}
+
+
+def test_full_document(schema, full_document):
+    result = doc_to_text(full_document, schema=schema)
+
+    assert result.startswith("Main Title\n\nSubtitle\n\nThis paragraph includes")
+    assert "bold, italic, underlined" in result
+    assert "\n\nThis is a quoted paragraph.\n\n" in result
+    assert "console.log('Hello, world!');" in result
+    assert "Here's an image: \nText after line break." in result
+    assert "First bullet point\n\nSecond bullet point" in result
+    assert "<" not in result
+
+
+@pytest.mark.parametrize("value", [None, {}, doc()])
+def test_empty_documents(schema, value):
+    assert doc_to_text(value, schema=schema) == ""
+
+
+def test_not_a_dict(schema):
+    with pytest.raises(ValueError):
+        doc_to_text("<p>html</p>", schema=schema)  # type: ignore[arg-type]
+
+
+def test_marks_are_ignored(schema):
+    value = doc(paragraph(text("a", {"type": "strong"}), text("b", {"type": "em"})))
+
+    assert doc_to_text(value, schema=schema) == "ab"
+
+
+def test_block_separator(schema):
+    value = doc(paragraph(text("a")), paragraph(text("b")))
+
+    assert doc_to_text(value, schema=schema, block_separator=" ") == "a b"
+
+
+def test_empty_blocks_are_skipped(schema):
+    value = doc(paragraph(text("a")), paragraph(), {"type": "horizontal_rule"})
+
+    assert doc_to_text(value, schema=schema) == "a"
+
+
+def test_hard_break(schema):
+    value = doc(paragraph(text("a"), {"type": "hard_break"}, text("b")))
+
+    assert doc_to_text(value, schema=schema) == "a\nb"
+    assert doc_to_text(value, schema=schema, hard_break=" ") == "a b"
+
+
+def test_table(schema):
+    assert doc_to_text(doc(TABLE), schema=schema) == "Name\tAge\nAlice\t30"
+
+
+def test_table_separators(schema):
+    result = doc_to_text(
+        doc(paragraph(text("Before")), TABLE),
+        schema=schema,
+        cell_separator=" | ",
+        row_separator="; ",
+    )
+
+    assert result == "Before\n\nName | Age; Alice | 30"
+
+
+def test_blocks_inside_table_cell_are_joined_with_spaces(schema):
+    value = doc(
+        {
+            "type": "table",
+            "content": [
+                {
+                    "type": "table_row",
+                    "content": [
+                        {
+                            "type": "table_cell",
+                            "content": [paragraph(text("a")), paragraph(text("b"))],
+                        }
+                    ],
+                }
+            ],
+        }
+    )
+
+    assert doc_to_text(value, schema=schema) == "a b"
+
+
+def test_skip_code_blocks(schema):
+    value = doc(paragraph(text("a")), CODE_BLOCK, paragraph(text("b")))
+
+    assert doc_to_text(value, schema=schema) == "a\n\nprint('hi')\n\nb"
+    assert doc_to_text(value, schema=schema, skip_code_blocks=True) == "a\n\nb"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        doc({"type": "unknown"}),
+        doc({}),
+        doc("paragraph"),
+        {"type": "doc", "content": "not a list"},
+    ],
+)
+def test_invalid_documents(schema, value):
+    with pytest.raises(ValueError):
+        doc_to_text(value, schema=schema)
+
+
+def test_node_types_not_in_schema():
+    schema = ProsemirrorConfig(allowed_node_types=[NodeType.PARAGRAPH]).schema
+
+    with pytest.raises(ValueError, match="Unknown node type: code_block"):
+        doc_to_text(doc(CODE_BLOCK), schema=schema)
+
+
+def test_get_text_extractor_returns_same_extractor_for_same_schema(schema):
+    assert get_text_extractor(schema) is get_text_extractor(schema)
+
+
+def test_field_document_text_property(schema):
+    document = ProsemirrorFieldDocument(
+        doc(paragraph(text("Hello")), paragraph(text("world"))), schema=schema
+    )
+
+    assert document.text == "Hello\n\nworld"
+
+
+class TestMaxChars:
+    def test_text_is_cut_at_word_boundary(self, schema):
+        value = doc(paragraph(text("Hello brave new world")))
+
+        assert doc_to_text(value, schema=schema, max_chars=13) == "Hello brave"
+
+    def test_separators_do_not_count(self, schema):
+        value = doc(
+            paragraph(text("abc")), paragraph(text("def")), paragraph(text("g"))
+        )
+
+        assert doc_to_text(value, schema=schema, max_chars=6) == "abc\n\ndef"
+
+    def test_table_is_cut(self, schema):
+        assert doc_to_text(doc(TABLE), schema=schema, max_chars=8) == "Name\tAge\nA"
+
+    def test_rest_of_document_is_not_visited(self, schema):
+        value = doc(paragraph(text("Intro")), {"type": "unknown"})
+
+        assert doc_to_text(value, schema=schema, max_chars=5) == "Intro"
+
+    def test_large_budget_returns_full_text(self, schema, full_document):
+        assert doc_to_text(full_document, schema=schema, max_chars=100_000) == (
+            doc_to_text(full_document, schema=schema)
+        )
+
+
+class TestBlockIndex:
+    def test_offsets(self, schema):
+        value = doc(
+            paragraph(text("one two")),
+            {"type": "horizontal_rule"},
+            paragraph(text("three "), {"type": "hard_break"}, text("four five")),
+            TABLE,
+        )
+
+        assert get_text_extractor(schema).block_index(value) == [
+            BlockIndexEntry(char_offset=0, char_count=7, word_offset=0, word_count=2),
+            BlockIndexEntry(char_offset=7, char_count=0, word_offset=2, word_count=0),
+            BlockIndexEntry(char_offset=7, char_count=15, word_offset=2, word_count=3),
+            BlockIndexEntry(char_offset=22, char_count=14, word_offset=5, word_count=4),
+        ]
+
+    def test_char_counts_match_excerpt_budget(self, schema, full_document):
+        index = get_text_extractor(schema).block_index(full_document)
+        total = index[-1].char_offset + index[-1].char_count
+
+        assert len(index) == len(full_document["content"])
+        assert doc_to_text(full_document, schema=schema, max_chars=total) == (
+            doc_to_text(full_document, schema=schema)
+        )
+
+    def test_empty_document(self, schema):
+        assert get_text_extractor(schema).block_index(doc()) == []
+
+
+def _index(*word_counts):
+    return [BlockIndexEntry(0, 0, 0, count) for count in word_counts]
+
+
+class TestPaginateBlocks:
+    @pytest.mark.parametrize(
+        "word_counts,words_per_page,expected",
+        [
+            ((), 10, []),
+            ((5, 5, 5), 10, [(0, 2), (2, 3)]),
+            ((3, 3, 3, 3), 6, [(0, 2), (2, 4)]),
+            # Blocks longer than a page are never split
+            ((2, 20, 2), 10, [(0, 1), (1, 2), (2, 3)]),
+            # Blocks without text are kept with their neighbours
+            ((0, 10, 0, 0, 10), 10, [(0, 4), (4, 5)]),
+        ],
+    )
+    def test_paginate(self, word_counts, words_per_page, expected):
+        assert paginate_blocks(_index(*word_counts), words_per_page) == expected
+
+    def test_words_per_page_must_be_positive(self):
+        with pytest.raises(ValueError, match="must be positive"):
+            paginate_blocks(_index(1), 0)
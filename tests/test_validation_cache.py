@@ -0,0 +1,158 @@
+"""Tests for the cache of validated documents."""
+
+import json
+
+from django.core.exceptions import ValidationError
+
+import pytest
+
+from django_prosemirror.cache import json_digest, validation_cache
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.fields import ProsemirrorFormField
+from django_prosemirror.limits import DocumentLimits
+from django_prosemirror.schema import validate_doc
+
+from .utils import doc, paragraph, text
+
+
+def validate(doc, schema, **kwargs):
+    validate_doc(doc, schema=schema, json_digest=json_digest(doc), **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    validation_cache.clear()
+    validation_cache.stats.reset()
+    yield
+    validation_cache.clear()
+    validation_cache.stats.reset()
+
+
+@pytest.fixture
+def schema():
+    return ProsemirrorConfig().schema
+
+
+def test_json_digest_ignores_key_order():
+    value = doc(paragraph(text("a")))
+
+    assert json_digest(value) == json_digest(dict(reversed(value.items())))
+    assert json_digest(value) != json_digest(doc(paragraph(text("b"))))
+
+
+def test_json_digest_of_sorted_json_matches_dict():
+    value = doc(paragraph(text("é")))
+    data = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    assert json_digest(data) == json_digest(value)
+
+
+def test_unchanged_document_is_not_validated_again(schema, monkeypatch):
+    validate(doc(paragraph(text("a"))), schema)
+
+    def fail(_schema):
+        pytest.fail("The document was validated again")
+
+    monkeypatch.setattr("django_prosemirror.schema.get_validator", fail)
+    validate(doc(paragraph(text("a"))), schema)
+
+    assert (validation_cache.stats.hits, validation_cache.stats.misses) == (1, 1)
+    assert validation_cache.stats.hit_rate == 0.5
+
+
+def test_not_used_without_json_digest(schema):
+    validate_doc(doc(paragraph(text("a"))), schema=schema)
+    validate_doc(doc(paragraph(text("a"))), schema=schema)
+
+    assert len(validation_cache) == 0
+    assert (validation_cache.stats.hits, validation_cache.stats.misses) == (0, 0)
+
+
+def test_changed_document_is_validated(schema):
+    validate(doc(paragraph(text("a"))), schema)
+    validate(doc(paragraph(text("b"))), schema)
+
+    assert validation_cache.stats.misses == 2
+    assert len(validation_cache) == 2
+
+
+def test_invalid_documents_are_not_cached(schema):
+    invalid = {"type": "doc", "content": [{"type": "nope"}]}
+
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            validate(invalid, schema)
+
+    assert validation_cache.stats.misses == 2
+    assert len(validation_cache) == 0
+
+
+def test_schemas_are_cached_separately(schema):
+    validate(doc(paragraph(text("a"))), schema)
+    validate(doc(paragraph(text("a"))), ProsemirrorConfig(allowed_mark_types=[]).schema)
+
+    assert validation_cache.stats.misses == 2
+
+
+def test_limits_are_part_of_the_key(schema):
+    value = doc(*[paragraph(text("a"))] * 3)
+    validate(value, schema)
+
+    with pytest.raises(ValidationError, match="maximum of 4 nodes"):
+        validate(value, schema, limits=DocumentLimits(max_nodes=4))
+
+
+def test_evicts_least_recently_used(schema, settings):
+    settings.DJANGO_PROSEMIRROR = {"validation_cache_size": 2}
+    validate(doc(paragraph(text("a"))), schema)
+    validate(doc(paragraph(text("b"))), schema)
+    validate(doc(paragraph(text("a"))), schema)
+    validate(doc(paragraph(text("c"))), schema)
+
+    assert len(validation_cache) == 2
+    validation_cache.stats.reset()
+    validate(doc(paragraph(text("a"))), schema)
+    validate(doc(paragraph(text("b"))), schema)
+    assert (validation_cache.stats.hits, validation_cache.stats.misses) == (1, 1)
+
+
+def test_disabled_with_size_zero(schema, settings):
+    settings.DJANGO_PROSEMIRROR = {"validation_cache_size": 0}
+    validate(doc(paragraph(text("a"))), schema)
+    validate(doc(paragraph(text("a"))), schema)
+
+    assert len(validation_cache) == 0
+    assert (validation_cache.stats.hits, validation_cache.stats.misses) == (0, 0)
+
+
+def test_incrementally_validated_documents_are_not_cached(schema):
+    initial = doc(paragraph(text("a")))
+    validate(doc(paragraph(text("b"))), schema, initial=initial)
+
+    assert len(validation_cache) == 0
+
+
+class TestFormField:
+    def test_resubmitted_document_is_not_validated_again(self):
+        field = ProsemirrorFormField()
+        value = json.dumps(doc(paragraph(text("a"))))
+
+        assert field.clean(value).doc == doc(paragraph(text("a")))
+        assert field.clean(value).doc == doc(paragraph(text("a")))
+
+        assert (validation_cache.stats.hits, validation_cache.stats.misses) == (1, 1)
+
+    def test_invalid_document_is_rejected_again(self):
+        field = ProsemirrorFormField()
+        value = json.dumps({"type": "doc", "content": [{"type": "nope"}]})
+
+        for _ in range(2):
+            with pytest.raises(ValidationError, match="Unknown node type"):
+                field.clean(value)
+
+    def test_custom_decoder_skips_cache(self):
+        field = ProsemirrorFormField(decoder=json.JSONDecoder)
+
+        field.clean(json.dumps(doc(paragraph(text("a")))))
+
+        assert len(validation_cache) == 0
@@ -0,0 +1,265 @@
+"""Tests for the compiled document validator."""
+
+from django.core.exceptions import ValidationError
+
+import pytest
+from prosemirror.model import Node
+
+from django_prosemirror.config import ProsemirrorConfig
+from django_prosemirror.limits import DocumentLimits
+from django_prosemirror.schema import (
+    MarkType,
+    NodeType,
+    ValidationFailure,
+    get_validator,
+    validate_doc,
+)
+from django_prosemirror.schema.validator import _changed_blocks
+
+from .serde_test_spec import SERDE_TEST_CASES
+from .utils import doc, paragraph, text
+
+
+@pytest.fixture
+def validator():
+    return get_validator(ProsemirrorConfig().schema)
+
+
+@pytest.mark.parametrize(
+    "test_case",
+    [tc for tc in SERDE_TEST_CASES if tc.document],
+    ids=lambda tc: tc.name,
+)
+def test_accepts_serde_spec_documents(test_case):
+    schema = ProsemirrorConfig(
+        allowed_node_types=test_case.config_node_types,
+        allowed_mark_types=test_case.config_mark_types,
+    ).schema
+    Node.from_json(schema, test_case.document).check()
+
+    assert get_validator(schema).first_error(test_case.document) is None
+
+
+def test_accepts_full_document(validator, full_document):
+    assert validator.first_error(full_document) is None
+
+
+@pytest.mark.parametrize("value", [doc(), {"type": "doc"}])
+def test_accepts_empty_document(validator, value):
+    assert validator.first_error(value) is None
+
+
+@pytest.mark.parametrize(
+    ("value", "path", "message"),
+    [
+        ("doc", "$", "Node must be a non-empty object"),
+        (paragraph(text("a")), "$.type", "Document must be a 'doc' node"),
+        ({"type": 1}, "$.type", "Node type must be a string"),
+        (doc(paragraph(text("a")), {}), "$.content[1]", "non-empty object"),
+        (doc({"type": "nope"}), "$.content[0].type", "Unknown node type 'nope'"),
+        (
+            doc(text("loose")),
+            "$.content[0].type",
+            "Node type 'text' is not allowed here in 'doc'",
+        ),
+        (
+            doc({"type": "blockquote"}),
+            "$.content[0].content",
+            "Content of 'blockquote' is incomplete",
+        ),
+        (
+            doc({"type": "bullet_list", "content": [paragraph(text("a"))]}),
+            "$.content[0].content[0].type",
+            "Node type 'paragraph' is not allowed here in 'bullet_list'",
+        ),
+        (
+            doc({"type": "horizontal_rule", "content": [text("a")]}),
+            "$.content[0].content[0].type",
+            "Node type 'text' is not allowed here in 'horizontal_rule'",
+        ),
+        (doc({"type": "paragraph", "content": "a"}), "$.content[0].content", "list"),
+        (doc(paragraph({"type": "text"})), "$.content[0].content[0].text", "Text"),
+        (doc(paragraph(text(""))), "$.content[0].content[0].text", "Text"),
+        (
+            doc({"type": "heading", "attrs": [], "content": [text("a")]}),
+            "$.content[0].attrs",
+            "Attributes must be an object",
+        ),
+        (
+            doc(paragraph(text("a", {"type": "link"}))),
+            "$.content[0].content[0].marks[0].attrs",
+            "Missing required attribute 'href' for mark type 'link'",
+        ),
+        (
+            doc(paragraph(text("a", {"type": "bold"}))),
+            "$.content[0].content[0].marks[0].type",
+            "Unknown mark type 'bold'",
+        ),
+        (
+            doc(paragraph({"type": "text", "text": "a", "marks": {"type": "em"}})),
+            "$.content[0].content[0].marks",
+            "Marks must be a list",
+        ),
+        (
+            doc(paragraph(text("a", {"type": "em"}, {"type": "em"}))),
+            "$.content[0].content[0].marks[1].type",
+            "Mark 'em' can not be combined with 'em'",
+        ),
+        (
+            doc({"type": "code_block", "content": [text("a", {"type": "strong"})]}),
+            "$.content[0].content[0].marks[0].type",
+            "Mark 'strong' is not allowed in 'code_block'",
+        ),
+    ],
+)
+def test_reports_first_failure(validator, value, path, message):
+    failure = validator.first_error(value)
+
+    assert failure is not None
+    assert failure.path == path
+    assert message in failure.message
+
+
+def test_reports_failures_in_document_order(validator):
+    value = doc(
+        paragraph(text("a")),
+        {"type": "blockquote", "content": [paragraph(text(""))]},
+        {"type": "nope"},
+    )
+
+    assert validator.first_error(value) == ValidationFailure(
+        "$.content[2].type", "Unknown node type 'nope'"
+    )
+
+
+def test_accepts_unknown_attrs_and_unsorted_marks(validator):
+    # Like Node.from_json, which drops unknown attrs and sorts the marks
+    value = doc(
+        {"type": "heading", "attrs": {"level": 2, "extra": 1}, "content": [text("a")]},
+        paragraph(text("a", {"type": "em"}, {"type": "strong"})),
+    )
+    Node.from_json(validator.schema, value).check()
+
+    assert validator.first_error(value) is None
+
+
+def test_handles_deeply_nested_documents(validator):
+    node = paragraph(text("deep"))
+    for _ in range(5000):
+        node = {"type": "blockquote", "content": [node]}
+
+    assert validator.first_error(doc(node)) is None
+
+
+def test_respects_allowed_types():
+    schema = ProsemirrorConfig(
+        allowed_node_types=[NodeType.PARAGRAPH], allowed_mark_types=[MarkType.STRONG]
+    ).schema
+    validator = get_validator(schema)
+
+    assert validator.first_error(doc(paragraph(text("a", {"type": "strong"})))) is None
+    assert validator.first_error(doc({"type": "heading"})) == ValidationFailure(
+        "$.content[0].type", "Unknown node type 'heading'"
+    )
+
+
+def test_counts_nodes_for_limits(validator):
+    counter = DocumentLimits(max_nodes=2).counter(validator.schema)
+
+    with pytest.raises(ValidationError, match="maximum of 2 nodes"):
+        validator.first_error(doc(paragraph(text("a")), paragraph(text("b"))), counter)
+
+
+def test_get_validator_returns_same_validator_for_same_schema():
+    schema = ProsemirrorConfig().schema
+
+    assert get_validator(schema) is get_validator(schema)
+
+
+def test_validate_doc_error_includes_path():
+    schema = ProsemirrorConfig().schema
+
+    with pytest.raises(ValidationError) as exc_info:
+        validate_doc(doc(paragraph(text(""))), schema=schema)
+
+    assert exc_info.value.params == {
+        "path": "$.content[0].content[0].text",
+        "reason": "Text must be a non-empty string",
+    }
+    assert exc_info.value.messages == [
+        (
+            "Invalid prosemirror document at $.content[0].content[0].text: "
+            "Text must be a non-empty string"
+        )
+    ]
+
+
+@pytest.mark.parametrize(
+    ("content", "initial", "changed"),
+    [
+        ("abc", "abc", range(3, 3)),
+        ("abxc", "abc", range(2, 3)),
+        ("ac", "abc", range(1, 1)),
+        ("axc", "abc", range(1, 2)),
+        ("abcd", "abc", range(3, 4)),
+        ("xabc", "abc", range(1)),
+        ("aaa", "aa", range(2, 3)),
+        ("xyz", "abc", range(3)),
+        ("abc", None, range(3)),
+    ],
+)
+def test_changed_blocks(content, initial, changed):
+    blocks = [paragraph(text(c)) for c in content]
+    initial_blocks = [paragraph(text(c)) for c in initial] if initial else initial
+
+    assert _changed_blocks(blocks, initial_blocks) == changed
+
+
+class TestIncrementalValidation:
+    # Stored before empty text nodes were rejected, say
+    STALE = paragraph(text(""))
+
+    def test_skips_unchanged_blocks(self, validator):
+        initial = doc(self.STALE, paragraph(text("a")), self.STALE)
+        value = doc(self.STALE, paragraph(text("b")), self.STALE)
+
+        assert validator.first_error(value, initial=initial) is None
+        assert validator.first_error(value) is not None
+
+    def test_validates_changed_blocks(self, validator):
+        initial = doc(paragraph(text("a")), paragraph(text("b")), paragraph(text("c")))
+        value = doc(paragraph(text("a")), paragraph(text("")), paragraph(text("c")))
+
+        assert validator.first_error(value, initial=initial) == ValidationFailure(
+            "$.content[1].content[0].text", "Text must be a non-empty string"
+        )
+
+    def test_checks_top_level_content(self, validator):
+        initial = doc(text("stale"), paragraph(text("a")))
+        value = doc(text("stale"), paragraph(text("b")))
+
+        assert validator.first_error(value, initial=initial) == ValidationFailure(
+            "$.content[0].type", "Node type 'text' is not allowed here in 'doc'"
+        )
+
+    def test_validates_everything_with_counter(self, validator):
+        initial = doc(self.STALE, paragraph(text("a")))
+        value = doc(self.STALE, paragraph(text("b")))
+        counter = DocumentLimits(max_nodes=100).counter(validator.schema)
+
+        assert validator.first_error(value, counter, initial=initial) is not None
+
+    def test_validate_doc_with_initial(self):
+        schema = ProsemirrorConfig().schema
+        initial = doc(self.STALE, paragraph(text("a")))
+
+        validate_doc(
+            doc(self.STALE, paragraph(text("b"))), schema=schema, initial=initial
+        )
+        with pytest.raises(ValidationError, match="non-empty string"):
+            validate_doc(
+                doc(self.STALE, paragraph(text("b"))),
+                schema=schema,
+                initial=initial,
+                limits=DocumentLimits(max_nodes=100),
+            )